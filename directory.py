@@ -1,88 +1,116 @@
-from sushi_layouts import (
-    MergeRunDataApp,
-    FastqcApp,
-    FastqScreenApp,
-    EmptyApp,
-    EdgeR,
-    DESeq2,
-    STAR,
-    Bowtie2,
-    CountQCApp,
-    FeatureCounts,
-    CellRanger,
-    Fastqc10xApp,
-    FastqScreen10xApp
-)
-
-
-UNKNOWN_APP = {
-    'layout': EmptyApp.layout,
-    'sidebar': EmptyApp.sidebar,
-    'alerts': EmptyApp.alerts
-}
+import importlib
+import threading
+from collections.abc import Mapping
+
+
+class LazyApp(Mapping):
+    """
+    Directory entry of a single Sushi app whose layout is only built when it is first requested.
+
+    Importing the app module (which registers its callbacks with the Dash app) is cheap and
+    happens once at startup through preload_callbacks(). The sidebar, layout and alerts
+    component trees are built by the module's build_<name>() functions on first access
+    and reused afterwards.
+    """
+
+    parts = ("layout", "sidebar", "alerts")
+
+    def __init__(self, name):
+        self.name = name
+        self._built = {}
+        self._lock = threading.Lock()
+
+    @property
+    def module(self):
+        return importlib.import_module(f"sushi_layouts.{self.name}")
+
+    def load(self):
+        """Import everything the app needs at startup (its module and thereby its callbacks)."""
+        self.module
+
+    def build(self, part):
+        builder = getattr(self.module, f"build_{part}", None)
+        return builder() if builder else getattr(self.module, part)
+
+    def __getitem__(self, key):
+        if key not in self.parts:
+            raise KeyError(key)
+
+        if key not in self._built:
+            with self._lock:
+                if key not in self._built:
+                    self._built[key] = self.build(key)
+
+        return self._built[key]
+
+    def __iter__(self):
+        return iter(self.parts)
+
+    def __len__(self):
+        return len(self.parts)
+
+
+class SpecApp(LazyApp):
+    """
+    Directory entry of a Sushi app described by a spec in sushi_layouts/specs/<name>.yaml.
+
+    All spec apps share the callbacks of sushi_utils.spec_engine, so loading one only reads
+    (and validates) its spec.
+    """
+
+    @property
+    def module(self):
+        return importlib.import_module("sushi_utils.spec_engine")
+
+    @property
+    def spec(self):
+        return self.module.load_spec(self.name)
+
+    def load(self):
+        self.spec
+
+    def build(self, part):
+        return getattr(self.module, f"build_{part}")(self.spec)
+
+
+UNKNOWN_APP = LazyApp('EmptyApp')
 
 DIRECTORY = {
     'default': UNKNOWN_APP,
     'test': {
-        '373': {
-            'layout': MergeRunDataApp.layout,
-            'sidebar': MergeRunDataApp.sidebar,
-            'alerts': MergeRunDataApp.alerts
-        },
-        '434': {
-            'layout': FastqcApp.layout,
-            'sidebar': FastqcApp.sidebar,
-            'alerts': FastqcApp.alerts
-        },
-        '377': {
-            'layout': FastqScreenApp.layout,
-            'sidebar': FastqScreenApp.sidebar,
-            'alerts': FastqScreenApp.alerts
-        },
-        '400': {
-            'layout': EdgeR.layout,
-            'sidebar': EdgeR.sidebar,
-            'alerts': EdgeR.alerts
-        },
-        '525': {
-            'layout': DESeq2.layout,
-            'sidebar': DESeq2.sidebar,
-            'alerts': DESeq2.alerts
-        },
-        '445': {
-            'layout': STAR.layout,
-            'sidebar': STAR.sidebar,
-            'alerts': STAR.alerts
-        },
-        '423': {
-            'layout': Bowtie2.layout,
-            'sidebar': Bowtie2.sidebar,
-            'alerts': Bowtie2.alerts
-        },
-        '406': {
-            'layout': CountQCApp.layout,
-            'sidebar': CountQCApp.sidebar,
-            'alerts': CountQCApp.alerts,
-        },
-        '452': {
-            'layout': FeatureCounts.layout,
-            'sidebar': FeatureCounts.sidebar,
-            'alerts': FeatureCounts.alerts
-        },
-        '394': {
-            'layout': CellRanger.layout,
-            'sidebar': CellRanger.sidebar,
-            'alerts': CellRanger.alerts
-        },
-        '442': {
-            'layout': Fastqc10xApp.layout,
-            'sidebar': Fastqc10xApp.sidebar,
-            'alerts': Fastqc10xApp.alerts
-        },
-        '422': {
-            'layout': FastqScreen10xApp.layout,
-            'sidebar': FastqScreen10xApp.sidebar,
-            'alerts': FastqScreen10xApp.alerts
-        },
-    } 
-}
\ No newline at end of file
+        '373': SpecApp('MergeRunDataApp'),
+        '434': SpecApp('FastqcApp'),
+        '377': SpecApp('FastqScreenApp'),
+        '400': SpecApp('EdgeR'),
+        '525': SpecApp('DESeq2'),
+        '445': SpecApp('STAR'),
+        '423': SpecApp('Bowtie2'),
+        '406': SpecApp('CountQCApp'),
+        '452': SpecApp('FeatureCounts'),
+        '394': SpecApp('CellRanger'),
+        '442': SpecApp('Fastqc10xApp'),
+        '422': SpecApp('FastqScreen10xApp'),
+    }
+}
+
+
+def iter_apps(directory=DIRECTORY):
+    """Yield every LazyApp in the directory."""
+
+    for entry in directory.values():
+        if isinstance(entry, LazyApp):
+            yield entry
+        else:
+            yield from entry.values()
+
+
+def preload_callbacks():
+    """
+    Load every app so its callbacks are registered (and its spec validated) before the first page load.
+
+    The Dash renderer fetches the callback graph once per page load, so callbacks have to be
+    known up front even though the layouts themselves are built lazily.
+    """
+
+    for lazy_app in iter_apps():
+        lazy_app.load()
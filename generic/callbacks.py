@@ -21,11 +21,12 @@ from dash import Input, Output, State
 from bfabric_web_apps import (
     create_app, 
     process_url_and_token, 
-    submit_bug_report, 
-    populate_workunit_details,
-    get_redis_queue_layout
+    submit_bug_report
 )
-from dash import html
+from dash import callback_context, html
+from sushi_utils.dataset_cache import cache_entity_data
+from sushi_utils.queue_status import QUEUE_STATUS, queue_layout
+from sushi_utils.workunit_cache import workunit_layout, workunit_page
 
 # Application Initialization
 # ---------------------------
@@ -70,6 +71,9 @@ def generic_process_url_and_token(url_params):
         # If data is missing, set a generic title.
         sushi_app_title = "Sushi App Runner"
         
+    # Keep the full API response on the server; the 'entity' store only carries a handle to it.
+    entity_data = cache_entity_data(entity_data, token_data, token)
+
     # For the Sushi App Runner, we generalize the app_title: 
     return token, token_data, entity_data, app_data, sushi_app_title, session_details, dynamic_link
 
@@ -117,13 +121,38 @@ def get_workunit_details(token_data, dummy):
     """
     Get workunit details for the authenticated user.
 
+    Renders the first page of the user's cached workunits; the cache is synced incrementally in the
+    background (only new and changed workunits are read) and the refresh button forces a sync.
+
     Parameters:
         token (dict): Authentication token data.
 
     Returns:
         tuple: Workunit details.
     """
-    return populate_workunit_details(token_data)
+    force = any(trigger["prop_id"].startswith("refresh-workunits") for trigger in callback_context.triggered)
+    return workunit_layout(token_data, force=force)
+
+
+@app.callback(
+    [
+        Output("workunits-page-content", "children"),
+        Output("workunits-page", "max_value"),
+        Output("workunits-sync-status", "children"),
+        Output("workunits-sync", "disabled")
+    ],
+    [
+        Input("workunits-page", "active_page"),
+        Input("workunits-sync", "n_intervals")
+    ],
+    State("token_data", "data"),
+    prevent_initial_call=True
+)
+def get_workunit_page(page, interval, token_data):
+    """
+    Render a page of the workunits tab from the cache, and redraw it while a sync is running.
+    """
+    return workunit_page(token_data or {}, page)
 
 
 @app.callback(
@@ -137,11 +166,14 @@ def get_queue_details(token_data, interval):
     """
     Get queue details for the authenticated user.
 
+    Renders the snapshot of the server's queue status poller rather than querying Redis, so the
+    Redis load does not grow with the number of open pages.
+
     Parameters:
         token (dict): Authentication token data.
 
     Returns:
         tuple: Queue details.
     """
-    return get_redis_queue_layout()
+    return queue_layout(QUEUE_STATUS.snapshot())
 
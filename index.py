@@ -3,13 +3,22 @@
 # Example: If bfabric_web_apps is version 0.1.3, bfabric_web_app_template must also be 0.1.3.
 # Verify and update versions accordingly before running the application.
 
+import os
 from dash import Input, Output, State, html, dcc, ALL
 import dash_bootstrap_components as dbc
 import bfabric_web_apps
 from generic.callbacks import app
 from generic.components import no_auth
 from bfabric_web_apps import get_logger
-from directory import DIRECTORY
+from directory import DIRECTORY, preload_callbacks
+from sushi_utils.submission import recover_submissions
+
+# Register the callbacks of every Sushi app; their layouts are only built when first requested.
+preload_callbacks()
+
+# Resume or report the submissions a crash interrupted (in the serving process, not in the debug reloader's watcher).
+if not bfabric_web_apps.DEBUG or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+    recover_submissions()
 
 # Here we define the sidebar content.
 sidebar = []
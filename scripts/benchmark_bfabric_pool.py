@@ -0,0 +1,194 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from loguru import logger
+from bfabric import Bfabric
+from bfabric.config import BfabricAuth, BfabricClientConfig
+from sushi_utils.bfabric_pool import BfabricClientPool
+
+NAMESPACE = "http://endpoint.server.webservice.bfabric.fgcz.ethz.ch/"
+
+
+def stub_wsdl(endpoint, url, types):
+    """A document/literal WSDL shaped like those of B-Fabric, padded with `types` unused complex types."""
+
+    padding = "".join(
+        f'<xs:complexType name="padding{index}"><xs:sequence>'
+        + "".join(f'<xs:element name="field{field}" type="xs:string" minOccurs="0"/>' for field in range(10))
+        + "</xs:sequence></xs:complexType>"
+        for index in range(types)
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/" xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+    xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:tns="{NAMESPACE}" targetNamespace="{NAMESPACE}" name="{endpoint}">
+  <types>
+    <xs:schema targetNamespace="{NAMESPACE}" elementFormDefault="unqualified">
+      <xs:element name="read" type="tns:read"/>
+      <xs:element name="readResponse" type="tns:readResponse"/>
+      <xs:complexType name="read"><xs:sequence><xs:element name="parameters" type="tns:readParameters" minOccurs="0"/></xs:sequence></xs:complexType>
+      <xs:complexType name="readParameters"><xs:sequence>
+        <xs:element name="login" type="xs:string" minOccurs="0"/>
+        <xs:element name="page" type="xs:int" minOccurs="0"/>
+        <xs:element name="password" type="xs:string" minOccurs="0"/>
+        <xs:element name="query" type="tns:query" minOccurs="0"/>
+        <xs:element name="idonly" type="xs:boolean" minOccurs="0"/>
+      </xs:sequence></xs:complexType>
+      <xs:complexType name="query"><xs:sequence>
+        <xs:element name="id" type="xs:long" minOccurs="0" maxOccurs="unbounded"/>
+        <xs:element name="includedeletableupdateable" type="xs:boolean" minOccurs="0"/>
+      </xs:sequence></xs:complexType>
+      <xs:complexType name="readResponse"><xs:sequence><xs:element name="return" type="tns:response" minOccurs="0"/></xs:sequence></xs:complexType>
+      <xs:complexType name="response"><xs:sequence>
+        <xs:element name="numberofpages" type="xs:int" minOccurs="0"/>
+        <xs:element name="page" type="xs:int" minOccurs="0"/>
+        <xs:element name="{endpoint}" type="tns:entity" minOccurs="0" maxOccurs="unbounded"/>
+      </xs:sequence></xs:complexType>
+      <xs:complexType name="entity"><xs:sequence>
+        <xs:element name="id" type="xs:long" minOccurs="0"/>
+        <xs:element name="name" type="xs:string" minOccurs="0"/>
+      </xs:sequence></xs:complexType>
+      {padding}
+    </xs:schema>
+  </types>
+  <message name="read"><part name="parameters" element="tns:read"/></message>
+  <message name="readResponse"><part name="parameters" element="tns:readResponse"/></message>
+  <portType name="{endpoint}"><operation name="read"><input message="tns:read"/><output message="tns:readResponse"/></operation></portType>
+  <binding name="{endpoint}PortBinding" type="tns:{endpoint}">
+    <soap:binding transport="http://schemas.xmlsoap.org/soap/http" style="document"/>
+    <operation name="read"><soap:operation soapAction=""/><input><soap:body use="literal"/></input><output><soap:body use="literal"/></output></operation>
+  </binding>
+  <service name="{endpoint}Service"><port name="{endpoint}Port" binding="tns:{endpoint}PortBinding"><soap:address location="{url}"/></port></service>
+</definitions>"""
+
+
+def stub_response(endpoint):
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<S:Envelope xmlns:S="http://schemas.xmlsoap.org/soap/envelope/"><S:Body>
+<ns2:readResponse xmlns:ns2="{NAMESPACE}"><return><numberofpages>1</numberofpages><page>1</page>
+<{endpoint}><id>2220</id><name>stub</name></{endpoint}></return></ns2:readResponse>
+</S:Body></S:Envelope>"""
+
+
+class StubBfabric(ThreadingHTTPServer):
+    """Local SOAP server answering B-Fabric reads with a canned result, counting connections and WSDL downloads."""
+
+    daemon_threads = True
+
+    def __init__(self, types, handshake):
+        self.types = types
+        self.handshake = handshake
+        self.connections = 0
+        self.wsdl_downloads = 0
+        self.reads = 0
+        super().__init__(("127.0.0.1", 0), StubHandler)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/bfabric"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = 1024 * 1024  # Headers and body leave in one segment (flushed after every request)
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+        # Stands in for the TLS handshake of a new HTTPS connection to B-Fabric
+        time.sleep(self.server.handshake)
+
+    def _reply(self, body, content_type):
+        body = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        endpoint = self.path.split("?")[0].rsplit("/", 1)[-1]
+        self.server.wsdl_downloads += 1
+        self._reply(stub_wsdl(endpoint, f"{self.server.base_url}/{endpoint}", self.server.types), "text/xml")
+
+    def do_POST(self):
+        endpoint = self.path.split("?")[0].rsplit("/", 1)[-1]
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.reads += 1
+        self._reply(stub_response(endpoint), "text/xml; charset=utf-8")
+
+    def log_message(self, *args):
+        pass
+
+
+def timed_reads(server, calls, pool=None, endpoint="container"):
+    """Read through a new Bfabric instance per call, as bfabric_web_apps does; return the latency of every call."""
+
+    config = BfabricClientConfig(base_url=server.base_url)
+    auth = BfabricAuth(login="benchmark", password="0" * 32)
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        B = Bfabric(config, auth)
+        result = (pool.wrap(B) if pool else B).read(endpoint, {"id": 2220})
+        latencies.append(time.perf_counter() - start)
+        assert result[0]["id"] == 2220, result
+    return np.array(latencies)
+
+
+def concurrent_reads(server, calls, pool, threads=8):
+    """Spread the reads over `threads` threads sharing the pool; return the latency of every call."""
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        chunks = list(executor.map(lambda chunk: timed_reads(server, chunk, pool), [calls // threads] * threads))
+    return np.concatenate(chunks)
+
+
+def report(label, server, latencies, before):
+    connections, downloads = server.connections - before[0], server.wsdl_downloads - before[1]
+    print(
+        f"{label:<28} {len(latencies):>5} {np.mean(latencies) * 1000:>9.1f} {np.percentile(latencies, 50) * 1000:>9.1f} "
+        f"{np.percentile(latencies, 99) * 1000:>9.1f} {connections:>11} {downloads:>9}"
+    )
+    return server.connections, server.wsdl_downloads
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the per-call latency of B-Fabric reads with and without the client pool, against a local stub SOAP server.")
+    parser.add_argument("--calls", type=int, default=50, help="Reads per mode")
+    parser.add_argument("--types", type=int, default=300, help="Padding complex types in the stub WSDL (B-Fabric's schemas are large)")
+    parser.add_argument("--handshake", type=float, default=0.02, help="Seconds added to every new connection, standing in for the TLS handshake")
+    args = parser.parse_args()
+
+    # bfabricPy logs every client creation and read
+    logger.remove()
+
+    server = StubBfabric(args.types, args.handshake)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cache_dir = tempfile.mkdtemp()
+    print(f"Stub B-Fabric at {server.base_url}, {args.calls} reads per mode, WSDL cache in {cache_dir}")
+    print()
+    print(f"{'mode':<28} {'calls':>5} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'connections':>11} {'downloads':>9}")
+
+    try:
+        counts = (server.connections, server.wsdl_downloads)
+        counts = report("unpooled (new client/call)", server, timed_reads(server, args.calls), counts)
+
+        pool = BfabricClientPool(cache_dir)
+        counts = report("pooled, first call (cold)", server, timed_reads(server, 1, pool), counts)
+        counts = report("pooled, warm", server, timed_reads(server, args.calls, pool), counts)
+        counts = report("pooled, warm, 8 threads", server, concurrent_reads(server, args.calls, pool), counts)
+
+        # A new process: nothing in memory, the WSDL cache on disk
+        counts = report("pooled, first call (disk)", server, timed_reads(server, 1, BfabricClientPool(cache_dir)), counts)
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
@@ -0,0 +1,113 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import filecmp
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+from sushi_utils.dataset_utils import dataset_to_dictionary, dataset_to_frame, dataset_to_tsv
+
+
+def legacy_dataset_to_dictionary(dataset):
+    """The original nested-loop implementation, kept here as the baseline."""
+
+    if not dataset:
+        return {}
+
+    attributes = dataset.get("attribute", [])
+    items = [elt.get("field") for elt in dataset.get("item", [])]
+
+    position_map = {str(elt.get("position")): elt.get("name") for elt in attributes}
+    df_dict = {elt: [] for elt in position_map.values()}
+
+    for item in items:
+        for field in item:
+            attribute_position = field.get("attributeposition")
+            df_dict[position_map.get(attribute_position)].append(field.get("value"))
+
+    return df_dict
+
+
+def synthetic_response(n_rows, n_columns):
+    """Build a B-Fabric style dataset response with n_rows items and n_columns attributes."""
+
+    attributes = [{"name": f"Column {i}", "position": str(i + 1), "type": "String"} for i in range(n_columns)]
+    items = [
+        {"field": [{"attributeposition": str(i + 1), "value": f"sample_{row}_{i}"} for i in range(n_columns)]}
+        for row in range(n_rows)
+    ]
+    return {"id": 1, "attribute": attributes, "item": items}
+
+
+def best_of(function, dataset, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(dataset)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def peak_memory(function, *args):
+    """Return (seconds, peak traced bytes) for a single call of function(*args)."""
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def pandas_dataset_to_tsv(dataset, path):
+    """The previous submit path: build a DataFrame and write it with to_csv."""
+
+    pd.DataFrame(legacy_dataset_to_dictionary(dataset)).to_csv(path, sep="\t", index=False)
+
+
+def benchmark_tsv(row_counts, n_columns):
+    print(f"{'rows':>8} {'pandas [s]':>11} {'pandas peak [MB]':>17} {'stream [s]':>11} {'stream peak [MB]':>17} {'identical':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in row_counts:
+            dataset = synthetic_response(n_rows, n_columns)
+            pandas_path, stream_path = f"{tmp}/pandas/dataset.tsv", f"{tmp}/stream/dataset.tsv"
+            os.makedirs(os.path.dirname(pandas_path), exist_ok=True)
+
+            pandas_time, pandas_peak = peak_memory(pandas_dataset_to_tsv, dataset, pandas_path)
+            stream_time, stream_peak = peak_memory(dataset_to_tsv, dataset, stream_path)
+            identical = filecmp.cmp(pandas_path, stream_path, shallow=False)
+
+            print(f"{n_rows:>8} {pandas_time:>11.4f} {pandas_peak / 1e6:>17.2f} {stream_time:>11.4f} {stream_peak / 1e6:>17.2f} {str(identical):>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the dataset_to_dictionary conversion against the legacy implementation.")
+    parser.add_argument("--rows", type=str, default="1000,10000,50000,100000",
+                        help="Comma-separated list of row counts (e.g., --rows=1000,100000)")
+    parser.add_argument("--columns", type=int, default=12, help="Number of attributes per item")
+    parser.add_argument("--repeats", type=int, default=3, help="Repetitions per measurement (best is reported)")
+    parser.add_argument("--tsv", action="store_true", help="Benchmark dataset.tsv writing (pandas vs streaming) instead")
+    args = parser.parse_args()
+
+    if args.tsv:
+        benchmark_tsv([int(x) for x in args.rows.split(",")], args.columns)
+        sys.exit(0)
+
+    print(f"{'rows':>8} {'legacy [s]':>11} {'columns [s]':>12} {'frame [s]':>10} {'speedup':>8} {'ns/cell':>8}")
+
+    for n_rows in [int(x) for x in args.rows.split(",")]:
+        dataset = synthetic_response(n_rows, args.columns)
+
+        assert dataset_to_dictionary(dataset) == legacy_dataset_to_dictionary(dataset)
+
+        legacy = best_of(legacy_dataset_to_dictionary, dataset, args.repeats)
+        columnar = best_of(dataset_to_dictionary, dataset, args.repeats)
+        frame = best_of(dataset_to_frame, dataset, args.repeats)
+        ns_per_cell = columnar / (n_rows * args.columns) * 1e9
+
+        print(f"{n_rows:>8} {legacy:>11.4f} {columnar:>12.4f} {frame:>10.4f} {legacy / columnar:>7.2f}x {ns_per_cell:>8.1f}")
@@ -0,0 +1,64 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import shutil
+import tempfile
+import threading
+import time
+import numpy as np
+from sushi_utils.journal import SubmissionJournal
+
+
+class SyncPerRecordJournal(SubmissionJournal):
+    """The journal without group commit: every record is written and fsynced on its own."""
+
+    def append(self, submission_id, state, **fields):
+        with self._lock:
+            self._write(f'{{"id": "{submission_id}", "state": "{state}"}}\n')
+
+
+def run(journal, writers, records):
+    """Append records from concurrent writers; return the wall time and the latency of every append."""
+
+    latencies = [[] for _ in range(writers)]
+
+    def write(index):
+        for number in range(records):
+            start = time.perf_counter()
+            journal.append(f"{index}-{number}", "dispatched", job=f"job{number}", run_path=f"/scratch/job{number}")
+            latencies[index].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=write, args=(index,)) for index in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, np.concatenate(latencies)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the append latency of the submission journal with and without group commit.")
+    parser.add_argument("--writers", type=str, default="1,8,32,128", help="Comma-separated numbers of concurrent writers")
+    parser.add_argument("--records", type=int, default=50, help="Records appended by every writer")
+    parser.add_argument("--directory", type=str, default=None, help="Directory to write to (on the scratch file system to be realistic)")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(dir=args.directory)
+    print(f"Journal in {root}, {args.records} records per writer")
+    print()
+    print(f"{'writers':>7} {'mode':<12} {'records/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+
+    try:
+        for writers in [int(writers) for writers in args.writers.split(",")]:
+            for mode, journal_class in (("per record", SyncPerRecordJournal), ("group", SubmissionJournal)):
+                directory = os.path.join(root, f"{mode.replace(' ', '_')}_{writers}")
+                elapsed, latencies = run(journal_class(directory), writers, args.records)
+                print(
+                    f"{writers:>7} {mode:<12} {writers * args.records / elapsed:>10.0f} "
+                    f"{np.percentile(latencies, 50) * 1000:>8.2f} {np.percentile(latencies, 99) * 1000:>8.2f}"
+                )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
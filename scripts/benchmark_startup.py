@@ -0,0 +1,87 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import subprocess
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter per measurement so imports and memory are not shared between modes
+PROBE = """
+import json, resource, sys, time, warnings
+warnings.simplefilter("ignore")
+mode = sys.argv[1]
+start = time.perf_counter()
+import generic.callbacks
+if mode != "framework":
+    import index
+if mode == "eager":
+    from directory import iter_apps
+    for lazy_app in iter_apps():
+        for part in lazy_app:
+            lazy_app[part]
+elapsed = time.perf_counter() - start
+from generic.callbacks import app
+print(json.dumps({"seconds": elapsed, "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, "callbacks": len(app.callback_map)}))
+"""
+
+
+def probe(mode):
+    result = subprocess.run([sys.executable, "-c", PROBE, mode], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+APP_PROBE = """
+import importlib, json, sys, time, warnings
+warnings.simplefilter("ignore")
+import generic.callbacks, sushi_utils.spec_engine  # shared by every app
+from directory import iter_apps
+lazy_app = next(lazy_app for lazy_app in iter_apps() if lazy_app.name == sys.argv[1])
+start = time.perf_counter()
+lazy_app.load()
+imported = time.perf_counter() - start
+start = time.perf_counter()
+for part in lazy_app:
+    lazy_app[part]
+built = time.perf_counter() - start
+print(json.dumps({"imported": imported, "built": built}))
+"""
+
+
+def per_app_costs():
+    """Measure the load (callback registration / spec parsing) and build (component tree) cost of every app in a fresh interpreter."""
+
+    from directory import iter_apps
+
+    rows = []
+    for lazy_app in iter_apps():
+        result = subprocess.run([sys.executable, "-c", APP_PROBE, lazy_app.name], cwd=ROOT, capture_output=True, text=True, check=True)
+        costs = json.loads(result.stdout.strip().splitlines()[-1])
+        rows.append((lazy_app.name, costs["imported"], costs["built"]))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report startup time and resident memory with lazily vs eagerly built app layouts.")
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh interpreter runs per mode (best is reported)")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+
+    print(f"{'mode':<10} {'startup [s]':>12} {'max RSS [MB]':>13} {'callbacks':>10}")
+    for mode in ["framework", "lazy", "eager"]:
+        runs = [probe(mode) for _ in range(args.repeats)]
+        best = min(runs, key=lambda run: run["seconds"])
+        print(f"{mode:<10} {best['seconds']:>12.3f} {best['max_rss_mb']:>13.1f} {best['callbacks']:>10}")
+
+    print()
+    print("framework = Dash app and shared modules only, lazy = index.py (layouts built on first request),")
+    print("eager = index.py plus building every app layout at startup (the previous behaviour)")
+    print()
+
+    print(f"{'app':<20} {'load [ms]':>12} {'build [ms]':>11}")
+    for name, imported, built in per_app_costs():
+        print(f"{name:<20} {imported * 1000:>12.2f} {built * 1000:>11.2f}")
@@ -0,0 +1,144 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import numpy as np
+import pandas as pd
+import yaml
+from sushi_utils.sizing import model_value, snap
+
+SPEC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sushi_layouts", "specs")
+
+HEADROOM_QUANTILE = 0.95  # Share of the observed jobs the fitted models are to cover
+RESOURCE_COLUMNS = {"ram": "ram_gb", "scratch": "scratch_gb"}  # Resources calibrated from observed peaks
+TERM_COLUMNS = {"per_gb": "input_gb", "per_sample": "samples", "reference": "reference_gb"}
+
+
+def load_specs():
+    """Return the specs with a sizing section by Sushi class (read directly, without the Dash app)."""
+
+    specs = {}
+    for file_name in sorted(os.listdir(SPEC_DIR)):
+        with open(os.path.join(SPEC_DIR, file_name), encoding="utf-8") as handle:
+            spec = yaml.safe_load(handle)
+        if spec.get("sizing"):
+            specs[spec["sushi_class"]] = spec
+    return specs
+
+
+def synthetic_runs(specs, n_runs, seed=0):
+    """
+    Generate observed runs whose true resource usage deviates from the current models (for a dry run
+    of the calibration): usage = model with randomly scaled terms, plus noise.
+    """
+
+    rng = np.random.default_rng(seed)
+    rows = []
+    for sushi_class, spec in specs.items():
+        truth = {
+            resource: {term: value * rng.uniform(0.5, 1.3) for term, value in spec["sizing"][resource].items() if term not in ("min", "max")}
+            for resource in RESOURCE_COLUMNS if resource in spec["sizing"]
+        }
+        for _ in range(n_runs):
+            row = {
+                "sushi_class": sushi_class,
+                "input_gb": rng.lognormal(1, 0.8),
+                "samples": int(rng.integers(1, 48)),
+                "reference_gb": rng.choice([3.1, 2.7, 1.4, 0.14])
+            }
+            for resource, column in RESOURCE_COLUMNS.items():
+                if resource in truth:
+                    usage = model_value(truth[resource], row["input_gb"], row["samples"], row["reference_gb"])
+                    row[column] = max(0.1, usage * rng.normal(1, 0.08))
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def fit_model(model, runs, column):
+    """
+    Fit the terms a model uses to the observed peaks by least squares, then raise the base so that
+    HEADROOM_QUANTILE of the observed jobs fit into the recommendation.
+    """
+
+    terms = [term for term in TERM_COLUMNS if model.get(term)]
+    X = np.column_stack([np.ones(len(runs))] + [runs[TERM_COLUMNS[term]].to_numpy(dtype=float) for term in terms])
+    y = runs[column].to_numpy(dtype=float)
+
+    coefficients, *_ = np.linalg.lstsq(X, y, rcond=None)
+    coefficients = np.maximum(coefficients, 0)
+    residuals = y - X @ coefficients
+
+    fitted = {"base": float(coefficients[0] + max(0.0, np.quantile(residuals, HEADROOM_QUANTILE)))}
+    fitted.update({term: float(value) for term, value in zip(terms, coefficients[1:])})
+    fitted.update({bound: model[bound] for bound in ("min", "max") if bound in model})
+    return fitted
+
+
+def evaluate(provide, runs, column):
+    """Return the share of under-provisioned jobs and the mean waste (GB) of the others."""
+
+    provided = np.array([provide(row) for _, row in runs.iterrows()], dtype=float)
+    observed = runs[column].to_numpy(dtype=float)
+    under = observed > provided
+    waste = (provided - observed)[~under].mean() if (~under).any() else 0.0
+    return under.mean(), waste
+
+
+def _rounded(model):
+    return "{" + ", ".join(f"{term}: {round(value, 3)}" for term, value in model.items()) + "}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibrate the resource models of the spec sizing sections against observed cluster runs.")
+    parser.add_argument("--runs", type=str, default=None,
+                        help="CSV of finished jobs with the columns sushi_class, input_gb, samples, reference_gb, ram_gb (peak RSS) "
+                             "and scratch_gb (peak scratch use), e.g. exported from sacct")
+    parser.add_argument("--synthetic", type=int, default=200, help="Without --runs: number of synthetic runs per Sushi class")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic runs")
+    args = parser.parse_args()
+
+    specs = load_specs()
+    runs = pd.read_csv(args.runs) if args.runs else synthetic_runs(specs, args.synthetic, args.seed)
+    print(f"{len(runs)} runs ({'from ' + args.runs if args.runs else 'synthetic'}), "
+          f"under = share of jobs given less than they used, waste = mean surplus (GB) of the others")
+
+    print()
+    print(f"{'sushi class':<20} {'resource':<8} {'runs':>5} {'static under':>13} {'waste':>7} {'model under':>12} {'waste':>7} {'fitted under':>13} {'waste':>7}")
+
+    suggestions = {}
+    for sushi_class, spec in specs.items():
+        class_runs = runs[runs["sushi_class"] == sushi_class]
+        fields = {field["key"]: field for field in spec["fields"] if "key" in field}
+
+        for resource, column in RESOURCE_COLUMNS.items():
+            if resource not in spec["sizing"] or column not in class_runs or class_runs[column].isna().all():
+                continue
+
+            observed = class_runs.dropna(subset=[column])
+            if len(observed) < 10:
+                print(f"{sushi_class:<20} {resource:<8} {len(observed):>5}   too few runs to calibrate")
+                continue
+
+            model = spec["sizing"][resource]
+            fitted = fit_model(model, observed, column)
+            field = fields[resource]
+
+            def provider(resource_model):
+                return lambda row: snap(model_value(resource_model, row["input_gb"], row["samples"], row["reference_gb"]), field)
+
+            static = evaluate(lambda row: float(field.get("default") or 0), observed, column)
+            current = evaluate(provider(model), observed, column)
+            calibrated = evaluate(provider(fitted), observed, column)
+            print(
+                f"{sushi_class:<20} {resource:<8} {len(observed):>5} {static[0]:>13.1%} {static[1]:>7.1f} "
+                f"{current[0]:>12.1%} {current[1]:>7.1f} {calibrated[0]:>13.1%} {calibrated[1]:>7.1f}"
+            )
+            suggestions.setdefault(sushi_class, {})[resource] = fitted
+
+    print()
+    print("Suggested sizing sections (cores are not calibrated, keep them as they are):")
+    for sushi_class, models in suggestions.items():
+        print(f"\n# {sushi_class}\nsizing:")
+        for resource, model in models.items():
+            print(f"  {resource}: {_rounded(model)}")
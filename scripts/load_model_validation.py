@@ -0,0 +1,93 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import warnings
+
+WILDCARDS = (["ALL"], ["MATCH"], ["ALLSMALLER"])
+
+
+def matches(pattern, component_id):
+    """Return True if a (possibly pattern-matching) dependency id refers to the component."""
+
+    if not pattern.startswith("{"):
+        return pattern == component_id
+
+    pattern = json.loads(pattern)
+    if not isinstance(component_id, dict) or pattern.keys() != component_id.keys():
+        return False
+
+    return all(value in WILDCARDS or value == component_id[key] for key, value in pattern.items())
+
+
+def triggered_callbacks(dependencies, component_id, prop):
+    """Return the (server, clientside) callbacks fired by a change of component_id.prop."""
+
+    server, clientside = [], []
+    for dependency in dependencies:
+        if any(matches(item["id"], component_id) and item["property"] == prop for item in dependency["inputs"]):
+            (clientside if dependency.get("clientside_function") else server).append(dependency["output"])
+    return server, clientside
+
+
+def keystroke_costs(dependencies):
+    """Count the callbacks fired by one edit of every sidebar field of every spec app."""
+
+    from directory import iter_apps, SpecApp
+    from sushi_utils import spec_engine
+
+    rows = []
+    for lazy_app in iter_apps():
+        if not isinstance(lazy_app, SpecApp):
+            continue
+
+        server = clientside = 0
+        fields = spec_engine.spec_fields(lazy_app.spec)
+        for field in fields:
+            if field.get("component") == "switch":
+                component_id, prop = spec_engine.component_id(spec_engine.SWITCH, lazy_app.name, field["key"]), "on"
+            elif field.get("component") == "dropdown":
+                component_id, prop = spec_engine.component_id(spec_engine.CHOICE, lazy_app.name, field["key"]), "value"
+            else:
+                component_id, prop = spec_engine.component_id(spec_engine.PARAM, lazy_app.name, field["key"]), "value"
+
+            field_server, field_clientside = triggered_callbacks(dependencies, component_id, prop)
+            server += len(field_server)
+            clientside += len(field_clientside)
+
+        rows.append((lazy_app.name, len(fields), server / len(fields), clientside / len(fields)))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Model the server request rate caused by typing in the app sidebars, from the registered callback graph.")
+    parser.add_argument("--users", type=int, default=50, help="Users editing a sidebar at the same time")
+    parser.add_argument("--keystrokes", type=float, default=120, help="Keystrokes / field changes per user and minute")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+
+    import index  # registers every callback, as in production
+    from generic.callbacks import app
+
+    dependencies = app.server.test_client().get("/_dash-dependencies").get_json()
+    clientside_total = sum(1 for dependency in dependencies if dependency.get("clientside_function"))
+    print(f"Registered callbacks: {len(dependencies)} ({clientside_total} clientside)")
+    print()
+
+    rows = keystroke_costs(dependencies)
+
+    print(f"{'app':<20} {'fields':>7} {'server / keystroke':>19} {'clientside / keystroke':>23}")
+    for name, fields, server, clientside in rows:
+        print(f"{name:<20} {fields:>7} {server:>19.2f} {clientside:>23.2f}")
+
+    server = sum(row[2] for row in rows) / len(rows)
+    clientside = sum(row[3] for row in rows) / len(rows)
+    keystroke_rate = args.users * args.keystrokes / 60
+
+    print()
+    print(f"Load model: {args.users} users x {args.keystrokes:g} keystrokes/min = {keystroke_rate:.1f} keystrokes/s")
+    print(f"  validation on the server (previous): {keystroke_rate * (server + clientside):8.1f} requests/s")
+    print(f"  validation in the browser (current): {keystroke_rate * server:8.1f} requests/s")
@@ -0,0 +1,67 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import csv
+import time
+
+from sushi_utils.history import HISTORY, format_duration
+
+
+def _float(value):
+    return float(value) if value not in (None, "") else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the run history, import observed runtimes / peak memory, or time a prediction.")
+    parser.add_argument("--days", type=float, default=None, help="Only report runs submitted in the last N days")
+    parser.add_argument("--import", dest="import_path", type=str, default=None,
+                        help="CSV of finished jobs with the columns name (the job / output dataset name), runtime_s, peak_ram_gb "
+                             "and optionally turnaround_s, e.g. exported from sacct")
+    parser.add_argument("--predict", type=str, default=None, help="Sushi class to predict the duration of (e.g. STAR)")
+    parser.add_argument("--input-gb", type=float, default=None, help="Input size of the job to predict")
+    args = parser.parse_args()
+
+    print(f"History: {HISTORY.path}")
+
+    if args.import_path:
+        matched = unmatched = 0
+        with open(args.import_path, newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                found = HISTORY.observe(
+                    row["name"], turnaround=_float(row.get("turnaround_s")), runtime=_float(row.get("runtime_s")), peak_ram_gb=_float(row.get("peak_ram_gb"))
+                )
+                matched, unmatched = matched + found, unmatched + (not found)
+        print(f"Imported {matched} observations ({unmatched} without a submitted job of that name)")
+        sys.exit(0)
+
+    if args.predict:
+        start = time.perf_counter()
+        HISTORY.predict(args.predict, args.input_gb)
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        predictions = HISTORY.predict(args.predict, args.input_gb)
+        cached = time.perf_counter() - start
+
+        print(f"Prediction took {first * 1000:.2f} ms (fitting the models), then {cached * 1000:.3f} ms (cached)")
+        for partition, prediction in sorted(predictions.items(), key=lambda item: item[1]["seconds"]):
+            peak = f'{prediction["peak_ram_gb"]:.1f} GB' if prediction["peak_ram_gb"] is not None else "-"
+            print(f'{partition:<12} {format_duration(prediction["seconds"]):>8} ({prediction["runs"]} runs, peak RAM {peak})')
+        sys.exit(0)
+
+    since = time.time() - args.days * 24 * 3600 if args.days else None
+    report = HISTORY.report(since=since)
+
+    def duration(seconds):
+        return format_duration(seconds) if seconds is not None else "-"
+
+    print()
+    print(f"{'sushi class':<20} {'partition':<12} {'submitted':>9} {'observed':>9} {'turnaround':>11} {'runtime':>9} {'peak RAM':>9}")
+    for (sushi_class, partition), entry in report.items():
+        peak = f'{entry["peak_ram_gb"]:.1f}' if entry["peak_ram_gb"] is not None else "-"
+        print(
+            f"{sushi_class:<20} {str(partition):<12} {entry['submitted']:>9} {entry['observed']:>9} "
+            f"{duration(entry['turnaround']):>11} {duration(entry['runtime']):>9} {peak:>9}"
+        )
@@ -0,0 +1,45 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+from datetime import datetime
+
+from sushi_utils.ledger import LEDGER
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the hit rate of the submission ledger and the duplicate submissions it prevented, or invalidate runs so they are no longer reused.")
+    parser.add_argument("--days", type=float, default=None, help="Only report lookups of the last N days")
+    parser.add_argument("--invalidate", action="store_true", help="Invalidate the runs matching --key / --sushi-class / --before (all runs without a filter)")
+    parser.add_argument("--key", type=str, default=None, help="Ledger key of the runs to invalidate")
+    parser.add_argument("--sushi-class", type=str, default=None, help="Sushi class of the runs to invalidate (e.g. FastqcApp)")
+    parser.add_argument("--before", type=str, default=None, help="Invalidate runs created before this date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    print(f"Ledger: {LEDGER.path}")
+
+    if args.invalidate:
+        before = datetime.strptime(args.before, "%Y-%m-%d").timestamp() if args.before else None
+        count = LEDGER.invalidate(key=args.key, sushi_class=args.sushi_class, before=before)
+        print(f"Invalidated {count} runs")
+        sys.exit(0)
+
+    since = time.time() - args.days * 24 * 3600 if args.days else None
+    report = LEDGER.hit_rates(since=since)
+
+    print()
+    print(f"{'sushi class':<20} {'lookups':>8} {'hits':>6} {'hit rate':>9}")
+    for sushi_class, counts in report.items():
+        if sushi_class == "all":
+            continue
+        print(f"{sushi_class:<20} {counts['lookups']:>8} {counts['hits']:>6} {counts['hit_rate']:>9.1%}")
+    print(f"{'all':<20} {report['all']['lookups']:>8} {report['all']['hits']:>6} {report['all']['hit_rate']:>9.1%}")
+
+    duplicates = LEDGER.duplicates(since=since)
+    print()
+    print(f"{'app':<20} {'duplicate submissions prevented':>32}")
+    for app, count in duplicates.items():
+        if app != "all":
+            print(f"{app:<20} {count:>32}")
+    print(f"{'all':<20} {duplicates['all']:>32}")
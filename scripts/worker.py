@@ -1,18 +1,285 @@
+import os
 import sys
 sys.path.append("../bfabric-web-apps")
+# The repository root, so the worker can import the jobs enqueued by the app (sushi_utils.submission)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import argparse
-from bfabric_web_apps import run_worker, REDIS_HOST, REDIS_PORT
+import multiprocessing
+import signal
+import socket
+import threading
+import time
+import numpy as np
+import redis
+from rq import Queue, Worker
+from bfabric_web_apps import REDIS_HOST, REDIS_PORT, REDIS_USERNAME, REDIS_PASSWORD
+from bfabric_web_apps.utils.redis_worker_init import keepalive_ping
+
+WORKER_PROCESSES = 4                          # Worker processes of the pool
+QUEUE_CONCURRENCY = {"light": 4, "heavy": 2}  # Maximum number of jobs of a queue running at once in the pool
+QUEUE_WEIGHTS = {"light": 3, "heavy": 1}      # Jobs taken from each queue per round while several have a backlog
+DRAIN_TIMEOUT = 600                           # Seconds running jobs get to finish on shutdown before they are killed
+RESTART_BACKOFF = (1, 60)                     # Seconds before a crashed worker is restarted, doubled per crash up to the maximum
+
+
+class WeightedWorker(Worker):
+    """
+    rq worker taking jobs from its queues in proportion to their weights (stride scheduling).
+
+    Every queue has a pass value growing by 1 / weight with each job taken from it, and the queues
+    are polled in the order of their passes: while several queues have a backlog, a queue of weight
+    3 gets three jobs for every job of a queue of weight 1, and none starves. Queues that were empty
+    when a job was taken are brought up to the pass of the served queue, so an idle queue does not
+    save up a burst of its own.
+    """
+
+    def __init__(self, *args, weights=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.weights = weights or {}
+        self._passes = {queue.name: 0.0 for queue in self.queues}
+        self._ordered_queues = sorted(self.queues, key=lambda queue: -self.weights.get(queue.name, 1))
+
+    def reorder_queues(self, reference_queue):
+        served = reference_queue.name
+        for queue in self._ordered_queues:
+            if queue.name == served:
+                break
+            self._passes[queue.name] = max(self._passes[queue.name], self._passes[served])
+
+        self._passes[served] += 1 / self.weights.get(served, 1)
+        self._ordered_queues = sorted(self.queues, key=lambda queue: (self._passes[queue.name], -self.weights.get(queue.name, 1)))
+
+
+def assign_queues(processes, concurrency):
+    """
+    Return the queues every worker process listens on, so that no more than concurrency[queue]
+    processes (and therefore running jobs) take jobs of a queue.
+
+    Each queue goes to the processes listening on the fewest queues so far, e.g. 4 processes with
+    {"light": 4, "heavy": 2} give [light, heavy], [light, heavy], [light], [light]: a burst of heavy
+    jobs occupies two processes at most, while light jobs may use all four.
+    """
+
+    assignment = [[] for _ in range(min(processes, sum(concurrency.values())))]
+    for name, limit in concurrency.items():
+        for index in sorted(range(len(assignment)), key=lambda index: len(assignment[index]))[:limit]:
+            assignment[index].append(name)
+    return assignment
+
+
+class FakeRedisConnection(redis.Redis):
+    """
+    Connection to the fakeredis server of --fake, which does not implement INFO (rq reads the server
+    version from it) and whose CLIENT LIST reply rq cannot parse (the worker's address is then unknown).
+    """
+
+    def info(self, *args, **kwargs):
+        return {"redis_version": "7.2.0"}
+
+    def client_list(self, *args, **kwargs):
+        return []
+
+
+def run_pool_worker(index, queue_names, weights, connection_kwargs, fake=False):
+    """Run one worker process of the pool (weights None: a plain rq worker polling its queues in order)."""
+
+    # Only the supervisor reacts to Ctrl+C in the terminal; it then drains the workers one signal at a time
+    os.setpgrp()
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    connection = (FakeRedisConnection if fake else redis.Redis)(socket_keepalive=True, **connection_kwargs)
+    threading.Thread(target=keepalive_ping, args=(connection,), daemon=True).start()
+
+    queues = [Queue(name, connection=connection) for name in queue_names]
+    name = f"sushi-{socket.gethostname()}-{os.getpid()}-{index}"
+    if weights is None:
+        worker = Worker(queues, connection=connection, name=name)
+    else:
+        worker = WeightedWorker(queues, connection=connection, name=name, weights=weights)
+    # The scheduler moves the delayed pipeline checks (see sushi_utils/submission.py) onto their queue when due
+    worker.work(logging_level="INFO", with_scheduler=True)
+
+
+def supervise(assignment, weights, connection_kwargs, drain_timeout=DRAIN_TIMEOUT, stop=None, fake=False):
+    """
+    Run a worker process per entry of the assignment, restart those that crash, and drain the pool on SIGTERM / SIGINT.
+
+    Draining asks every worker for a warm shutdown (finish the running job, take no new one) and
+    waits up to drain_timeout for them; workers still busy then (or after a second signal) are shut
+    down cold, which kills their job and marks it as failed in rq.
+
+    Args:
+        assignment (list): The queue names of every worker process (see assign_queues)
+        weights (dict): Queue weights (see WeightedWorker), None for plain rq workers
+        connection_kwargs (dict): Arguments of the Redis connection
+        drain_timeout (float): Seconds the running jobs get to finish
+        stop (threading.Event, optional): Set to drain the pool (in addition to the signals)
+        fake (bool): Whether the workers connect to the fakeredis server of --fake
+    """
+
+    context = multiprocessing.get_context("fork")
+    stop = stop or threading.Event()
+    force = threading.Event()
+
+    def request_stop(signum, frame):
+        if stop.is_set():
+            force.set()
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    def start(index):
+        process = context.Process(target=run_pool_worker, args=(index, assignment[index], weights, connection_kwargs, fake), name=f"sushi-worker-{index}")
+        process.start()
+        print(f"[SUSHI WORKER]: worker {index} (PID {process.pid}) on {', '.join(assignment[index])}")
+        return process
+
+    processes = {index: start(index) for index in range(len(assignment))}
+    started = {index: time.time() for index in processes}
+    crashes = {index: 0 for index in processes}
+    restart_at = {}
+
+    while not stop.is_set():
+        for index, process in processes.items():
+            if process.is_alive() or stop.is_set():
+                continue
+            if index not in restart_at:
+                if time.time() - started[index] > RESTART_BACKOFF[1]:
+                    crashes[index] = 0
+                delay = min(RESTART_BACKOFF[0] * 2 ** crashes[index], RESTART_BACKOFF[1])
+                crashes[index] += 1
+                print(f"[SUSHI WORKER]: worker {index} exited with code {process.exitcode}, restarting in {delay} s")
+                restart_at[index] = time.time() + delay
+            elif time.time() >= restart_at[index]:
+                del restart_at[index]
+                processes[index], started[index] = start(index), time.time()
+        stop.wait(0.5)
+
+    print(f"[SUSHI WORKER]: draining {len(processes)} workers (up to {drain_timeout} s, signal again to stop at once)")
+    for process in processes.values():
+        if process.is_alive():
+            os.kill(process.pid, signal.SIGTERM)
+
+    deadline = time.time() + drain_timeout
+    while any(process.is_alive() for process in processes.values()) and time.time() < deadline and not force.is_set():
+        time.sleep(0.2)
+
+    busy = [process for process in processes.values() if process.is_alive()]
+    if busy:
+        print(f"[SUSHI WORKER]: stopping {len(busy)} busy workers, their jobs are marked as failed")
+        for process in busy:
+            os.kill(process.pid, signal.SIGTERM)
+        for process in busy:
+            process.join(10)
+            if process.is_alive():
+                process.kill()
+    print("[SUSHI WORKER]: all workers stopped")
+
+
+######################################################################################################
+####################### Throughput benchmark #########################################################
+######################################################################################################
+
+def start_fake_redis():
+    """Serve an in-memory fakeredis on a free local port (shared by the worker processes) and return its port."""
+
+    try:
+        from fakeredis import TcpFakeServer
+    except ImportError:
+        sys.exit("--fake needs fakeredis >= 2.26 (pip install fakeredis)")
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    server = TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return port
+
+
+def benchmark(connection, queue_names, jobs, durations, stop):
+    """
+    Enqueue a burst of synthetic jobs (those of the slowest queue first), wait until all of them ran,
+    print the wait per queue and the throughput, then stop the pool.
+    """
+
+    queues = {name: Queue(name, connection=connection) for name in queue_names}
+    enqueued = {name: [] for name in queue_names}
+    for name in sorted(queue_names, key=lambda name: -durations.get(name, 0)):
+        for _ in range(jobs):
+            enqueued[name].append(queues[name].enqueue(time.sleep, durations.get(name, 0), result_ttl=3600).id)
+
+    start = time.time()
+    total = sum(len(ids) for ids in enqueued.values())
+    while not stop.is_set():
+        done = sum(queue.finished_job_registry.count + queue.failed_job_registry.count for queue in queues.values())
+        if done >= total:
+            break
+        time.sleep(0.2)
+    else:
+        return  # The pool was stopped before the burst was done
+    elapsed = time.time() - start
+
+    print()
+    print(f"{'queue':<8} {'jobs':>5} {'job s':>6} {'mean wait s':>12} {'p95 wait s':>11} {'last done s':>12}")
+    for name, ids in enqueued.items():
+        finished = [job for job in queues[name].job_class.fetch_many(ids, connection=connection) if job and job.ended_at]
+        waits = np.array([(job.started_at - job.enqueued_at).total_seconds() for job in finished])
+        last = max((job.ended_at - job.enqueued_at).total_seconds() for job in finished) if finished else float("nan")
+        print(f"{name:<8} {len(finished):>5} {durations.get(name, 0):>6.1f} {waits.mean():>12.2f} {np.percentile(waits, 95):>11.2f} {last:>12.2f}")
+    print(f"{total} jobs in {elapsed:.1f} s ({total / elapsed:.1f} jobs/s)")
+    print()
+    stop.set()
+
+
+def _mapping(text, cast):
+    return {name.strip(): cast(value) for name, value in (item.split("=") for item in text.split(",") if item.strip())}
+
 
 if __name__ == "__main__":
-    # Parse command-line arguments
-    parser = argparse.ArgumentParser(description="Run worker with specific queues.")
-    parser.add_argument("--queues", type=str, default="light,heavy",
+    parser = argparse.ArgumentParser(description="Run a supervised pool of rq workers with per-queue concurrency and weighted fair scheduling.")
+    parser.add_argument("--queues", type=str, default=",".join(QUEUE_CONCURRENCY),
                         help="Comma-separated list of queue names (e.g., --queues=queue1,queue2)")
+    parser.add_argument("--processes", type=int, default=WORKER_PROCESSES, help="Worker processes of the pool")
+    parser.add_argument("--concurrency", type=str, default=None,
+                        help="Maximum running jobs per queue, e.g. light=4,heavy=2 (queues not listed may use every process)")
+    parser.add_argument("--weights", type=str, default=None, help="Weights of the queues, e.g. light=3,heavy=1")
+    parser.add_argument("--drain-timeout", type=float, default=DRAIN_TIMEOUT, help="Seconds running jobs get to finish on shutdown")
+    parser.add_argument("--fake", action="store_true", help="Serve an in-memory fakeredis instead of connecting to Redis (for benchmarks)")
+    parser.add_argument("--benchmark", type=int, default=0, help="With --fake: enqueue this many synthetic jobs per queue, report the waits and stop")
+    parser.add_argument("--durations", type=str, default="light=0.2,heavy=2", help="Seconds of the synthetic jobs per queue")
+    parser.add_argument("--legacy", action="store_true", help="Run a single plain rq worker polling the queues in order (to compare with the pool)")
     args = parser.parse_args()
-    
+
     # Convert the comma-separated string into a list
     queue_names = args.queues.split(",")
-    
-    # Run the worker with the specified queue names
-    run_worker(REDIS_HOST, REDIS_PORT, queue_names)
\ No newline at end of file
+    concurrency = {**QUEUE_CONCURRENCY, **_mapping(args.concurrency or "", int)}
+    concurrency = {name: min(concurrency.get(name, args.processes), args.processes) for name in queue_names}
+    weights = {**QUEUE_WEIGHTS, **_mapping(args.weights or "", float)}
+
+    if args.fake:
+        connection_kwargs = {"host": "127.0.0.1", "port": start_fake_redis()}
+    elif args.benchmark:
+        sys.exit("--benchmark enqueues synthetic jobs and needs --fake")
+    else:
+        connection_kwargs = {"host": REDIS_HOST, "port": REDIS_PORT}
+        if REDIS_USERNAME and REDIS_PASSWORD:
+            connection_kwargs.update(username=REDIS_USERNAME, password=REDIS_PASSWORD)
+
+    if args.legacy:
+        assignment, weights = [queue_names], None
+    else:
+        assignment = assign_queues(args.processes, concurrency)
+
+    stop = threading.Event()
+    if args.benchmark:
+        threading.Thread(
+            target=benchmark, args=(FakeRedisConnection(**connection_kwargs), queue_names, args.benchmark, _mapping(args.durations, float), stop), daemon=True
+        ).start()
+
+    # Run the pool with the specified queues until it is stopped
+    supervise(assignment, weights, connection_kwargs, args.drain_timeout, stop, args.fake)
@@ -0,0 +1,118 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from sushi_utils.bfabric_pool import power_user_wrapper
+
+LOOKUP_TTL = 600             # Seconds a B-Fabric lookup result is served from the cache
+LOOKUP_NEGATIVE_TTL = 60     # Seconds an empty result (object not found) is served from the cache
+LOOKUP_MAX_ENTRIES = 4096    # Lookups kept per server process (least recently used evicted first)
+
+
+class BfabricLookupCache:
+    """
+    Thread-safe memoization of B-Fabric lookups whose results rarely change (e.g. the project of an order).
+
+    Results are kept for LOOKUP_TTL seconds, empty results (None or an empty list) for LOOKUP_NEGATIVE_TTL
+    seconds, so repeated lookups of missing objects do not reach B-Fabric either; errors are not cached.
+    Concurrent lookups of the same key are coalesced: the first caller runs the loader, the others wait
+    for its result (or its exception) instead of issuing the same request.
+    """
+
+    def __init__(self, ttl=LOOKUP_TTL, negative_ttl=LOOKUP_NEGATIVE_TTL, max_entries=LOOKUP_MAX_ENTRIES):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires, value)
+        self._inflight = {}            # key -> {"done": threading.Event, "value", "error"}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key, loader, ttl=None, negative_ttl=None):
+        """
+        Return the cached value of a key, or load it with loader() (once, whatever the number of concurrent callers).
+
+        Returned values are shared between callers and must not be modified.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            flight = self._inflight.get(key)
+            if flight is None:
+                flight = {"done": threading.Event(), "value": None, "error": None}
+                self._inflight[key] = flight
+                self.misses += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight["done"].wait()
+            if flight["error"] is not None:
+                raise flight["error"]
+            return flight["value"]
+
+        try:
+            flight["value"] = loader()
+        except Exception as e:
+            flight["error"] = e
+            raise
+        finally:
+            with self._lock:
+                if flight["error"] is None:
+                    seconds = (self.ttl if ttl is None else ttl) if flight["value"] else (self.negative_ttl if negative_ttl is None else negative_ttl)
+                    self._entries[key] = (time.time() + seconds, flight["value"])
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                del self._inflight[key]
+            flight["done"].set()
+        return flight["value"]
+
+    def invalidate(self, key=None):
+        """Drop one cached key, or every key."""
+
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """Return a snapshot of the cache counters."""
+
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "coalesced": self.coalesced}
+
+
+LOOKUPS = BfabricLookupCache()
+
+
+def cached_read(endpoint, obj, environment, ttl=None, negative_ttl=None, cache=None):
+    """
+    Read B-Fabric objects with the power user wrapper through the lookup cache.
+
+    Args:
+        endpoint (str): The B-Fabric endpoint (e.g. "container")
+        obj (dict): The query
+        environment (str): The B-Fabric environment ("TEST" or "PRODUCTION")
+
+    Returns:
+        list: The API response (shared, do not modify)
+    """
+
+    key = (environment.upper(), endpoint, json.dumps(obj, sort_keys=True, default=str))
+    return (cache or LOOKUPS).get(
+        key,
+        lambda: power_user_wrapper(environment).read(endpoint, obj),
+        ttl=ttl,
+        negative_ttl=negative_ttl
+    )
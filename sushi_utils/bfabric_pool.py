@@ -0,0 +1,201 @@
+import copy
+import io
+import os
+import threading
+import requests
+import suds.cache
+import suds.client
+import suds.options
+import suds.transport
+from requests.adapters import HTTPAdapter
+from bfabric import Bfabric
+from bfabric.bfabric import BfabricAPIEngineType
+from bfabric.engine.engine_suds import EngineSUDS
+from bfabric.engine.engine_zeep import EngineZeep
+from bfabric.errors import BfabricRequestError
+from bfabric_web_apps import SCRATCH_PATH, get_power_user_wrapper
+
+WSDL_CACHE_DIR = os.path.join(SCRATCH_PATH, ".sushi_runner_cache", "wsdl")  # Parsed WSDL / XSD of the B-Fabric endpoints, shared by all processes
+WSDL_CACHE_DAYS = 7          # Days a cached WSDL is used before it is downloaded again (B-Fabric updates change the schemas)
+BFABRIC_CONNECTIONS = 16     # Keep-alive HTTPS connections per B-Fabric host and process
+BFABRIC_TIMEOUT = 300        # Seconds a SOAP request may take (large dataset reads are slow)
+
+
+class RequestsTransport(suds.transport.Transport):
+    """
+    suds transport sending through a shared requests session, so connections are kept alive and reused.
+
+    The default suds transport (urllib) opens a new HTTPS connection, with a TLS handshake, for every request.
+    """
+
+    def __init__(self, session, timeout=BFABRIC_TIMEOUT):
+        super().__init__()
+        self.session = session
+        self.timeout = timeout
+
+    def open(self, request):
+        response = self.session.get(request.url, headers=request.headers, timeout=request.timeout or self.timeout)
+        if response.status_code != 200:
+            raise suds.transport.TransportError(response.reason, response.status_code, io.BytesIO(response.content))
+        return io.BytesIO(response.content)
+
+    def send(self, request):
+        response = self.session.post(request.url, data=request.message, headers=request.headers, timeout=request.timeout or self.timeout)
+        if response.status_code != 200:
+            # suds reads the SOAP fault of a 500 reply from the error's fp
+            raise suds.transport.TransportError(response.reason, response.status_code, io.BytesIO(response.content))
+        return suds.transport.Reply(response.status_code, dict(response.headers), response.content)
+
+
+class PooledEngineSUDS(EngineSUDS):
+    """
+    bfabricPy's suds engine, creating its endpoint clients once per process from the WSDL cache and the shared session.
+
+    suds clients are not thread-safe (options and the last messages are kept on the client), so every thread
+    sends through its own copy of the endpoint client; the copies share the parsed WSDL.
+    """
+
+    def __init__(self, base_url, session, cache_dir=WSDL_CACHE_DIR):
+        super().__init__(base_url=base_url)
+        self._session = session
+        self._cache = suds.cache.ObjectCache(location=os.path.join(cache_dir, "suds"), days=WSDL_CACHE_DAYS)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _get_suds_service(self, endpoint):
+        clients = self._local.__dict__.setdefault("clients", {})
+        if endpoint not in clients:
+            with self._lock:
+                if endpoint not in self._cl:
+                    try:
+                        # cachingpolicy=1 pickles the parsed WSDL, so a new process skips the XML parsing as well
+                        self._cl[endpoint] = suds.client.Client(
+                            f"{self._base_url}/{endpoint}?wsdl",
+                            cache=self._cache,
+                            cachingpolicy=1,
+                            transport=RequestsTransport(self._session)
+                        )
+                    except suds.transport.TransportError as error:
+                        if error.httpcode == 404:
+                            msg = f"Non-existent endpoint {repr(endpoint)} or the configured B-Fabric instance was not found."
+                            raise BfabricRequestError(msg) from error
+                        raise
+                template = self._cl[endpoint]
+            # Client.clone() deep-copies the options, which fails on the transport; copy the client by hand instead
+            client = copy.copy(template)
+            client.options = suds.options.Options()
+            client.set_options(cache=self._cache, cachingpolicy=1, transport=RequestsTransport(self._session))
+            client.service = suds.client.ServiceSelector(client, template.wsdl.services)
+            client.messages = dict(tx=None, rx=None)
+            clients[endpoint] = client
+        return clients[endpoint].service
+
+
+class PooledEngineZeep(EngineZeep):
+    """
+    bfabricPy's zeep engine, sending through the shared session and reading the WSDL from the cache on disk.
+
+    Every thread gets its own endpoint clients, like PooledEngineSUDS.
+    """
+
+    def __init__(self, base_url, session, cache_dir=WSDL_CACHE_DIR):
+        import zeep
+        from zeep.cache import SqliteCache
+
+        super().__init__(base_url=base_url)
+        os.makedirs(cache_dir, exist_ok=True)
+        cache = SqliteCache(path=os.path.join(cache_dir, "zeep.sqlite"), timeout=WSDL_CACHE_DAYS * 86400)
+        self._transport = zeep.Transport(session=session, cache=cache, operation_timeout=BFABRIC_TIMEOUT)
+        self._local = threading.local()
+
+    def _get_client(self, endpoint):
+        import zeep
+
+        clients = self._local.__dict__.setdefault("clients", {})
+        if endpoint not in clients:
+            try:
+                clients[endpoint] = zeep.Client(f"{self._base_url}/{endpoint}?wsdl", transport=self._transport)
+            except requests.exceptions.HTTPError as error:
+                if error.response is not None and error.response.status_code == 404:
+                    msg = f"Non-existent endpoint {repr(endpoint)} or the configured B-Fabric instance was not found."
+                    raise BfabricRequestError(msg) from error
+                raise
+        return clients[endpoint]
+
+
+class PooledBfabric(Bfabric):
+    """Bfabric client sending through the engine it is given instead of building its own."""
+
+    def __init__(self, config, auth, engine, engine_type=BfabricAPIEngineType.SUDS):
+        # Set first: the constructor logs the engine in use
+        self._pooled_engine = engine
+        super().__init__(config, auth, engine_type)
+
+    @property
+    def _engine(self):
+        return self._pooled_engine
+
+
+class BfabricClientPool:
+    """
+    Process-wide pool of B-Fabric SOAP engines, one per base URL and engine type.
+
+    bfabricPy builds a new engine, and with it a SOAP client per endpoint (WSDL download and parsing)
+    and new HTTPS connections, for every Bfabric instance, and bfabric_web_apps creates an instance per
+    call (get_power_user_wrapper, token_response_to_bfabric, ...). Instances passed through wrap() use
+    the pooled engine of their base URL instead: endpoint clients are built once per process (and thread),
+    from a WSDL cache on disk shared across processes and restarts, and all requests go through one
+    keep-alive session. Engines hold no credentials (every call passes the instance's auth).
+    """
+
+    def __init__(self, cache_dir=WSDL_CACHE_DIR, connections=BFABRIC_CONNECTIONS):
+        self.cache_dir = cache_dir
+        self.connections = connections
+        self._engines = {}
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _new_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.connections, pool_maxsize=self.connections)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def engine(self, base_url, engine_type=BfabricAPIEngineType.SUDS):
+        """Return the pooled engine of a B-Fabric base URL, creating it on first use."""
+
+        key = (base_url, engine_type)
+        with self._lock:
+            if key not in self._engines:
+                if self._session is None:
+                    self._session = self._new_session()
+                engine_class = PooledEngineZeep if engine_type == BfabricAPIEngineType.ZEEP else PooledEngineSUDS
+                self._engines[key] = engine_class(base_url, self._session, self.cache_dir)
+            return self._engines[key]
+
+    def wrap(self, wrapper, engine_type=BfabricAPIEngineType.SUDS):
+        """Return a Bfabric client with the config and auth of `wrapper`, sending through the pooled engine."""
+
+        return PooledBfabric(wrapper.config, wrapper.auth, self.engine(wrapper.config.base_url, engine_type), engine_type)
+
+    def stats(self):
+        """Return the number of pooled engines and endpoint clients."""
+
+        with self._lock:
+            return {"engines": len(self._engines), "clients": sum(len(engine._cl) for engine in self._engines.values())}
+
+
+BFABRIC_POOL = BfabricClientPool()
+
+
+def pooled_wrapper(wrapper):
+    """Return `wrapper` (a Bfabric instance, e.g. from token_response_to_bfabric) sending through BFABRIC_POOL."""
+
+    return BFABRIC_POOL.wrap(wrapper)
+
+
+def power_user_wrapper(environment):
+    """Return the pooled power user Bfabric client of a B-Fabric environment (see get_power_user_wrapper)."""
+
+    return BFABRIC_POOL.wrap(get_power_user_wrapper({"environment": environment}))
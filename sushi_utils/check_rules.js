@@ -0,0 +1,75 @@
+function (paramValues, rules) {
+    // Browser-side twin of check_rules() in spec_engine.py: validates the sidebar of the displayed
+    // app against the rules of its spec (delivered through the app's rules store) without a server round trip.
+    var ctx = window.dash_clientside.callback_context;
+
+    function isBlank(value) {
+        return value === null || value === undefined || value === "";
+    }
+
+    function violates(check, value, argument) {
+        if (check === "required") {
+            return isBlank(value);
+        }
+        if (check === "minimum") {
+            var number = isBlank(value) ? NaN : Number(value);
+            return !isNaN(number) && number < argument;
+        }
+        if (check === "pattern") {
+            // Python's re.match only anchors at the start
+            return !isBlank(value) && !new RegExp("^(?:" + argument + ")").test(String(value));
+        }
+        if (check === "forbidden") {
+            return value === argument;
+        }
+        return false;
+    }
+
+    function message(rule, key) {
+        return rule.message.split("{field}").join(key);
+    }
+
+    function checkRules(rules, values) {
+        var warnings = [];
+
+        rules.forEach(function (rule) {
+            if (rule.check === "differs") {
+                var first = values[rule.fields[0]], second = values[rule.fields[1]];
+                if (!isBlank(first) && first === second && (rule.ignore || []).indexOf(first) === -1) {
+                    warnings.push(message(rule, rule.fields[0]));
+                }
+                return;
+            }
+
+            rule.fields.forEach(function (key) {
+                if (violates(rule.check, values[key], rule.value)) {
+                    warnings.push(message(rule, key));
+                }
+            });
+        });
+
+        return warnings;
+    }
+
+    var values = {};
+    ctx.inputs_list[0].forEach(function (input) {
+        values[input.id.app] = values[input.id.app] || {};
+        values[input.id.app][input.id.key] = input.value;
+    });
+
+    var rulesByApp = {};
+    ctx.states_list[0].forEach(function (state) {
+        rulesByApp[state.id.app] = state.value || [];
+    });
+
+    var children = [], isOpen = [];
+    ctx.outputs_list[0].forEach(function (output) {
+        var warnings = checkRules(rulesByApp[output.id.app] || [], values[output.id.app] || {});
+        children.push(warnings.length ? warnings.map(function (warning) {
+            return {type: "Div", namespace: "dash_html_components", props: {children: warning}};
+        }) : "");
+        isOpen.push(warnings.length > 0);
+    });
+
+    return [children, isOpen];
+}
@@ -0,0 +1,286 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from bfabric_web_apps import SCRATCH_PATH
+from sushi_utils.bfabric_pool import power_user_wrapper
+from sushi_utils.parquet_cache import PARQUET_CACHE
+
+DATASET_CACHE_MAX_BYTES = 512 * 1024 * 1024   # Upper bound for all cached API responses of one server process
+DATASET_CACHE_MAX_ENTRIES = 256               # Upper bound for the number of cached sessions
+SESSION_DIR = os.path.join(SCRATCH_PATH, ".sushi_runner_cache", "sessions")  # Entity of every session handle, shared by all workers
+SESSION_TTL = 24 * 60 * 60                    # Seconds the entity of a session can be reloaded (B-Fabric tokens expire sooner)
+
+# Mirrors the entity class -> endpoint mapping bfabric_web_apps uses to load the entity
+ENTITY_CLASS_ENDPOINTS = {
+    "Run": "run",
+    "Sample": "sample",
+    "Project": "container",
+    "Order": "container",
+    "Container": "container",
+    "Plate": "plate",
+    "Workunit": "workunit",
+    "Resource": "resource",
+    "Dataset": "dataset"
+}
+
+
+class DatasetCache:
+    """
+    Size-bounded, thread-safe LRU cache holding the B-Fabric API response of each session.
+
+    Every entry keeps the raw API response (needed for container lookups and dataset.tsv streaming)
+    and, once requested, the converted dataset frame (shared across workers via the Parquet cache).
+    Entries are evicted least-recently-used first as soon as either the byte budget or the entry
+    budget is exceeded.
+    """
+
+    def __init__(self, max_bytes=DATASET_CACHE_MAX_BYTES, max_entries=DATASET_CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # handle -> {"response": dict, "frame": pl.DataFrame | None, "size": int}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def put(self, handle, response, size=None):
+        """Store an API response under a handle and evict old entries if the budget is exceeded."""
+
+        if size is None:
+            size = len(json.dumps(response, default=str))
+
+        with self._lock:
+            if handle in self._entries:
+                self._size -= self._entries.pop(handle)["size"]
+
+            self._entries[handle] = {"response": response, "frame": None, "size": size}
+            self._size += size
+
+            while self._entries and (self._size > self.max_bytes or len(self._entries) > self.max_entries):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted["size"]
+                self.evictions += 1
+
+    def get(self, handle):
+        """Return the cache entry for a handle (marking it as recently used), or None."""
+
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(handle)
+            self.hits += 1
+            return entry
+
+    def stats(self):
+        """Return a snapshot of the cache counters."""
+
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+DATASET_CACHE = DatasetCache()
+
+
+def session_handle(token):
+    """Derive the (non-reversible) cache handle of a session from its B-Fabric token."""
+    return hashlib.sha256(str(token).encode("utf-8")).hexdigest()[:32]
+
+
+def _session_path(handle, directory=SESSION_DIR):
+    return os.path.join(directory, f"{handle}.json")
+
+
+def save_session_entity(handle, entity_class, entity_id, environment, directory=SESSION_DIR):
+    """
+    Record server-side which entity a session handle belongs to, so any worker can reload it.
+
+    The entity is taken from the validated token, never from the browser: a handle is only ever
+    resolved to the entity recorded here.
+    """
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        path = _session_path(handle, directory)
+        temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+        descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump({"entity_class": entity_class, "entity_id": entity_id, "environment": environment}, file)
+        os.replace(temporary, path)
+        _prune_sessions(directory)
+    except OSError as e:
+        print(f"[SUSHI CACHE]: could not record the entity of session {handle[:8]}: {e}")
+
+
+def load_session_entity(handle, directory=SESSION_DIR):
+    """Return the entity {"entity_class", "entity_id", "environment"} recorded for a handle, or None."""
+
+    path = _session_path(handle, directory)
+    try:
+        if time.time() - os.path.getmtime(path) > SESSION_TTL:
+            return None
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+_last_prune = 0.0
+
+
+def _prune_sessions(directory):
+    global _last_prune
+
+    if time.time() - _last_prune < 3600:
+        return
+    _last_prune = time.time()
+    for file_name in os.listdir(directory):
+        path = os.path.join(directory, file_name)
+        try:
+            if time.time() - os.path.getmtime(path) > SESSION_TTL:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def cache_entity_data(entity_data, token_data, token):
+    """
+    Move the full API response of an entity into the server-side cache.
+
+    Args:
+        entity_data (dict): Entity data as returned by process_url_and_token
+        token_data (dict): Token metadata of the session
+        token (str): The B-Fabric token of the session
+
+    Returns:
+        dict: The entity data without the full API response, carrying a dataset handle instead
+    """
+
+    if not entity_data:
+        return entity_data
+
+    handle = session_handle(token)
+    response = entity_data.get("full_api_response", {})
+    DATASET_CACHE.put(handle, response)
+    save_session_entity(handle, token_data.get("entityClass_data"), token_data.get("entity_id_data"), token_data.get("environment"))
+
+    # entity_class / entity_id are informational (submission keys); reloads use the server-side record
+    slim_entity_data = {key: value for key, value in entity_data.items() if key != "full_api_response"}
+    slim_entity_data.update({
+        "dataset_handle": handle,
+        "entity_class": token_data.get("entityClass_data"),
+        "entity_id": token_data.get("entity_id_data"),
+        "environment": token_data.get("environment")
+    })
+
+    return slim_entity_data
+
+
+def _reload_entry(handle):
+    """
+    Re-read the entity of a handle from B-Fabric when it is not cached in this process (evicted or other worker).
+
+    Returns None, so the page shows its "no dataset" state, when B-Fabric cannot be read or no longer has the entity.
+    """
+
+    entity = load_session_entity(handle)
+    if entity is None:
+        return None
+
+    endpoint = ENTITY_CLASS_ENDPOINTS.get(entity.get("entity_class"))
+    entity_id = entity.get("entity_id")
+
+    if not endpoint or not entity_id:
+        return None
+
+    try:
+        results = power_user_wrapper(entity.get("environment") or "None").read(endpoint, {"id": entity_id})
+    except Exception as e:
+        print(f"[SUSHI CACHE]: could not re-read {endpoint} {entity_id} of session {handle[:8]}: {e}")
+        return None
+
+    if not results:
+        print(f"[SUSHI CACHE]: {endpoint} {entity_id} of session {handle[:8]} not found in B-Fabric")
+        return None
+    response = results[0]
+
+    DATASET_CACHE.put(handle, response)
+    return DATASET_CACHE.get(handle)
+
+
+def _entry(entity_data):
+    if not entity_data:
+        return None
+
+    # Sessions created before the cache existed still carry the response themselves
+    if "full_api_response" in entity_data:
+        return {"response": entity_data["full_api_response"], "frame": None}
+
+    handle = entity_data.get("dataset_handle")
+    # The handle comes from the browser and names a file: accept session_handle() output only
+    if not isinstance(handle, str) or len(handle) != 32 or any(char not in "0123456789abcdef" for char in handle):
+        return None
+
+    return DATASET_CACHE.get(handle) or _reload_entry(handle)
+
+
+def get_full_api_response(entity_data):
+    """
+    Return the full B-Fabric API response belonging to the entity data of a session.
+
+    Args:
+        entity_data (dict): The (slim) entity data from the 'entity' store
+
+    Returns:
+        dict: The full API response, or {} if none is available
+    """
+
+    entry = _entry(entity_data)
+    return entry["response"] if entry else {}
+
+
+def get_dataset_frame(entity_data):
+    """
+    Return the converted dataset of a session as a polars DataFrame, converting it only once.
+
+    Args:
+        entity_data (dict): The (slim) entity data from the 'entity' store
+
+    Returns:
+        pl.DataFrame: Dataframe containing the dataset information
+    """
+
+    entry = _entry(entity_data)
+    if not entry:
+        return PARQUET_CACHE.get_frame({})
+
+    if entry["frame"] is None:
+        entry["frame"] = PARQUET_CACHE.get_frame(entry["response"])
+
+    return entry["frame"]
+
+
+def get_dataset_dictionary(entity_data):
+    """
+    Return the converted dataset of a session as a dictionary of columns.
+
+    Args:
+        entity_data (dict): The (slim) entity data from the 'entity' store
+
+    Returns:
+        dict: Mapping of column name to the list of column values
+    """
+
+    return get_dataset_frame(entity_data).to_dict(as_series=False)
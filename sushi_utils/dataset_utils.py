@@ -1,35 +1,171 @@
-import pandas as pd
+import csv
+import os
+import polars as pl
 
-def dataset_to_dictionary(dataset): 
+TSV_BUFFER_SIZE = 1 << 16  # 64 KiB write buffer for streamed dataset.tsv files
+
+
+def _dataset_columns(dataset):
 
     """
-    Convert B-Fabric API Dataset Response 
-    to a pandas dataframe
+    Split a B-Fabric API Dataset Response into columns in a single pass.
+
+    Every attribute gets its own value list, and the ``append`` method of that
+    list is bound once per attribute position. The hot loop over items and
+    fields is then a single dict lookup plus a call per cell, instead of a
+    position -> name -> list lookup chain.
 
-    Args: 
+    Args:
         dataset (dict): B-Fabric API Dataset Response
 
     Returns:
-        pd.DataFrame: Dataframe containing the dataset information
+        dict: Mapping of attribute name to the list of field values (in item order)
+    """
+
+    attributes = dataset.get("attribute", [])
+
+    columns = {elt.get("name"): [] for elt in attributes}  # One value list per attribute name
+    append_to = {str(elt.get("position")): columns[elt.get("name")].append for elt in attributes}  # Attribute position -> bound list.append
+
+    for item in dataset.get("item", []):
+        for field in item.get("field"):
+            append_to[field["attributeposition"]](field.get("value"))
+
+    return columns
+
+
+def dataset_to_dictionary(dataset):
+
+    """
+    Convert B-Fabric API Dataset Response
+    to a dictionary of columns
+
+    Args:
+        dataset (dict): B-Fabric API Dataset Response
+
+    Returns:
+        dict: Mapping of attribute name to the list of field values
     """
 
     # Check if the dataset is empty
     if not dataset:
-        return pd.DataFrame()
+        return {}
+
+    return _dataset_columns(dataset)
+
+
+def dataset_to_frame(dataset):
+
+    """
+    Convert B-Fabric API Dataset Response
+    to a polars DataFrame with typed (string) columns
+
+    Args:
+        dataset (dict): B-Fabric API Dataset Response
+
+    Returns:
+        pl.DataFrame: Dataframe containing the dataset information
+    """
+
+    if not dataset:
+        return pl.DataFrame()
+
+    columns = _dataset_columns(dataset)
+    return pl.DataFrame(columns, schema={name: pl.Utf8 for name in columns}, strict=False)
+
+
+def _tsv_writer(handle):
+
+    """
+    Create a csv writer using the same dialect as pandas' DataFrame.to_csv(sep="\\t"),
+    so the streamed files are byte-identical to the ones pandas used to write.
+    """
 
-    attributes = dataset.get("attribute", []) 
-    items = [elt.get("field") for elt in dataset.get("item", [])]
+    return csv.writer(
+        handle,
+        delimiter="\t",
+        quotechar='"',
+        quoting=csv.QUOTE_MINIMAL,
+        doublequote=True,
+        lineterminator=os.linesep
+    )
+
+
+def _dataset_rows(dataset):
+
+    """
+    Yield one row (list of values in attribute order) per B-Fabric dataset item.
+
+    Args:
+        dataset (dict): B-Fabric API Dataset Response
+
+    Yields:
+        list: The field values of one item, None where the item has no such field
+    """
+
+    attributes = dataset.get("attribute", [])
+    column_index = {str(elt.get("position")): i for i, elt in enumerate(attributes)}  # Attribute position -> column index
+    width = len(attributes)
+
+    for item in dataset.get("item", []):
+        row = [None] * width
+        for field in item.get("field"):
+            row[column_index[field["attributeposition"]]] = field.get("value")
+        yield row
+
+
+def dataset_to_tsv(dataset, path, buffer_size=TSV_BUFFER_SIZE, select=None):
+
+    """
+    Stream a B-Fabric API Dataset Response into a dataset.tsv file, row by row.
+
+    Items are read directly from the API response and written through a buffered
+    file handle, so no intermediate column lists or DataFrame are built.
+
+    Args:
+        dataset (dict): B-Fabric API Dataset Response
+        path (str): Destination of the dataset.tsv file
+        buffer_size (int): Size of the write buffer in bytes
+        select (callable, optional): Only write the rows for which select(row) is true
+
+    Returns:
+        str: The path that was written
+    """
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "w", newline="", encoding="utf-8", buffering=buffer_size) as handle:
+        writer = _tsv_writer(handle)
+
+        if not dataset:
+            writer.writerow([])
+            return path
+
+        writer.writerow([elt.get("name") for elt in dataset.get("attribute", [])])
+        writer.writerows(_dataset_rows(dataset) if select is None else filter(select, _dataset_rows(dataset)))
+
+    return path
+
+
+def dataset_dict_to_tsv(dataset_dict, path, buffer_size=TSV_BUFFER_SIZE):
+
+    """
+    Write a dictionary of columns (as returned by dataset_to_dictionary) to a dataset.tsv file.
+
+    Args:
+        dataset_dict (dict): Mapping of column name to the list of column values
+        path (str): Destination of the dataset.tsv file
+        buffer_size (int): Size of the write buffer in bytes
+
+    Returns:
+        str: The path that was written
+    """
 
-    position_map = {str(elt.get("position")): elt.get("name") for elt in attributes} # Create a mapping of attribute positions to names
-    df_dict = {elt : [] for elt in position_map.values()} # Create a dictionary to hold the dataframe data
+    os.makedirs(os.path.dirname(path), exist_ok=True)
 
-    for item in items: 
-        for field in item: 
-            attribute_position = field.get("attributeposition")
-            df_dict[position_map.get(attribute_position)].append(field.get("value")) # Append the field value to the corresponding attribute name in the dictionary
-                
-    # Create a dataframe from the dictionary
-    return df_dict
+    with open(path, "w", newline="", encoding="utf-8", buffering=buffer_size) as handle:
+        writer = _tsv_writer(handle)
+        writer.writerow(list(dataset_dict))
+        writer.writerows(zip(*dataset_dict.values()))
 
-def dataset_dict_to_tsv(): 
-    return
\ No newline at end of file
+    return path
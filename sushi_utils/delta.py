@@ -0,0 +1,99 @@
+import hashlib
+import json
+from sushi_utils.dataset_utils import _dataset_rows
+
+SAMPLE_COLUMN = "Name"  # Dataset column identifying a sample (the first column is used if missing)
+
+
+def sample_index(dataset):
+    """Return the index of the column identifying a sample (SAMPLE_COLUMN, the first column if missing)."""
+
+    names = [elt.get("name") for elt in dataset.get("attribute", [])]
+    return names.index(SAMPLE_COLUMN) if SAMPLE_COLUMN in names else 0
+
+
+def row_hash(row):
+    """Return the hash of one dataset row (list of values in attribute order)."""
+    return hashlib.sha256(json.dumps(row).encode("utf-8")).hexdigest()
+
+
+def dataset_row_hashes(dataset):
+    """
+    Return the hash of every row of a dataset, by sample name.
+
+    Args:
+        dataset (dict): B-Fabric API Dataset Response
+
+    Returns:
+        dict: Sample name -> row hash
+    """
+
+    if not dataset or not dataset.get("attribute"):
+        return {}
+
+    index = sample_index(dataset)
+    return {str(row[index]): row_hash(row) for row in _dataset_rows(dataset)}
+
+
+def plan_delta(current_rows, snapshot):
+    """
+    Compare the rows of a dataset to the snapshot of its last run.
+
+    Args:
+        current_rows (dict): Sample name -> row hash, as returned by dataset_row_hashes()
+        snapshot (dict): The last snapshot of the dataset (see SubmissionLedger.last_snapshot)
+
+    Returns:
+        dict: Lists of sample names under "new", "changed", "unchanged" and "removed"
+    """
+
+    previous = snapshot["rows"]
+
+    return {
+        "new": [sample for sample in current_rows if sample not in previous],
+        "changed": [sample for sample, digest in current_rows.items() if sample in previous and previous[sample]["hash"] != digest],
+        "unchanged": [sample for sample, digest in current_rows.items() if sample in previous and previous[sample]["hash"] == digest],
+        "removed": [sample for sample in previous if sample not in current_rows]
+    }
+
+
+def snapshot_rows(current_rows, run_path, name, snapshot=None, plan=None):
+    """
+    Return the rows of the snapshot recorded for a run: unchanged samples stay with the run
+    whose output already holds them, all others are assigned to this run.
+
+    Returns:
+        dict: Sample name -> {"hash": row hash, "run": run directory, "name": output dataset name}
+    """
+
+    rows = {sample: {"hash": digest, "run": run_path, "name": name} for sample, digest in current_rows.items()}
+
+    if snapshot and plan:
+        for sample in plan["unchanged"]:
+            rows[sample] = snapshot["rows"][sample]
+
+    return rows
+
+
+def merge_manifest(sushi_class, dataset_id, name, process_mode, snapshot, plan, rows):
+    """
+    Describe how the output of a delta run is merged with the output of earlier runs.
+
+    Every entry of "merge" names a run, its output dataset (the next dataset name Sushi
+    was given) and the samples to take from it, so that together they cover the current
+    dataset exactly once.
+    """
+
+    samples_by_run = {}
+    for sample, row in rows.items():
+        samples_by_run.setdefault((row["run"], row["name"]), []).append(sample)
+
+    return {
+        "sushi_class": sushi_class,
+        "dataset_id": dataset_id,
+        "name": name,
+        "process_mode": process_mode,
+        "base_run": {"name": snapshot["name"], "run_path": snapshot["run_path"]},
+        "samples": plan,
+        "merge": [{"run": run, "name": output, "samples": samples} for (run, output), samples in samples_by_run.items()]
+    }
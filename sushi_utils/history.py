@@ -0,0 +1,220 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np
+from bfabric_web_apps import SCRATCH_PATH
+
+HISTORY_PATH = os.path.join(SCRATCH_PATH, ".sushi_runner_cache", "history.sqlite")
+HISTORY_WINDOW = 200      # Latest observed runs per Sushi class and partition the duration model is fitted to
+HISTORY_MIN_RUNS = 5      # Observed runs a partition needs before its duration is predicted
+HISTORY_MODEL_TTL = 600   # Seconds a fitted model is served from memory before it is refitted
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    name TEXT NOT NULL,
+    sushi_class TEXT NOT NULL,
+    run_path TEXT NOT NULL,
+    partition TEXT,
+    cores REAL,
+    ram REAL,
+    input_gb REAL,
+    samples INTEGER,
+    reference_gb REAL,
+    submitted REAL NOT NULL,
+    turnaround REAL,
+    runtime REAL,
+    peak_ram_gb REAL,
+    observed REAL
+);
+CREATE INDEX IF NOT EXISTS runs_name ON runs (name, submitted);
+CREATE INDEX IF NOT EXISTS runs_observed ON runs (sushi_class, partition, observed);
+"""
+
+
+def format_duration(seconds):
+    """Format a duration as e.g. 2h05m or 4m30s."""
+
+    hours, seconds = divmod(int(seconds), 3600)
+    return f"{hours}h{seconds // 60:02d}m" if hours else f"{seconds // 60}m{seconds % 60:02d}s"
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RunHistory:
+    """
+    SQLite history of submitted Sushi jobs and their observed turnaround, runtime and peak memory.
+
+    Every submission is recorded with its partition, resources and input size. Observations are
+    added later: the turnaround (submission until the output dataset appeared) by the pipeline
+    executor, the runtime and peak memory from cluster accounting (scripts/run_history.py --import).
+    The duration of a new job is predicted per partition from the latest observed runs of its app
+    (a least squares fit of the turnaround, or the runtime where no turnaround was observed, over
+    input size); the fitted models are kept in memory, so a prediction at page load usually costs
+    no database access.
+    """
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self._initialized = False
+        self._models = {}  # sushi class -> (fitted at, {partition: model})
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _connect(self):
+        """Yield a connection inside a transaction (committed on success) and close it afterwards."""
+
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+
+        try:
+            if not self._initialized:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.executescript(SCHEMA)
+                self._initialized = True
+
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def record(self, name, sushi_class, run_path, parameters, features):
+        """
+        Record a submitted job.
+
+        Args:
+            name (str): The name of the job (its output dataset)
+            sushi_class (str): The Sushi class the job runs
+            run_path (str): The staging directory of the job
+            parameters (dict): The content of parameters.tsv (partition, cores and ram are kept)
+            features (dict): {"input_gb", "samples", "reference_gb"} of the job's input (see sizing.job_features)
+        """
+
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO runs (name, sushi_class, run_path, partition, cores, ram, input_gb, samples, reference_gb, submitted) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    name, sushi_class, run_path, parameters.get("partition"), _number(parameters.get("cores")), _number(parameters.get("ram")),
+                    features.get("input_gb"), features.get("samples"), features.get("reference_gb"), time.time()
+                )
+            )
+
+    def observe(self, name, turnaround=None, runtime=None, peak_ram_gb=None):
+        """
+        Add observations to the latest submitted job of this name; values that are None are left as they are.
+
+        Returns:
+            bool: True if a job of this name was found
+        """
+
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE runs SET turnaround = COALESCE(?, turnaround), runtime = COALESCE(?, runtime), "
+                "peak_ram_gb = COALESCE(?, peak_ram_gb), observed = ? "
+                "WHERE rowid = (SELECT rowid FROM runs WHERE name = ? ORDER BY submitted DESC LIMIT 1)",
+                (turnaround, runtime, peak_ram_gb, time.time(), name)
+            )
+            return cursor.rowcount > 0
+
+    def _fit(self, sushi_class):
+        with self._connect() as connection:
+            partitions = [row["partition"] for row in connection.execute(
+                "SELECT DISTINCT partition FROM runs WHERE sushi_class = ? AND observed IS NOT NULL", (sushi_class,)
+            )]
+            models = {}
+            for partition in partitions:
+                rows = connection.execute(
+                    "SELECT input_gb, COALESCE(turnaround, runtime) AS duration, peak_ram_gb FROM runs "
+                    "WHERE sushi_class = ? AND partition IS ? AND COALESCE(turnaround, runtime) IS NOT NULL "
+                    "ORDER BY observed DESC LIMIT ?",
+                    (sushi_class, partition, HISTORY_WINDOW)
+                ).fetchall()
+                if len(rows) < HISTORY_MIN_RUNS:
+                    continue
+
+                x = np.array([row["input_gb"] or 0.0 for row in rows])
+                y = np.array([row["duration"] for row in rows])
+                X = np.column_stack([np.ones(len(rows)), x])
+                coefficients = np.maximum(np.linalg.lstsq(X, y, rcond=None)[0], 0) if x.any() else np.array([np.median(y), 0.0])
+                peaks = [row["peak_ram_gb"] for row in rows if row["peak_ram_gb"] is not None]
+
+                models[partition] = {
+                    "intercept": float(coefficients[0]),
+                    "per_gb": float(coefficients[1]),
+                    "runs": len(rows),
+                    "peak_ram_gb": float(np.max(peaks)) if peaks else None
+                }
+        return models
+
+    def models(self, sushi_class):
+        """Return the duration model of every partition with enough observed runs of an app (cached for HISTORY_MODEL_TTL)."""
+
+        with self._lock:
+            cached = self._models.get(sushi_class)
+        if cached and time.time() - cached[0] < HISTORY_MODEL_TTL:
+            return cached[1]
+
+        models = self._fit(sushi_class)
+        with self._lock:
+            self._models[sushi_class] = (time.time(), models)
+        return models
+
+    def predict(self, sushi_class, input_gb):
+        """
+        Predict the duration of a job on every partition with enough history.
+
+        Args:
+            sushi_class (str): The Sushi class the job runs
+            input_gb (float): The size of the job's input (None if unknown)
+
+        Returns:
+            dict: Partition -> {"seconds": predicted duration, "runs": observed runs, "peak_ram_gb": largest observed peak}
+        """
+
+        return {
+            partition: {
+                "seconds": model["intercept"] + model["per_gb"] * (input_gb or 0.0),
+                "runs": model["runs"],
+                "peak_ram_gb": model["peak_ram_gb"]
+            }
+            for partition, model in self.models(sushi_class).items()
+        }
+
+    def report(self, since=None):
+        """Return the submitted and observed runs and the median turnaround / runtime / peak per Sushi class and partition."""
+
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT sushi_class, partition, turnaround, runtime, peak_ram_gb FROM runs WHERE submitted >= ? ORDER BY sushi_class, partition",
+                (since or 0,)
+            ).fetchall()
+
+        report = {}
+        for row in rows:
+            entry = report.setdefault((row["sushi_class"], row["partition"]), {"submitted": 0, "turnaround": [], "runtime": [], "peak_ram_gb": []})
+            entry["submitted"] += 1
+            for column in ("turnaround", "runtime", "peak_ram_gb"):
+                if row[column] is not None:
+                    entry[column].append(row[column])
+
+        return {
+            key: {
+                "submitted": entry["submitted"],
+                "observed": len(entry["turnaround"]),
+                **{column: float(np.median(entry[column])) if entry[column] else None for column in ("turnaround", "runtime", "peak_ram_gb")}
+            }
+            for key, entry in report.items()
+        }
+
+
+HISTORY = RunHistory()
@@ -0,0 +1,165 @@
+import json
+import os
+import socket
+import threading
+import time
+from bfabric_web_apps import SCRATCH_PATH
+
+JOURNAL_DIR = os.path.join(SCRATCH_PATH, ".sushi_runner_cache", "journal")
+JOURNAL_RETENTION = 2 * 24 * 3600  # Seconds of journal files replayed at startup (older files are deleted)
+JOURNAL_FSYNC = True               # Flush every group of records to disk before the writers return (disable only for tests / benchmarks)
+
+# States a submission ends in; submissions whose last state is none of these were interrupted
+TERMINAL_STATES = ("finished", "failed", "interrupted")
+
+HOST = socket.gethostname()  # Recorded with every record, so a restarted server can tell whether its writer still runs
+
+
+class SubmissionJournal:
+    """
+    Append-only journal (JSON lines) of the state transitions of every submission, shared by all processes.
+
+    A submission is journaled as "queued" (with everything needed to run it again) before its ID is
+    returned to the browser, each of its jobs as "staged", "dispatched" (right before sushi_fabric is
+    invoked) and "accepted" or "failed", and the submission itself as "finished" or "failed" at the
+    end. After a crash, replay() tells which submissions were in flight and how far they got.
+
+    Records are made durable by group commit: concurrent writers hand their records to whichever
+    of them is flushing, which writes and fsyncs them all at once, so at high submission rates the
+    number of fsyncs grows with the flushes rather than with the records. The journal is rotated
+    daily and files older than JOURNAL_RETENTION are deleted when it is replayed.
+    """
+
+    def __init__(self, directory=JOURNAL_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._flushed = threading.Condition(self._lock)
+        self._buffer = []       # Records not written yet
+        self._appended = 0      # Sequence number of the last appended record
+        self._durable = 0       # Sequence number of the last record on disk
+        self._flushing = False  # Whether a writer is currently flushing a group
+        self._fd = None
+        self._file_name = None
+
+    def append(self, submission_id, state, **fields):
+        """
+        Append a state transition and return once it is on disk.
+
+        Failures to write are printed rather than raised, so the journal never stops a submission.
+
+        Args:
+            submission_id (str): The ID of the submission
+            state (str): The state it reached
+            **fields: Further JSON serializable details (job name, run path, error, ...)
+        """
+
+        record = json.dumps(
+            {"time": time.time(), "id": submission_id, "state": state, "host": HOST, "pid": os.getpid(), **fields}, default=str
+        ) + "\n"
+
+        with self._lock:
+            self._buffer.append(record)
+            self._appended += 1
+            ticket = self._appended
+
+            while self._durable < ticket:
+                if self._flushing:
+                    self._flushed.wait()
+                    continue
+
+                # Nobody is flushing: flush everything buffered so far, including the records
+                # appended by the writers that arrived while the previous group was flushed
+                group, last = self._buffer, self._appended
+                self._buffer, self._flushing = [], True
+                self._lock.release()
+                try:
+                    self._write("".join(group))
+                finally:
+                    self._lock.acquire()
+                    self._flushing = False
+                    self._durable = last
+                    self._flushed.notify_all()
+
+    def _write(self, data):
+        try:
+            file_name = f"journal-{time.strftime('%Y%m%d')}.jsonl"
+            if file_name != self._file_name:
+                os.makedirs(self.directory, exist_ok=True)
+                if self._fd is not None:
+                    os.close(self._fd)
+                # The records hold the settings and entities of the submissions, so the journal is only readable by the server's user
+                self._fd = os.open(os.path.join(self.directory, file_name), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+                self._file_name = file_name
+
+            content = data.encode("utf-8")
+            while content:
+                content = content[os.write(self._fd, content):]
+            if JOURNAL_FSYNC:
+                os.fsync(self._fd)
+        except Exception as e:
+            print("[SUSHI JOURNAL]: writing failed:", str(e))
+
+    def replay(self):
+        """
+        Read the journal and delete the files older than JOURNAL_RETENTION.
+
+        Returns:
+            dict: Submission ID -> its records in the order they were journaled
+        """
+
+        submissions = {}
+        if not os.path.isdir(self.directory):
+            return submissions
+
+        for file_name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, file_name)
+            if not file_name.endswith(".jsonl"):
+                continue
+            if os.path.getmtime(path) < time.time() - JOURNAL_RETENTION and file_name != self._file_name:
+                os.remove(path)
+                continue
+
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # A record torn by the crash was never reported as durable
+                    submissions.setdefault(record["id"], []).append(record)
+
+        return submissions
+
+    def in_flight(self):
+        """Return the records of the submissions that did not reach a terminal state (see TERMINAL_STATES)."""
+
+        return {
+            submission_id: records for submission_id, records in self.replay().items()
+            if not any(record["state"] in TERMINAL_STATES and "job" not in record for record in records)
+        }
+
+
+def writer_alive(record):
+    """Return whether the process that journaled a record still runs (assumed for records of other hosts, which cannot be checked)."""
+
+    if record.get("host") != HOST:
+        return True
+    try:
+        os.kill(record["pid"], 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def job_states(records):
+    """Return the last state of every job of a submission by its run path, from the submission's records."""
+
+    states = {}
+    for record in records:
+        if "run_path" in record:
+            states[record["run_path"]] = record
+    return states
+
+
+JOURNAL = SubmissionJournal()
@@ -0,0 +1,351 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from bfabric_web_apps import SCRATCH_PATH
+from sushi_utils.parameters import canonical_parameters
+
+LEDGER_PATH = os.path.join(SCRATCH_PATH, ".sushi_runner_cache", "ledger.sqlite")
+LEDGER_VERSION = 1  # Bump to invalidate all entries when the key derivation changes
+
+# Parameters that do not change the output of a job (naming, notification and cluster resources)
+IGNORED_PARAMETERS = ("name", "comment", "mail", "ram", "cores", "scratch", "partition")
+
+# Parameters that only change how a job is split, not the per-sample results (ignored for delta runs)
+PROCESS_MODE_PARAMETERS = ("processMode", "process_mode")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    key TEXT NOT NULL,
+    sushi_class TEXT NOT NULL,
+    name TEXT NOT NULL,
+    run_path TEXT NOT NULL,
+    created REAL NOT NULL,
+    invalidated REAL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    project_id TEXT,
+    environment TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (key);
+CREATE TABLE IF NOT EXISTS snapshots (
+    key TEXT NOT NULL,
+    sushi_class TEXT NOT NULL,
+    parameters_key TEXT NOT NULL,
+    dataset_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    run_path TEXT NOT NULL,
+    rows TEXT NOT NULL,
+    created REAL NOT NULL,
+    invalidated REAL,
+    status TEXT NOT NULL DEFAULT 'pending'
+);
+CREATE INDEX IF NOT EXISTS snapshots_dataset ON snapshots (parameters_key, dataset_id);
+CREATE TABLE IF NOT EXISTS lookups (
+    key TEXT NOT NULL,
+    sushi_class TEXT NOT NULL,
+    hit INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS claims (
+    key TEXT PRIMARY KEY,
+    app TEXT NOT NULL,
+    submission_id TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS duplicates (
+    key TEXT NOT NULL,
+    app TEXT NOT NULL,
+    submission_id TEXT NOT NULL,
+    created REAL NOT NULL
+);
+"""
+
+# Columns added after the first release, for ledgers created before them (runs recorded back then stay pending)
+MIGRATIONS = (
+    ("runs", "status", "TEXT NOT NULL DEFAULT 'pending'"),
+    ("runs", "project_id", "TEXT"),
+    ("runs", "environment", "TEXT"),
+    ("snapshots", "status", "TEXT NOT NULL DEFAULT 'pending'")
+)
+
+RUN_STATUSES = ("pending", "available", "failed")  # A run is reused (or a delta base) only once B-Fabric shows its output available
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """Return the sha256 hex digest of a file's content."""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parameters_key(sushi_class, parameters):
+    """
+    Return the key of a job's settings regardless of its dataset and process mode.
+
+    Runs sharing this key produce the same result for the same sample, which is what
+    delta runs (see sushi_utils/delta.py) rely on.
+    """
+
+    content = json.dumps(
+        {"version": LEDGER_VERSION, "class": sushi_class, "parameters": canonical_parameters(parameters, IGNORED_PARAMETERS + PROCESS_MODE_PARAMETERS)},
+        sort_keys=True
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def job_key(sushi_class, parameters, dataset_path):
+    """
+    Return the canonical key of a job: identical keys mean identical Sushi output.
+
+    Args:
+        sushi_class (str): The Sushi class the job runs
+        parameters (dict): The content of parameters.tsv
+        dataset_path (str): The staged dataset.tsv, whose content is hashed
+
+    Returns:
+        str: A sha256 hex digest
+    """
+
+    content = json.dumps(
+        {"version": LEDGER_VERSION, "class": sushi_class, "parameters": canonical_parameters(parameters, IGNORED_PARAMETERS), "dataset": file_digest(dataset_path)},
+        sort_keys=True
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class SubmissionLedger:
+    """
+    SQLite ledger of submitted Sushi jobs, keyed by job_key(), shared by all processes.
+
+    Every submitted run is recorded as pending; only once B-Fabric shows its output available
+    (see set_status) is it offered for reuse to identical later jobs, and a failed run never is.
+    Every lookup is recorded for the hit-rate report. For every submitted dataset the ledger
+    also keeps a snapshot of its rows, from which delta runs determine the new and changed
+    samples; like runs, only the snapshots of available runs are used. Entries stay valid until
+    they are invalidated explicitly (by key, Sushi class or age). Finally, submissions claim their
+    idempotency key here, so that a repeated click or request is recognized by every server process;
+    a submission that fails releases its claim.
+    """
+
+    def __init__(self, path=LEDGER_PATH):
+        self.path = path
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        """Yield a connection inside a transaction (committed on success) and close it afterwards."""
+
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+
+        try:
+            if not self._initialized:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.executescript(SCHEMA)
+                for table, column, definition in MIGRATIONS:
+                    if column not in [row["name"] for row in connection.execute(f"PRAGMA table_info({table})")]:
+                        connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                self._initialized = True
+
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def lookup(self, key, sushi_class):
+        """
+        Return the latest available run with this key (as a dict), or None; the lookup is counted.
+        """
+
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT * FROM runs WHERE key = ? AND invalidated IS NULL AND status = 'available' ORDER BY created DESC LIMIT 1",
+                (key,)
+            ).fetchone()
+            connection.execute(
+                "INSERT INTO lookups (key, sushi_class, hit, created) VALUES (?, ?, ?, ?)",
+                (key, sushi_class, row is not None, time.time())
+            )
+
+        return dict(row) if row else None
+
+    def pending(self, key=None, parameters_key=None, dataset_id=None):
+        """
+        Return the valid pending runs (as dicts, newest first) with this key, or those with a pending
+        snapshot of a dataset for these settings; their status is to be checked in B-Fabric.
+        """
+
+        with self._connect() as connection:
+            if key is not None:
+                rows = connection.execute(
+                    "SELECT * FROM runs WHERE key = ? AND invalidated IS NULL AND status = 'pending' ORDER BY created DESC",
+                    (key,)
+                ).fetchall()
+            else:
+                rows = connection.execute(
+                    "SELECT runs.* FROM runs JOIN snapshots ON snapshots.run_path = runs.run_path "
+                    "WHERE snapshots.parameters_key = ? AND snapshots.dataset_id = ? AND snapshots.invalidated IS NULL "
+                    "AND snapshots.status = 'pending' ORDER BY runs.created DESC",
+                    (parameters_key, str(dataset_id))
+                ).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def record(self, key, sushi_class, name, run_path, project_id=None, environment=None):
+        """Record a submitted run as pending (B-Fabric has yet to show its output)."""
+
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO runs (key, sushi_class, name, run_path, created, project_id, environment) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, sushi_class, name, run_path, time.time(), None if project_id is None else str(project_id), environment)
+            )
+
+    def set_status(self, run_path, status):
+        """Set the status ("pending", "available" or "failed") of a run and of its snapshot."""
+
+        if status not in RUN_STATUSES:
+            raise ValueError(f"Unknown run status {status}")
+
+        with self._connect() as connection:
+            connection.execute("UPDATE runs SET status = ? WHERE run_path = ?", (status, run_path))
+            connection.execute("UPDATE snapshots SET status = ? WHERE run_path = ?", (status, run_path))
+
+    def record_snapshot(self, key, sushi_class, parameters_key, dataset_id, name, run_path, rows):
+        """
+        Record the rows of a dataset covered by a submitted run (pending, like the run).
+
+        Args:
+            rows (dict): Sample name -> {"hash": row hash, "run": name of the run whose output holds the sample}
+        """
+
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO snapshots (key, sushi_class, parameters_key, dataset_id, name, run_path, rows, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, sushi_class, parameters_key, str(dataset_id), name, run_path, json.dumps(rows), time.time())
+            )
+
+    def last_snapshot(self, parameters_key, dataset_id):
+        """Return the latest valid snapshot of a dataset for these settings whose run is available (rows decoded), or None."""
+
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT * FROM snapshots WHERE parameters_key = ? AND dataset_id = ? AND invalidated IS NULL AND status = 'available' "
+                "ORDER BY created DESC LIMIT 1",
+                (parameters_key, str(dataset_id))
+            ).fetchone()
+
+        if row is None:
+            return None
+        return {**dict(row), "rows": json.loads(row["rows"])}
+
+    def claim(self, key, app, submission_id, window, count=True):
+        """
+        Claim an idempotency key for a submission, unless it was claimed within the last window seconds.
+
+        Expired claims are dropped and the key inserted in one transaction, so of several
+        concurrent claims exactly one succeeds. Every refused claim is counted as a duplicate,
+        unless count is False.
+
+        Returns:
+            str or None: The ID of the earlier submission holding the key, or None if the claim succeeded
+        """
+
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("DELETE FROM claims WHERE key = ? AND created < ?", (key, now - window))
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO claims (key, app, submission_id, created) VALUES (?, ?, ?, ?)",
+                (key, app, submission_id, now)
+            )
+            if cursor.rowcount:
+                return None
+
+            earlier = connection.execute("SELECT submission_id FROM claims WHERE key = ?", (key,)).fetchone()["submission_id"]
+            if count:
+                connection.execute(
+                    "INSERT INTO duplicates (key, app, submission_id, created) VALUES (?, ?, ?, ?)",
+                    (key, app, earlier, now)
+                )
+            return earlier
+
+    def release(self, submission_id):
+        """
+        Drop the claims of a submission (one that failed or could not be enqueued), so that the same
+        settings can be submitted again right away instead of being refused as a duplicate.
+
+        Returns:
+            int: The number of claims dropped
+        """
+
+        with self._connect() as connection:
+            return connection.execute("DELETE FROM claims WHERE submission_id = ?", (submission_id,)).rowcount
+
+    def duplicates(self, since=None):
+        """Return the number of duplicate submissions prevented per app (and in total under "all")."""
+
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT app, COUNT(*) AS count FROM duplicates WHERE created >= ? GROUP BY app ORDER BY app",
+                (since or 0,)
+            ).fetchall()
+
+        report = {row["app"]: row["count"] for row in rows}
+        report["all"] = sum(report.values())
+        return report
+
+    def invalidate(self, key=None, sushi_class=None, before=None):
+        """
+        Invalidate runs (and their snapshots) so they are no longer reused; without any filter, all runs are invalidated.
+
+        Args:
+            key (str, optional): Only the runs with this key
+            sushi_class (str, optional): Only the runs of this Sushi class
+            before (float, optional): Only the runs created before this UNIX timestamp
+
+        Returns:
+            int: The number of runs invalidated
+        """
+
+        conditions, arguments = ["invalidated IS NULL"], [time.time()]
+        for column, operator, value in (("key", "=", key), ("sushi_class", "=", sushi_class), ("created", "<", before)):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                arguments.append(value)
+
+        with self._connect() as connection:
+            cursor = connection.execute(f"UPDATE runs SET invalidated = ? WHERE {' AND '.join(conditions)}", arguments)
+            connection.execute(f"UPDATE snapshots SET invalidated = ? WHERE {' AND '.join(conditions)}", arguments)
+            return cursor.rowcount
+
+    def hit_rates(self, since=None):
+        """
+        Return the lookups, hits and hit rate per Sushi class (and in total under "all").
+
+        Args:
+            since (float, optional): Only count lookups after this UNIX timestamp
+        """
+
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT sushi_class, COUNT(*) AS lookups, SUM(hit) AS hits FROM lookups WHERE created >= ? GROUP BY sushi_class ORDER BY sushi_class",
+                (since or 0,)
+            ).fetchall()
+
+        report = {row["sushi_class"]: {"lookups": row["lookups"], "hits": row["hits"]} for row in rows}
+        report["all"] = {"lookups": sum(row["lookups"] for row in rows), "hits": sum(row["hits"] for row in rows)}
+
+        for counts in report.values():
+            counts["hit_rate"] = counts["hits"] / counts["lookups"] if counts["lookups"] else 0.0
+
+        return report
+
+
+LEDGER = SubmissionLedger()
@@ -0,0 +1,67 @@
+import hashlib
+import io
+import math
+from sushi_utils.dataset_utils import _tsv_writer
+
+BOOLEAN_STRINGS = {"true": "true", "false": "false"}  # Booleans arriving as strings (from selects), any case
+
+
+def format_value(value):
+    """
+    Return the canonical text of a parameter value, as written to parameters.tsv.
+
+    Booleans (also "True" / "FALSE" strings) become true / false, integral floats lose their
+    fraction (32.0 -> 32), other floats use their shortest round-trip form, None becomes empty,
+    and strings are stripped of surrounding whitespace.
+    """
+
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ""
+        return str(int(value)) if value.is_integer() else repr(value)
+
+    text = str(value).strip()
+    return BOOLEAN_STRINGS.get(text.lower(), text)
+
+
+def canonical_parameters(parameters, ignored=()):
+    """Return the parameters with canonical values (see format_value), in their original order, without the ignored keys."""
+    return {str(key): format_value(value) for key, value in parameters.items() if key not in ignored}
+
+
+def serialize_parameters(parameters):
+    """
+    Return the content of parameters.tsv: one "key<TAB>value" line per parameter, in the order given.
+
+    Values containing tabs, quotes or line breaks are quoted as Sushi's CSV reader expects.
+    """
+
+    handle = io.StringIO()
+    writer = _tsv_writer(handle)
+    for key, value in canonical_parameters(parameters).items():
+        writer.writerow([key, value])
+    return handle.getvalue()
+
+
+def write_parameters(parameters, param_path):
+    """Write parameters.tsv (see serialize_parameters)."""
+
+    with open(param_path, "w", encoding="utf-8", newline="") as handle:
+        handle.write(serialize_parameters(parameters))
+
+
+def parameters_digest(parameters, ignored=()):
+    """
+    Return the sha256 hex digest of the canonical parameters, independent of their order.
+
+    Parameters that only differ in formatting (True / "true", 32 / 32.0) have the same digest.
+    """
+
+    lines = sorted(f"{key}\t{value}" for key, value in canonical_parameters(parameters, ignored).items())
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
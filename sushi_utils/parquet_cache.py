@@ -0,0 +1,150 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+import polars as pl
+from bfabric_web_apps import SCRATCH_PATH
+from sushi_utils.dataset_utils import dataset_to_frame
+
+PARQUET_CACHE_DIR = os.path.join(SCRATCH_PATH, ".sushi_runner_cache", "datasets")
+PARQUET_CACHE_TTL = 7 * 24 * 60 * 60              # Seconds a converted dataset stays valid without being read
+PARQUET_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # Upper bound for the cache directory, shared by all workers
+PARQUET_CACHE_VERSION = 1                         # Bump to invalidate all entries when the conversion changes
+
+
+class ParquetDatasetCache:
+    """
+    Content-addressed on-disk cache of converted B-Fabric datasets, shared by all worker processes.
+
+    Every dataset is stored once as a Parquet file named after the hash of its B-Fabric id and
+    modification timestamp, so a modified dataset automatically gets a new entry. Files are written
+    to a temporary name and renamed into place, which makes them safe to read (memory-mapped) from
+    any process at any time. Reading an entry refreshes its mtime; eviction removes entries that
+    were not read within the TTL and then the least recently read ones until the size budget holds.
+    """
+
+    def __init__(self, directory=PARQUET_CACHE_DIR, ttl=PARQUET_CACHE_TTL, max_bytes=PARQUET_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    @staticmethod
+    def cache_key(dataset):
+        """Return the cache key of a dataset response, or None if it cannot be addressed."""
+
+        dataset_id, modified = dataset.get("id"), dataset.get("modified")
+        if dataset_id is None or modified is None:
+            return None
+
+        content = f"{PARQUET_CACHE_VERSION}:{dataset_id}:{modified}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.parquet")
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get_frame(self, dataset):
+        """
+        Return the converted dataset as a polars DataFrame, reading it from the disk cache if possible.
+
+        Args:
+            dataset (dict): B-Fabric API Dataset Response
+
+        Returns:
+            pl.DataFrame: Dataframe containing the dataset information
+        """
+
+        key = self.cache_key(dataset) if dataset else None
+        if key is None:
+            return dataset_to_frame(dataset)
+
+        path = self._path(key)
+
+        try:
+            frame = pl.read_parquet(path, memory_map=True)
+            os.utime(path)
+            self._count("hits")
+            return frame
+        except FileNotFoundError:
+            self._count("misses")
+        except Exception as e:
+            print(f"[PARQUET CACHE] Could not read {path}: {e}")
+            self._count("errors")
+
+        frame = dataset_to_frame(dataset)
+
+        if frame.width:
+            self._write(frame, path)
+
+        return frame
+
+    def _write(self, frame, path):
+        """Atomically write a frame into the cache and enforce the cache limits."""
+
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            frame.write_parquet(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[PARQUET CACHE] Could not write {path}: {e}")
+            self._count("errors")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self.evict()
+
+    def evict(self):
+        """Remove expired entries, then the least recently read ones until the size budget holds."""
+
+        now = time.time()
+        entries = []
+
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".parquet"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except (FileNotFoundError, OSError):
+            return
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+
+        for mtime, size, path in entries:
+            if now - mtime <= self.ttl and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self._count("evictions")
+            except FileNotFoundError:
+                pass  # Already evicted by another worker
+            total -= size
+
+    def stats(self):
+        """Return the hit/miss counters of this process."""
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "errors": self.errors
+            }
+
+
+PARQUET_CACHE = ParquetDatasetCache()
@@ -0,0 +1,541 @@
+import contextlib
+import fcntl
+import functools
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import yaml
+from bfabric_web_apps import SCRATCH_PATH
+from sushi_utils.bfabric_pool import power_user_wrapper
+from sushi_utils.history import HISTORY, format_duration
+
+PIPELINE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sushi_layouts", "pipelines")
+PIPELINE_STATE_DIR = os.path.join(SCRATCH_PATH, ".sushi_runner_cache", "pipelines")  # State of the running pipelines, shared by the server and the workers
+
+PIPELINE_POLL_INTERVAL = 300          # Seconds between two checks of the running stages (each a short job of its own)
+PIPELINE_STAGE_TIMEOUT = 3 * 24 * 3600  # Seconds a stage may take before its output is given up on
+PIPELINE_CLOCK_SKEW = 120             # Seconds an output dataset may seem to be created before its job was submitted
+PIPELINE_STATE_RETENTION = 14 * 24 * 3600  # Seconds the state of a pipeline is kept after its last change (its status stays queryable)
+
+
+@functools.lru_cache(maxsize=None)
+def load_pipeline(name):
+    """
+    Load and validate a pipeline from sushi_layouts/pipelines/<name>.yaml.
+
+    Args:
+        name (str): Name of the pipeline file (without extension)
+
+    Returns:
+        dict: The pipeline, with its name under "name"
+    """
+
+    with open(os.path.join(PIPELINE_DIR, f"{name}.yaml"), encoding="utf-8") as handle:
+        pipeline = yaml.safe_load(handle)
+
+    pipeline["name"] = name
+    validate_pipeline(pipeline)
+    return pipeline
+
+
+def validate_pipeline(pipeline):
+    """
+    Raise a ValueError if a pipeline is not a DAG of known apps.
+
+    Stages may only depend on stages defined before them, so the stage order is a topological
+    order. Only the first stage has no input; it runs on the dataset the pipeline is started from.
+    The fields a stage asks for or sets ("ask", "values") must be fields of its app, and stage
+    names may not contain ":" (they are part of the ids of the pipeline form).
+    """
+
+    from sushi_utils.spec_engine import load_spec, spec_fields
+
+    seen = []
+    for i, stage in enumerate(pipeline["stages"]):
+        if stage["name"] in seen or ":" in stage["name"]:
+            raise ValueError(f"Pipeline {pipeline['name']}: duplicate or invalid stage name {stage['name']}")
+        if (i == 0) != ("input" not in stage):
+            raise ValueError(f"Pipeline {pipeline['name']}: every stage but the first needs an input")
+        unknown = [dependency for dependency in _dependencies(stage) if dependency not in seen]
+        if unknown:
+            raise ValueError(f"Pipeline {pipeline['name']}: stage {stage['name']} depends on unknown or later stages {unknown}")
+        fields = {field["key"]: field for field in spec_fields(load_spec(stage["app"]))}
+        unknown = [key for key in stage.get("ask", []) + list(stage.get("values", {})) if key not in fields]
+        if unknown:
+            raise ValueError(f"Pipeline {pipeline['name']}: stage {stage['name']} refers to unknown fields {unknown}")
+        if any(fields[key].get("component", "input") not in ("input", "select") for key in stage.get("ask", [])):
+            raise ValueError(f"Pipeline {pipeline['name']}: stage {stage['name']} may only ask for input and select fields")
+        seen.append(stage["name"])
+
+
+def _dependencies(stage):
+    return ([stage["input"]] if stage.get("input") else []) + stage.get("after", [])
+
+
+@functools.lru_cache(maxsize=None)
+def list_pipelines():
+    """Return the names of all pipelines in PIPELINE_DIR."""
+
+    if not os.path.isdir(PIPELINE_DIR):
+        return ()
+    return tuple(sorted(os.path.splitext(file_name)[0] for file_name in os.listdir(PIPELINE_DIR) if file_name.endswith(".yaml")))
+
+
+def pipelines_starting_with(app_name):
+    """Return the pipelines whose first stage runs the given app (offered on that app's page)."""
+    return [load_pipeline(name) for name in list_pipelines() if load_pipeline(name)["stages"][0]["app"] == app_name]
+
+
+def find_output_dataset(name, project_id, since, environment):
+    """
+    Return the output dataset of a Sushi job once it appeared in B-Fabric, or None.
+
+    Sushi registers the output dataset of a job under its --next_dataset_name in the project
+    the job ran under; of the datasets with that name, the newest created after the job was
+    submitted is taken.
+
+    Args:
+        name (str): The name given to the output dataset
+        project_id (str): The project the job ran under
+        since (float): UNIX timestamp the job was submitted at
+        environment (str): The B-Fabric environment ("TEST" or "PRODUCTION")
+
+    Returns:
+        dict or None: The B-Fabric API response of the dataset
+    """
+
+    B = power_user_wrapper(environment)
+    created_after = datetime.fromtimestamp(since - PIPELINE_CLOCK_SKEW).strftime("%Y-%m-%dT%H:%M:%S")
+    datasets = B.read("dataset", {"name": name, "containerid": project_id, "createdafter": created_after})
+
+    datasets = [dataset for dataset in datasets if dataset.get("name") == name]
+    return max(datasets, key=lambda dataset: int(dataset["id"])) if datasets else None
+
+
+def output_status(name, project_id, since, environment, find_output=find_output_dataset):
+    """
+    Return the status of a Sushi job's output in B-Fabric and its output dataset.
+
+    Sushi registers the output dataset when it starts a job; the job is only complete once the
+    workunit of that dataset is available (a dataset without workunit counts as available).
+
+    Returns:
+        tuple: ("pending", "available" or "failed", the dataset API response or None)
+    """
+
+    dataset = find_output(name, project_id, since, environment)
+    if dataset is None:
+        return "pending", None
+
+    workunit_id = (dataset.get("workunit") or {}).get("id")
+    if workunit_id is None:
+        return "available", dataset
+
+    workunits = power_user_wrapper(environment).read("workunit", {"id": workunit_id})
+    status = str(workunits[0].get("status", "")).lower() if workunits else ""
+    if status in ("available", "failed"):
+        return status, dataset
+    return "pending", dataset
+
+
+def check_run_status(run, ledger=None, timeout=PIPELINE_STAGE_TIMEOUT, status=output_status):
+    """
+    Check a pending ledger run in B-Fabric and record its new status.
+
+    A run whose output is not available after timeout seconds (or that cannot be looked up, having
+    no project recorded) counts as failed.
+
+    Returns:
+        str: The status of the run ("pending", "available" or "failed")
+    """
+
+    from sushi_utils.ledger import LEDGER
+
+    ledger = ledger or LEDGER
+    if run.get("project_id") and run.get("environment"):
+        try:
+            current, _ = status(run["name"], run["project_id"], run["created"], run["environment"])
+        except Exception as e:
+            print(f'[SUSHI LEDGER]: checking the output of {run["name"]} failed: {e}')
+            current = "pending"
+    else:
+        current = "pending"
+
+    if current == "pending" and time.time() - run["created"] > timeout:
+        current = "failed"
+    if current != "pending":
+        ledger.set_status(run["run_path"], current)
+        print(f'[SUSHI LEDGER]: run {run["name"]} is {current}')
+    return current
+
+
+def _observe_turnaround(name, seconds):
+    """Feed the turnaround of a stage to the run history (precise to the poll interval)."""
+
+    try:
+        HISTORY.observe(name, turnaround=seconds)
+    except Exception as e:
+        print(f"[SUSHI HISTORY]: recording the turnaround of {name} failed: {e}")
+
+
+def check_stage_values(pipeline, stage_values):
+    """
+    Check the values entered for the fields the stages of a pipeline ask for (see "ask" in the pipeline YAML).
+
+    Blank fields are reported, as are the violated rules of a stage's app that only involve asked
+    fields (e.g. sampleGroup differing from refGroup); the other rules are checked when the stage is submitted.
+
+    Returns:
+        list: "stage: problem" for every blank field and violated rule
+    """
+
+    from sushi_utils.spec_engine import check_rules, load_spec
+
+    stage_values = stage_values or {}
+    problems = []
+    for stage in pipeline["stages"]:
+        asked, values = stage.get("ask", []), stage_values.get(stage["name"], {})
+        problems += [f'{stage["name"]}: no value for {key}' for key in asked if values.get(key) in (None, "")]
+        rules = [rule for rule in load_spec(stage["app"]).get("rules", []) if asked and all(key in asked for key in rule["fields"])]
+        problems += [f'{stage["name"]}: {warning}' for warning in check_rules(rules, values)]
+    return problems
+
+
+######################################################################################################
+####################### State ########################################################################
+######################################################################################################
+
+def _state_path(submission_id, directory=PIPELINE_STATE_DIR):
+    return os.path.join(directory, f"{submission_id}.json")
+
+
+@contextlib.contextmanager
+def _locked(submission_id, directory=PIPELINE_STATE_DIR):
+    """Hold the lock of a pipeline's state, so only one check advances it at a time (across processes)."""
+
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f"{submission_id}.lock"), "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def load_pipeline_state(submission_id, directory=PIPELINE_STATE_DIR):
+    """Return the state of a pipeline submission, or None if the submission is no pipeline (or expired)."""
+
+    try:
+        with open(_state_path(submission_id, directory), encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_state(state, directory=PIPELINE_STATE_DIR):
+    path = _state_path(state["id"], directory)
+    temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+    # The state holds the session token, so it is only readable by the server's user
+    descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+        json.dump(state, handle, default=str)
+    os.replace(temporary, path)
+
+
+def _prune_states(directory=PIPELINE_STATE_DIR):
+    for file_name in os.listdir(directory):
+        path = os.path.join(directory, file_name)
+        try:
+            if time.time() - os.path.getmtime(path) > PIPELINE_STATE_RETENTION:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def pipeline_status(submission_id, directory=PIPELINE_STATE_DIR):
+    """
+    Return the status of a pipeline submission in the format of submission.submission_status(), or None if it is no pipeline.
+
+    A pipeline is "started" until none of its stages waits or runs any more, and then "finished"
+    if at least one stage is done, "failed" otherwise; its report is returned either way.
+    """
+
+    state = load_pipeline_state(submission_id, directory)
+    if state is None:
+        return None
+
+    report = state["report"]
+    return {
+        "id": submission_id,
+        "app": state["app"],
+        "status": "started" if report is None else "finished" if report["done"] else "failed",
+        "stage": state["progress"],
+        "error": None,
+        "report": report
+    }
+
+
+def overdue_pipelines(grace=PIPELINE_POLL_INTERVAL, directory=PIPELINE_STATE_DIR):
+    """Return the IDs of the unfinished pipelines whose next check is more than grace seconds overdue (lost with a restart)."""
+
+    if not os.path.isdir(directory):
+        return []
+
+    overdue = []
+    for file_name in os.listdir(directory):
+        if file_name.endswith(".json"):
+            state = load_pipeline_state(file_name[:-len(".json")], directory)
+            if state and state["report"] is None and time.time() - state["next_check"] > grace:
+                overdue.append(state["id"])
+    return overdue
+
+
+def renew_check(submission_id, directory=PIPELINE_STATE_DIR):
+    """
+    Give an unfinished pipeline a new check token, so that a check scheduled earlier (if still pending) does nothing.
+
+    Returns:
+        str or None: The token to schedule the next check with, None if the pipeline is unknown or finished
+    """
+
+    with _locked(submission_id, directory):
+        state = load_pipeline_state(submission_id, directory)
+        if state is None or state["report"] is not None:
+            return None
+        state["check"] = uuid.uuid4().hex
+        state["next_check"] = time.time()
+        _save_state(state, directory)
+        return state["check"]
+
+
+######################################################################################################
+####################### Execution ####################################################################
+######################################################################################################
+
+def start_pipeline(submission_id, pipeline, values, token_data, entity_data, app_data, url, charge_run, stage_values=None, reuse=False,
+                   journal=None, directory=PIPELINE_STATE_DIR, **options):
+    """
+    Record the state of a pipeline and submit its first stage.
+
+    Nothing waits for the stages: the caller schedules advance_pipeline() with the returned state's
+    "check" token every PIPELINE_POLL_INTERVAL seconds until the state has a report.
+
+    Args:
+        submission_id (str): The ID of the submission, under which the state is kept
+        pipeline (dict): The pipeline, as returned by load_pipeline()
+        values (dict): Field values of the first stage by key
+        token_data (dict): Token metadata of the session
+        entity_data (dict): The (slim) entity data of the dataset the pipeline starts from
+        app_data (dict): Application metadata
+        url (str): The URL search string holding the B-Fabric token
+        charge_run (bool): Whether the project should be charged
+        stage_values (dict, optional): Field values by key of the stages, by stage name (at least those the stages ask for)
+        reuse (bool): Reuse identical earlier runs of a stage instead of submitting it again
+        journal (callable, optional): Called with every state transition of every stage's job (see spec_engine.submit_staged)
+        **options: Passed on to advance_pipeline()
+
+    Returns:
+        dict: The state of the pipeline after the first check (see advance_pipeline)
+
+    Raises:
+        ValueError: If a field the stages ask for was left blank or breaks a rule (see check_stage_values)
+    """
+
+    problems = check_stage_values(pipeline, stage_values)
+    if problems:
+        raise ValueError(f'Pipeline {pipeline["name"]}: {"; ".join(problems)}')
+
+    state = {
+        "id": submission_id,
+        "pipeline": pipeline["name"],
+        "app": pipeline["stages"][0]["app"],
+        "values": values,
+        "stage_values": stage_values or {},
+        "token_data": {"environment": token_data.get("environment")},  # All the stages need, no credentials
+        "entity_data": entity_data,
+        "app_data": app_data,
+        "url": url,
+        "charge_run": charge_run,
+        "reuse": reuse,
+        "environment": token_data.get("environment", "TEST").upper(),
+        "started": time.time(),
+        "check": uuid.uuid4().hex,
+        "next_check": time.time(),
+        "progress": "Starting the pipeline",
+        "jobs": {
+            stage["name"]: {
+                "stage": stage["name"], "app": stage["app"], "name": None, "status": "waiting", "error": None,
+                "dataset_id": None, "reused_run": None, "run_path": None
+            }
+            for stage in pipeline["stages"]
+        },
+        "submitted_values": {},  # stage -> field values it was submitted with
+        "running": {},           # stage -> [project ID, submission timestamp of the run, time the wait started]
+        "report": None
+    }
+
+    with _locked(submission_id, directory):
+        _save_state(state, directory)
+    _prune_states(directory)
+
+    return advance_pipeline(submission_id, state["check"], journal=journal, directory=directory, **options)
+
+
+def advance_pipeline(submission_id, check, journal=None, stage_timeout=PIPELINE_STAGE_TIMEOUT, status=output_status,
+                     directory=PIPELINE_STATE_DIR):
+    """
+    Check the running stages of a pipeline once and submit every stage whose dependencies are all done.
+
+    A stage is done once B-Fabric shows its output available, and failed if its workunit failed
+    or its output is not available after stage_timeout seconds; the stages depending on a failed
+    stage are skipped, all others carry on. Stages that became ready together (e.g. DESeq2 and
+    EdgeR) are submitted concurrently, each with its values checked against the rules of its app
+    first: a stage breaking them is not submitted and counts as failed.
+
+    Args:
+        submission_id (str): The ID of the pipeline submission
+        check (str): The token of the check; a check whose token is no longer the state's does nothing
+        journal (callable, optional): Called with every state transition of every stage's job (see spec_engine.submit_staged)
+        stage_timeout (float): Seconds after which a stage without available output counts as failed
+        status (callable): Looks up the status of a stage's output (see output_status)
+
+    Returns:
+        dict or None: The new state, with a new "check" token while stages wait or run and with the
+        aggregated report {"summary", "done", "failed", "skipped", "jobs"} once none does; None if
+        the check was stale (the pipeline finished or was given a new check meanwhile)
+    """
+
+    from sushi_utils.ledger import LEDGER
+    from sushi_utils.spec_engine import check_rules, default_values, load_spec, stage_job, submit_staged
+
+    with _locked(submission_id, directory):
+        state = load_pipeline_state(submission_id, directory)
+        if state is None or state["report"] is not None or state["check"] != check:
+            return None
+
+        pipeline = load_pipeline(state["pipeline"])
+        stages = {stage["name"]: stage for stage in pipeline["stages"]}
+        jobs, running, environment = state["jobs"], state["running"], state["environment"]
+
+        def report_progress(stage):
+            state["progress"] = stage
+            print(f"[SUSHI PIPELINE {submission_id}]: {stage}")
+
+        def record_status(name, current):
+            if jobs[name]["run_path"]:
+                try:
+                    LEDGER.set_status(jobs[name]["run_path"], current)
+                except Exception as e:
+                    print(f"[SUSHI LEDGER]: recording the status of {name} failed: {e}")
+
+        def submit(name):
+            stage, job = stages[name], jobs[name]
+            spec = load_spec(stage["app"])
+
+            try:
+                if stage.get("input"):
+                    B = power_user_wrapper(environment)
+                    dataset = B.read("dataset", {"id": jobs[stage["input"]]["dataset_id"]})[0]
+                    entity = {"name": dataset.get("name", ""), "full_api_response": dataset}
+                    stage_values = default_values(spec, entity)
+                    upstream = state["submitted_values"][stage["input"]]
+                    stage_values.update({key: upstream[key] for key in pipeline.get("inherit", []) if key in upstream and key in stage_values})
+                else:
+                    entity, stage_values = state["entity_data"], dict(state["values"])
+                stage_values.update(stage.get("values", {}))
+                stage_values.update(state["stage_values"].get(name, {}))
+            except Exception as e:
+                job.update(status="failed", error=f"Reading the input failed: {e}")
+                return
+
+            warnings = check_rules(spec.get("rules", []), stage_values)
+            if warnings:
+                job.update(name=stage_values["name"], status="failed", error=f'Not submitted: {" ".join(warnings)}')
+                return
+
+            try:
+                bash_command, project_id, run = stage_job(spec, stage_values, state["token_data"], entity, state["app_data"])
+                submitted = time.time()
+                prior = submit_staged(spec, stage_values, bash_command, project_id, run, state["url"], state["charge_run"], state["reuse"], journal=journal)
+            except Exception as e:
+                job.update(name=stage_values["name"], status="failed", error=f"Submission failed: {e}")
+                return
+
+            # A reused run's output was registered back when that run was submitted
+            job.update(
+                name=prior["name"] if prior else stage_values["name"], status="running",
+                reused_run=prior["run_path"] if prior else None, run_path=prior["run_path"] if prior else run.path
+            )
+            state["submitted_values"][name] = stage_values
+            running[name] = [project_id, prior["created"] if prior else submitted, submitted]
+
+        for name, (project_id, since, waiting_since) in list(running.items()):
+            try:
+                current, dataset = status(jobs[name]["name"], project_id, since, environment)
+            except Exception as e:
+                print(f'[SUSHI PIPELINE]: looking up the output of {name} failed: {e}')
+                current, dataset = "pending", None
+
+            if current == "available":
+                jobs[name].update(status="done", dataset_id=dataset.get("id"))
+                if not jobs[name]["reused_run"]:
+                    _observe_turnaround(jobs[name]["name"], time.time() - since)
+                report_progress(f'{name} done: dataset {dataset.get("id")}')
+            elif current == "failed":
+                jobs[name].update(status="failed", error=f'The workunit of {jobs[name]["name"]} failed', dataset_id=dataset.get("id"))
+            elif time.time() - waiting_since > stage_timeout:
+                current = "failed"
+                jobs[name].update(status="failed", error=f"No available output dataset {jobs[name]['name']} after {format_duration(stage_timeout)}")
+            else:
+                continue
+
+            record_status(name, current)
+            del running[name]
+
+        while True:
+            for name, stage in stages.items():
+                failed = [dependency for dependency in _dependencies(stage) if jobs[dependency]["status"] in ("failed", "skipped")]
+                if jobs[name]["status"] == "waiting" and failed:
+                    jobs[name].update(status="skipped", error=f"Skipped, as {', '.join(failed)} did not complete")
+
+            ready = [
+                name for name, stage in stages.items()
+                if jobs[name]["status"] == "waiting" and all(jobs[dependency]["status"] == "done" for dependency in _dependencies(stage))
+            ]
+            if not ready:
+                break
+
+            report_progress("Submitting " + ", ".join(f"{name} ({stages[name]['app']})" for name in ready))
+            with ThreadPoolExecutor(max_workers=len(ready)) as pool:
+                list(pool.map(submit, ready))
+
+        if running:
+            state["check"] = uuid.uuid4().hex
+            state["next_check"] = time.time() + PIPELINE_POLL_INTERVAL
+            report_progress(
+                f'Waiting for the output of {", ".join(jobs[name]["name"] for name in running)} '
+                f'({format_duration(time.time() - state["started"])} elapsed)'
+            )
+        else:
+            report = {
+                "done": sum(job["status"] == "done" for job in jobs.values()),
+                "failed": sum(job["status"] == "failed" for job in jobs.values()),
+                "skipped": sum(job["status"] == "skipped" for job in jobs.values()),
+                "jobs": list(jobs.values())
+            }
+            reused = sum(job["reused_run"] is not None for job in jobs.values())
+            report["summary"] = (
+                f'Pipeline {pipeline["name"]}: {report["done"]} of {len(jobs)} stages done ({reused} reused), '
+                f'{report["failed"]} failed, {report["skipped"]} skipped in {format_duration(time.time() - state["started"])}'
+            )
+            state["report"] = report
+            report_progress(report["summary"])
+            for job in report["jobs"]:
+                if job["error"]:
+                    print(f'[SUSHI PIPELINE]: {job["stage"]}: {job["error"]}')
+
+        _save_state(state, directory)
+        return state
@@ -0,0 +1,62 @@
+function (nIntervals, submissions) {
+    // Polls the status endpoint (/sushi/submissions/<id>, see spec_engine.py) of the submission of
+    // the displayed app, so following a running submission costs no Dash callback requests.
+    var ctx = window.dash_clientside.callback_context;
+    var noUpdate = window.dash_clientside.no_update;
+
+    function poll(state) {
+        if (!state.value || !state.value.url) {
+            return Promise.resolve(null);
+        }
+        return fetch(state.value.url, {cache: "no-store", credentials: "same-origin"})
+            .then(function (response) {
+                if (response.status === 404) {
+                    return {status: "failed", stage: null, error: "Unknown submission"};
+                }
+                return response.ok ? response.json() : null;
+            })
+            .catch(function () {
+                return null;  // Unreachable for a moment: keep polling
+            });
+    }
+
+    return Promise.all(ctx.states_list[0].map(poll)).then(function (statuses) {
+        var byApp = {};
+        ctx.states_list[0].forEach(function (state, index) {
+            byApp[state.id.app] = {submission: state.value, status: statuses[index]};
+        });
+
+        function each(outputs, value) {
+            return outputs.map(function (output) {
+                var entry = byApp[output.id.app];
+                return entry && entry.status ? value(entry.status, entry.submission) : noUpdate;
+            });
+        }
+
+        function done(status) {
+            return status.status === "finished" || status.status === "failed";
+        }
+
+        return [
+            each(ctx.outputs_list[0], function (status) { return status.status === "finished"; }),
+            each(ctx.outputs_list[1], function (status) { return status.status === "failed"; }),
+            each(ctx.outputs_list[2], function (status, submission) {
+                var text = "Submission " + submission.id.slice(0, 8) + ": " + (status.stage || status.status);
+                if (status.report) {
+                    // Aggregated report of a batch or sharded job, listing the jobs that could not be submitted
+                    text = status.report.summary;
+                    status.report.jobs.forEach(function (job) {
+                        if (job.error) {
+                            text += "; " + (job.dataset_id ? "dataset " + job.dataset_id : job.name) + ": " + job.error;
+                        }
+                    });
+                }
+                return status.error ? text + " (" + status.error + ")" : text;
+            }),
+            each(ctx.outputs_list[3], function (status) {
+                return !done(status) || status.status === "failed" || Boolean(status.report);
+            }),
+            each(ctx.outputs_list[4], done)
+        ];
+    });
+}
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import threading
+import time
+import dash_bootstrap_components as dbc
+from dash import html
+
+QUEUE_POLL_INTERVAL = 5       # Seconds between two snapshots of the rq queues (per server process, whatever the number of clients)
+QUEUE_MAX_JOBS = 20           # Most recent jobs listed per queue and registry (running, failed, completed)
+
+
+def snapshot_queues(connection, max_jobs=QUEUE_MAX_JOBS):
+    """
+    Read the state of every rq queue.
+
+    Returns:
+        list: One {"name", "queued", "running", "failed", "completed", "jobs"} entry per queue, where
+        jobs lists the running, failed and completed jobs ({"id", "func_name", "status", "ended_at"}),
+        at most max_jobs of each, the most recent first
+    """
+
+    from rq import Queue
+    from rq.job import Job
+    from rq.registry import FailedJobRegistry, FinishedJobRegistry, StartedJobRegistry
+
+    queues = []
+    for queue in sorted(Queue.all(connection=connection), key=lambda queue: queue.name):
+        registries = {
+            "running": StartedJobRegistry(queue.name, connection=connection),
+            "failed": FailedJobRegistry(queue.name, connection=connection),
+            "completed": FinishedJobRegistry(queue.name, connection=connection)
+        }
+        entry = {"name": queue.name, "queued": queue.count, **{status: registry.count for status, registry in registries.items()}, "jobs": []}
+
+        for status, registry in registries.items():
+            job_ids = registry.get_job_ids(-max_jobs, -1)[::-1]
+            for job in Job.fetch_many(job_ids, connection=connection):
+                if job is not None:
+                    entry["jobs"].append({
+                        "id": job.id,
+                        "func_name": job.func_name,
+                        "status": status,
+                        "ended_at": job.ended_at.strftime("%Y-%m-%d %H:%M:%S") if job.ended_at else None
+                    })
+        queues.append(entry)
+    return queues
+
+
+class QueueStatusPoller:
+    """
+    Background thread snapshotting the rq queues every QUEUE_POLL_INTERVAL seconds, once per server process.
+
+    Callbacks render the latest snapshot instead of querying Redis for every open page, so the
+    Redis load no longer grows with the number of clients. Each snapshot whose content differs from
+    the previous one gets the next version and the time of the change. The thread starts with the
+    first snapshot() call, so it never runs while the queue tab is disabled.
+    """
+
+    def __init__(self, interval=QUEUE_POLL_INTERVAL, read=None):
+        self.interval = interval
+        self._read = read
+        self._snapshot = {"version": 0, "time": None, "queues": [], "error": None}
+        self._digest = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _connection_reader(self):
+        from bfabric_web_apps.utils.redis_connection import redis_conn
+        return lambda: snapshot_queues(redis_conn)
+
+    def start(self):
+        """Start the polling thread unless it runs already."""
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sushi-queue-status", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        try:
+            read = self._read or self._connection_reader()
+        except Exception as e:
+            read = None
+            print("[SUSHI QUEUE]: Redis not available:", str(e))
+
+        while True:
+            try:
+                queues, error = (read(), None) if read else ([], "Redis not available")
+            except Exception as e:
+                queues, error = [], str(e)
+            self.update(queues, error)
+            time.sleep(self.interval)
+
+    def update(self, queues, error=None):
+        """Store a snapshot, advancing the version if it changed."""
+
+        digest = hashlib.sha256(json.dumps([queues, error], sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        with self._lock:
+            if digest == self._digest:
+                return
+            self._digest = digest
+            self._snapshot = {"version": self._snapshot["version"] + 1, "time": time.time(), "queues": queues, "error": error}
+
+    def snapshot(self):
+        """Return the latest snapshot {"version", "time" (of the change), "queues", "error"} (see snapshot_queues), starting the thread if needed."""
+
+        self.start()
+        with self._lock:
+            return self._snapshot
+
+
+def queue_layout(snapshot):
+    """Render a snapshot as the queue tab of bfabric_web_apps does (get_redis_queue_layout), one card per queue."""
+
+    if snapshot["error"]:
+        return dbc.Container(html.P(f"Queue status unavailable: {snapshot['error']}", className="text-muted"), className="mt-4")
+    if snapshot["time"] is None:
+        return dbc.Container(html.P("Reading the queues...", className="text-muted"), className="mt-4")
+
+    styles = {
+        "running": ("Running", "text-success", "#d4edda"),
+        "failed": ("Failed", "text-danger", "#f8d7da"),
+        "completed": ("Completed", "text-primary", "#d1ecf1")
+    }
+
+    queue_cards = []
+    for queue in snapshot["queues"]:
+        stats_row = dbc.Row([
+            dbc.Col([
+                html.P([html.B("Jobs in queue: "), f"{queue['queued']}"]),
+                html.P([html.B("Running: "), f"{queue['running']}"]),
+            ], width=6),
+            dbc.Col([
+                html.P([html.B("Failed: "), f"{queue['failed']}"]),
+                html.P([html.B("Completed: "), f"{queue['completed']}"]),
+            ], width=6)
+        ])
+
+        job_cards = []
+        for job in queue["jobs"]:
+            label, class_name, color = styles[job["status"]]
+            body = [
+                html.H6(f"Job ID: {job['id']}", className="card-title"),
+                html.P(f"Function: {job['func_name']}", className="card-text"),
+                html.P(f"Status: {label}", className=class_name),
+            ]
+            if job["status"] == "completed":
+                body.append(html.P(f"Finished at: {job['ended_at'] or 'Unknown'}", className="text-muted"))
+            job_cards.append(dbc.Card(dbc.CardBody(body), style={"maxWidth": "36vw", "backgroundColor": color}, className="mb-2"))
+
+        queue_cards.append(dbc.Col([
+            dbc.Card(
+                [
+                    dbc.CardHeader(html.H5(f"Queue: {queue['name']}")),
+                    dbc.CardBody([stats_row, html.Hr(), *job_cards], style={"maxHeight": "58vh", "overflow-y": "scroll"})
+                ],
+                style={"maxWidth": "36vw", "backgroundColor": "#f8f9fa", "max-height": "60vh"}, className="mb-4"
+            )
+        ]))
+
+    changed = time.strftime("%H:%M:%S", time.localtime(snapshot["time"]))
+    return dbc.Container([html.P(f"Last change {changed}", className="text-muted"), dbc.Row(queue_cards)], className="mt-4")
+
+
+QUEUE_STATUS = QueueStatusPoller()
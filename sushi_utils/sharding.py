@@ -0,0 +1,105 @@
+import heapq
+import os
+import re
+import bfabric_web_apps
+from sushi_utils.dataset_utils import _dataset_rows
+from sushi_utils.delta import sample_index
+
+MAX_SHARDS = 32  # Upper bound for the number of shards a dataset is split into
+
+# Dataset columns weighting a sample, in order of preference
+READ_COUNT_COLUMN = re.compile(r"read\s*count|^reads$", re.IGNORECASE)
+FILE_COLUMN = re.compile(r"\[File\]$")
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _file_size(path, root):
+    try:
+        return os.path.getsize(os.path.join(root, path))
+    except (TypeError, OSError):
+        return None
+
+
+def sample_weights(dataset, gstore_root=None):
+    """
+    Estimate the relative cost of every sample of a dataset.
+
+    Samples are weighted by a read count column if the dataset has one, otherwise by the
+    total size of their files (where gstore is readable from this host), otherwise equally.
+
+    Args:
+        dataset (dict): B-Fabric API Dataset Response
+        gstore_root (str, optional): Local root of the [File] column paths (GSTORE_REMOTE_PATH by default)
+
+    Returns:
+        tuple: ({sample name: weight}, the basis of the weights: "read count", "file size" or "samples")
+    """
+
+    if not dataset or not dataset.get("attribute"):
+        return {}, "samples"
+
+    names = [elt.get("name") for elt in dataset.get("attribute", [])]
+    index = sample_index(dataset)
+    rows = {str(row[index]): row for row in _dataset_rows(dataset)}
+
+    for column, name in enumerate(names):
+        if READ_COUNT_COLUMN.search(name or ""):
+            weights = {sample: _number(row[column]) for sample, row in rows.items()}
+            if all(weight is not None for weight in weights.values()):
+                return weights, "read count"
+
+    file_columns = [column for column, name in enumerate(names) if FILE_COLUMN.search(name or "")]
+    if file_columns:
+        root = gstore_root or bfabric_web_apps.GSTORE_REMOTE_PATH
+        weights = {sample: [_file_size(row[column], root) for column in file_columns] for sample, row in rows.items()}
+        if all(None not in sizes for sizes in weights.values()):
+            return {sample: float(sum(sizes)) for sample, sizes in weights.items()}, "file size"
+
+    return {sample: 1.0 for sample in rows}, "samples"
+
+
+def partition(weights, shards):
+    """
+    Split samples into balanced shards (longest processing time first).
+
+    Samples are assigned heaviest first, each to the currently lightest shard, which keeps
+    the heaviest shard (and thereby the wall-clock time of the sharded job) within 4/3 of
+    the optimum.
+
+    Args:
+        weights (dict): Sample name -> weight
+        shards (int): The number of shards wanted (fewer are returned for small datasets)
+
+    Returns:
+        list: One {"samples": [...], "weight": float} entry per non-empty shard
+    """
+
+    shards = max(1, min(shards, MAX_SHARDS, len(weights)))
+    result = [{"samples": [], "weight": 0.0} for _ in range(shards)]
+    heap = [(0.0, i) for i in range(shards)]
+
+    for sample, weight in sorted(weights.items(), key=lambda item: -item[1]):
+        load, i = heapq.heappop(heap)
+        result[i]["samples"].append(sample)
+        result[i]["weight"] = load + weight
+        heapq.heappush(heap, (load + weight, i))
+
+    return [shard for shard in result if shard["samples"]]
+
+
+def estimated_speedup(shards):
+    """
+    Return the estimated speedup of the shards over a single job with all samples.
+
+    The runtime of a job is assumed to be proportional to the weight of its samples,
+    so a single job takes the total weight and the sharded job its heaviest shard.
+    """
+
+    heaviest = max((shard["weight"] for shard in shards), default=0)
+    return sum(shard["weight"] for shard in shards) / heaviest if heaviest else 1.0
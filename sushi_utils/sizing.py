@@ -0,0 +1,125 @@
+import math
+from sushi_utils.ledger import PROCESS_MODE_PARAMETERS
+from sushi_utils.sharding import sample_weights
+
+BYTES_PER_READ = 75        # Compressed FASTQ bytes of one read, converting read counts into input size
+DEFAULT_REFERENCE_GB = 3.1  # Genome size assumed for unknown reference builds (human, to be on the safe side)
+
+# Genome size (GB) by the species part of refBuild (e.g. Homo_sapiens/GENCODE/GRCh38.p13)
+REFERENCE_GB = {
+    "Homo_sapiens": 3.1,
+    "Mus_musculus": 2.7,
+    "Rattus_norvegicus": 2.9,
+    "Sus_scrofa": 2.5,
+    "Bos_taurus": 2.7,
+    "Danio_rerio": 1.4,
+    "Gallus_gallus": 1.1,
+    "Drosophila_melanogaster": 0.14,
+    "Caenorhabditis_elegans": 0.1,
+    "Arabidopsis_thaliana": 0.135,
+    "Saccharomyces_cerevisiae": 0.012,
+    "Escherichia_coli": 0.005
+}
+
+# Terms of a resource model in the "sizing" section of a spec:
+#   value = base + per_gb * input GB + per_sample * samples + reference * genome GB, clamped to [min, max]
+# The input of a job is the heaviest sample in SAMPLE process mode (one cluster job per sample)
+# and the whole dataset otherwise. Selects are rounded up to the next option, inputs to an integer.
+SIZING_TERMS = ("base", "per_gb", "per_sample", "reference", "min", "max")
+
+
+def reference_gb(ref_build):
+    """Return the genome size of a reference build (DEFAULT_REFERENCE_GB if the species is unknown)."""
+    return REFERENCE_GB.get(str(ref_build or "").split("/")[0], DEFAULT_REFERENCE_GB)
+
+
+def job_input(dataset, per_sample, samples=None, weights=None):
+    """
+    Return the size of the input of one job.
+
+    Args:
+        dataset (dict): B-Fabric API Dataset Response
+        per_sample (bool): Size the job of the heaviest sample rather than of the whole dataset
+        samples (set, optional): Only count these samples (of a delta run or shard)
+        weights (tuple, optional): The sample_weights() of the dataset, if the caller has them already
+
+    Returns:
+        dict: {"input_gb": float or None (if neither read counts nor file sizes are known), "samples": int}
+    """
+
+    weights, basis = weights or sample_weights(dataset)
+    if samples is not None:
+        weights = {sample: weight for sample, weight in weights.items() if sample in samples}
+    if not weights:
+        return {"input_gb": None, "samples": 0}
+
+    sizes = [weight * (BYTES_PER_READ if basis == "read count" else 1) / 1e9 for weight in weights.values()]
+    input_gb = None if basis == "samples" else max(sizes) if per_sample else sum(sizes)
+    return {"input_gb": input_gb, "samples": 1 if per_sample else len(sizes)}
+
+
+def job_features(dataset, values, samples=None, weights=None):
+    """
+    Return the features a job is sized and its duration predicted by.
+
+    Computing them walks the whole dataset, so callers needing them more than once pass them on.
+
+    Args:
+        dataset (dict): B-Fabric API Dataset Response
+        values (dict): Field values or parameters of the job (for the process mode and refBuild)
+        samples (set, optional): Only count these samples (of a delta run or shard)
+        weights (tuple, optional): The sample_weights() of the dataset, if the caller has them already
+
+    Returns:
+        dict: {"input_gb", "samples", "reference_gb"}
+    """
+
+    per_sample = any(values.get(key) == "SAMPLE" for key in PROCESS_MODE_PARAMETERS)
+    return {**job_input(dataset, per_sample, samples, weights), "reference_gb": reference_gb(values.get("refBuild"))}
+
+
+def model_value(model, input_gb, samples, genome_gb):
+    """Evaluate a resource model (see SIZING_TERMS)."""
+
+    value = (
+        model.get("base", 0) + model.get("per_gb", 0) * (input_gb or 0)
+        + model.get("per_sample", 0) * samples + model.get("reference", 0) * genome_gb
+    )
+    return min(max(value, model.get("min", 1)), model.get("max", value))
+
+
+def snap(value, field):
+    """Round a recommended value up to the next option of a select (the largest if none suffices), or to an integer."""
+
+    options = sorted(option for option in field.get("options", []) if isinstance(option, (int, float)) and not isinstance(option, bool))
+    if options:
+        return next((option for option in options if option >= value), options[-1])
+    return int(math.ceil(value))
+
+
+def recommend_resources(spec, dataset, values, features=None):
+    """
+    Recommend the cluster resources of a job from its input.
+
+    Args:
+        spec (dict): The app spec, whose "sizing" section maps resource fields to their models
+        dataset (dict): B-Fabric API Dataset Response of the job's input
+        values (dict): Field values by key (for the process mode and refBuild)
+        features (dict, optional): The job_features() of the job, if the caller has them already
+
+    Returns:
+        dict: Recommended value by field key; empty if the spec has no sizing or the entity is no dataset
+    """
+
+    if not spec.get("sizing") or not dataset or not dataset.get("attribute"):
+        return {}
+
+    job = features or job_features(dataset, values)
+    fields = {field["key"]: field for field in spec["fields"] if "key" in field}
+
+    return {
+        key: snap(model_value(model, job["input_gb"], job["samples"], job["reference_gb"]), fields[key])
+        for key, model in spec["sizing"].items()
+        # Models depending on the input size need read counts or file sizes
+        if job["input_gb"] is not None or not model.get("per_gb")
+    }
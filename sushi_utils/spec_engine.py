@@ -0,0 +1,1380 @@
+import functools
+import json
+import os
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import yaml
+import dash_bootstrap_components as dbc
+import dash_daq as daq
+import bfabric_web_apps
+from dash import html, dcc, ctx, no_update, ALL
+from flask import jsonify
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
+from bfabric_web_apps import (
+    run_main_job,
+    bfabric_interface
+)
+from bfabric_web_apps.utils.components import charge_switch
+from generic.callbacks import app
+from sushi_utils.bfabric_cache import cached_read
+from sushi_utils.bfabric_pool import pooled_wrapper
+from sushi_utils.component_utils import submitbutton_id
+from sushi_utils.dataset_utils import dataset_to_tsv
+from sushi_utils.dataset_cache import get_full_api_response
+from sushi_utils.history import HISTORY, format_duration
+from sushi_utils.delta import dataset_row_hashes, merge_manifest, plan_delta, row_hash, sample_index, snapshot_rows
+from sushi_utils.ledger import LEDGER, PROCESS_MODE_PARAMETERS, job_key, parameters_key
+from sushi_utils.parameters import write_parameters
+from sushi_utils.pipeline import check_run_status, check_stage_values, load_pipeline, pipelines_starting_with
+from sushi_utils.sharding import MAX_SHARDS, estimated_speedup, partition, sample_weights
+from sushi_utils.sizing import SIZING_TERMS, job_features, recommend_resources
+from sushi_utils.staging import StagedRun, commit_runs
+from sushi_utils.submission import IDEMPOTENCY_WINDOW, enqueue_submission, release_claim, submission_key, submission_status
+from sushi_utils.table_utils import dataset_summary, dataset_table
+
+# The C loader (libyaml) parses specs several times faster where available
+SpecLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+SPEC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sushi_layouts", "specs")
+
+DEFAULT_PROJECT_ID = "2220"  # Project charged / passed to Sushi when it cannot be derived from the entity's container
+
+BATCH_FETCH_CONCURRENCY = 8   # Datasets of a batch read from B-Fabric and staged at once
+BATCH_SUBMIT_CONCURRENCY = 4  # sushi_fabric invocations of a batch running at once
+
+SUSHI_COMMAND = """
+    bundle exec sushi_fabric --class {sushi_class} --dataset {dataset_path} --parameterset {param_path} --run \\
+    --input_dataset_application {app_id} --project {project_id} --dataset_name {dataset_name} \\
+    --mango_run_name {mango_run_name} --next_dataset_name {name}
+"""
+
+# Pattern-matching id types shared by the components of every spec-built app.
+# The "app" key of each id is the spec name, so one set of callbacks serves all apps.
+PARAM = "sushi-param"    # dbc.Input / dbc.Select, read through "value"
+SWITCH = "sushi-switch"  # daq.BooleanSwitch, read through "on"
+CHOICE = "sushi-choice"  # dcc.Dropdown filled from an option source, read through "value"
+ALERT = "sushi-alert"    # dbc.Alert with key "success", "fail", "warning" or "status"
+TABLE = "sushi-table"    # html.Div holding the dataset table
+RULES = "sushi-rules"    # dcc.Store holding the validation rules for the browser
+SUBMISSION = "sushi-submission"  # dcc.Store holding the ID and status URL of the last submission
+POLL = "sushi-poll"      # dcc.Interval polling the status of the last submission
+BATCH = "sushi-batch"    # dbc.Textarea listing the dataset IDs of a batch submission
+REUSE = "sushi-reuse"    # daq.BooleanSwitch: reuse an identical earlier run instead of submitting again
+DELTA = "sushi-delta"    # daq.BooleanSwitch: only submit the samples added or changed since the last run
+SHARDS = "sushi-shards"  # dbc.Input: number of parallel jobs a job of a shardable app is split into
+PIPELINE = "sushi-pipeline"  # dbc.Select: pipeline the job starts (only on the page of a pipeline's first app)
+PIPELINE_FORM = "sushi-pipeline-form"  # html.Div of the fields a pipeline's stages ask for, shown while the pipeline is selected
+STAGE_PARAM = "sushi-stage-param"  # dbc.Input / dbc.Select of a field a pipeline stage asks for, key "<pipeline>:<stage>:<field>"
+PREDICTION = "sushi-prediction"  # html.Div showing the duration predicted per partition from the run history
+
+SUBMISSION_POLL_INTERVAL = 2000  # Milliseconds between two status requests of a running submission
+
+
+def _read_script(file_name):
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name), encoding="utf-8") as handle:
+        return handle.read()
+
+
+# Clientside twin of check_rules(); validation runs in the browser on every keystroke
+CHECK_RULES_JS = _read_script("check_rules.js")
+
+# Clientside polling of the submission status endpoint
+POLL_SUBMISSION_JS = _read_script("poll_submission.js")
+
+COMPONENTS = ("input", "select", "switch", "dropdown")
+CHECKS = ("required", "minimum", "pattern", "forbidden", "differs")
+
+label_style = {
+    "font-size": "0.85rem",   # Smaller text
+    "margin-left": "6px",     # Indent the label a bit
+    "margin-bottom": "4px"
+}
+
+component_styles = {"margin-bottom": "18px", 'borderBottom': '1px solid lightgrey'}
+
+section_style = {"font-weight": "bold", "font-size": "1rem", "margin-bottom": "10px"}
+
+
+######################################################################################################
+####################### Specs ########################################################################
+######################################################################################################
+
+@functools.lru_cache(maxsize=None)
+def load_spec(name):
+    """
+    Load and validate the spec of a Sushi app from sushi_layouts/specs/<name>.yaml.
+
+    Args:
+        name (str): Name of the spec file (without extension)
+
+    Returns:
+        dict: The spec, with its name under "name"
+    """
+
+    with open(os.path.join(SPEC_DIR, f"{name}.yaml"), encoding="utf-8") as handle:
+        spec = yaml.load(handle, Loader=SpecLoader)
+
+    spec["name"] = name
+    validate_spec(spec)
+    return spec
+
+
+def validate_spec(spec):
+    """Raise a ValueError if a spec refers to unknown components, checks or fields."""
+
+    keys = [field["key"] for field in spec["fields"] if "key" in field]
+
+    if "name" not in keys or "sushi_class" not in spec:
+        raise ValueError(f"Spec {spec['name']}: a 'name' field and 'sushi_class' are required")
+
+    for field in spec["fields"]:
+        if field.get("component", "input") not in COMPONENTS and "section" not in field:
+            raise ValueError(f"Spec {spec['name']}: unknown component {field.get('component')}")
+        if field.get("component") == "dropdown" and field.get("options_from") not in OPTION_SOURCES:
+            raise ValueError(f"Spec {spec['name']}: unknown option source {field.get('options_from')}")
+
+    for key, model in spec.get("sizing", {}).items():
+        if key not in keys:
+            raise ValueError(f"Spec {spec['name']}: sizing refers to unknown field {key}")
+        unknown = [term for term in model if term not in SIZING_TERMS]
+        if unknown:
+            raise ValueError(f"Spec {spec['name']}: unknown sizing terms {unknown}")
+
+    for rule in spec.get("rules", []):
+        if rule["check"] not in CHECKS:
+            raise ValueError(f"Spec {spec['name']}: unknown check {rule['check']}")
+        unknown = [key for key in rule["fields"] if key not in keys]
+        if unknown:
+            raise ValueError(f"Spec {spec['name']}: rule refers to unknown fields {unknown}")
+
+    unknown = [key for key in spec.get("parameter_order", []) if key not in keys and key not in spec.get("constants", {})]
+    if unknown:
+        raise ValueError(f"Spec {spec['name']}: parameter_order refers to unknown parameters {unknown}")
+
+
+def spec_fields(spec):
+    """Return the parameter fields of a spec (without section headers)."""
+    return [field for field in spec["fields"] if "key" in field]
+
+
+def component_id(id_type, app_name, key):
+    return {"type": id_type, "app": app_name, "key": key}
+
+
+######################################################################################################
+####################### Layout #######################################################################
+######################################################################################################
+
+def _options(options):
+    return [option if isinstance(option, dict) else {"label": str(option), "value": option} for option in options]
+
+
+def _field_component(app_name, field):
+    component = field.get("component", "input")
+
+    if component == "switch":
+        return daq.BooleanSwitch(
+            id=component_id(SWITCH, app_name, field["key"]),
+            on=bool(field.get("default", False)),
+            label=field["label"],
+            labelPosition="top",
+            style={"margin-bottom": "18px"}
+        )
+
+    if component == "select":
+        control = dbc.Select(
+            id=component_id(PARAM, app_name, field["key"]),
+            options=_options(field.get("options", [])),
+            value=field.get("default"),
+            style=component_styles
+        )
+    elif component == "dropdown":
+        control = dcc.Dropdown(
+            id=component_id(CHOICE, app_name, field["key"]),
+            options=[],
+            value=field.get("default"),
+            multi=False,
+            placeholder=field.get("placeholder"),
+            style=component_styles
+        )
+    else:
+        control = dbc.Input(
+            id=component_id(PARAM, app_name, field["key"]),
+            value=field.get("default", ""),
+            type=field.get("type", "text"),
+            style=component_styles
+        )
+
+    children = [control]
+    if field.get("label"):
+        children.insert(0, dbc.Label(field["label"], style=label_style))
+    if field.get("tooltip"):
+        children.append(dbc.Tooltip(field["tooltip"], target=control.id, placement="right"))
+
+    return html.Div(children)
+
+
+def _stage_field_component(app_name, pipeline, stage, field):
+    """A field a pipeline stage asks for; it starts empty, so no stage is submitted with the spec's placeholder default."""
+
+    control_id = component_id(STAGE_PARAM, app_name, f'{pipeline["name"]}:{stage["name"]}:{field["key"]}')
+    if field.get("component") == "select":
+        control = dbc.Select(id=control_id, options=_options(field.get("options", [])), value=None, placeholder="please select", style=component_styles)
+    else:
+        control = dbc.Input(id=control_id, value="", type=field.get("type", "text"), style=component_styles)
+
+    children = [dbc.Label(f'{stage["name"]} ({stage["app"]}): {field.get("label", field["key"])}', style=label_style), control]
+    if field.get("tooltip"):
+        children.append(dbc.Tooltip(field["tooltip"], target=control_id, placement="right"))
+    return html.Div(children)
+
+
+def build_pipeline_form(app_name, pipeline):
+    """Build the (hidden) form of the fields the stages of a pipeline ask for (see "ask" in the pipeline YAML)."""
+
+    children = []
+    for stage in pipeline["stages"]:
+        fields = {field["key"]: field for field in spec_fields(load_spec(stage["app"]))}
+        children += [_stage_field_component(app_name, pipeline, stage, fields[key]) for key in stage.get("ask", [])]
+
+    return html.Div(children, id={"type": PIPELINE_FORM, "app": app_name, "pipeline": pipeline["name"]}, style={"display": "none"})
+
+
+def build_sidebar(spec):
+    """Build the parameter sidebar of an app from its spec."""
+
+    children = []
+    for field in spec["fields"]:
+        if "section" in field:
+            children.append(html.P(field["section"], style=section_style))
+        else:
+            children.append(_field_component(spec["name"], field))
+
+    batch = html.Div([
+        dbc.Label("Batch: dataset IDs (optional)", style=label_style),
+        dbc.Textarea(id={"type": BATCH, "app": spec["name"]}, value="", placeholder="e.g. 51234, 51235, 51236", style=component_styles),
+        dbc.Tooltip(
+            "Run the job for each of these datasets instead of the current one. Job names are derived from the dataset names.",
+            target={"type": BATCH, "app": spec["name"]}, placement="right"
+        )
+    ])
+
+    reuse = daq.BooleanSwitch(
+        id={"type": REUSE, "app": spec["name"]},
+        on=False,
+        label="Reuse identical previous runs",
+        labelPosition="top",
+        style={"margin-bottom": "18px"}
+    )
+
+    delta = daq.BooleanSwitch(
+        id={"type": DELTA, "app": spec["name"]},
+        on=False,
+        label="Only new / changed samples",
+        labelPosition="top",
+        style={"margin-bottom": "18px"}
+    )
+
+    options = [reuse, delta, batch]
+    if spec.get("shardable"):
+        options.append(html.Div([
+            dbc.Label("Shards: parallel jobs", style=label_style),
+            dbc.Input(id={"type": SHARDS, "app": spec["name"]}, type="number", min=1, max=MAX_SHARDS, step=1, value=1, style=component_styles),
+            dbc.Tooltip(
+                "Split the dataset into this many balanced jobs (weighted by read count or file size) that run in parallel. "
+                "Every job produces its own output (its own report in DATASET mode); they are not merged.",
+                target={"type": SHARDS, "app": spec["name"]}, placement="right"
+            )
+        ]))
+
+    pipelines = pipelines_starting_with(spec["name"])
+    if pipelines:
+        options.append(html.Div([
+            dbc.Label("Pipeline", style=label_style),
+            dbc.Select(
+                id={"type": PIPELINE, "app": spec["name"]},
+                options=[{"label": "This app only", "value": ""}] + [{"label": pipeline.get("label", pipeline["name"]), "value": pipeline["name"]} for pipeline in pipelines],
+                value="",
+                style=component_styles
+            ),
+            dbc.Tooltip(
+                "Submit the downstream apps automatically, each once B-Fabric shows the output dataset it needs available. "
+                "The values they cannot take from the data (e.g. contrasts) are entered below.",
+                target={"type": PIPELINE, "app": spec["name"]}, placement="right"
+            )
+        ]))
+        options += [build_pipeline_form(spec["name"], pipeline) for pipeline in pipelines]
+
+    options.append(html.Div(id={"type": PREDICTION, "app": spec["name"]}, style={**label_style, "margin-bottom": "18px"}))
+
+    return dbc.Container(
+        children=charge_switch + options + children + [
+            dbc.Button("Submit", id=submitbutton_id(f'{spec["name"]}_submit1'), n_clicks=0, style={"margin-top": "18px", 'borderBottom': '1px solid lightgrey'})
+        ],
+        style={"max-height": "62vh", "overflow-y": "auto", "overflow-x": "hidden"}
+    )
+
+
+def build_layout(spec):
+    """Build the main layout (the dataset table) of an app."""
+
+    return dbc.Container(
+        children=[
+            html.Div(id={"type": TABLE, "app": spec["name"]}, style={"max-height": "62vh", "overflow-y": "auto", "overflow-x": "hidden"})
+        ]
+    )
+
+
+def build_alerts(spec):
+    """Build the submission and validation alerts of an app, along with the rules the browser validates against."""
+
+    return html.Div(
+        [
+            dbc.Alert("Success: Job Submitted!", color="success", id=component_id(ALERT, spec["name"], "success"), dismissable=True, is_open=False),
+            dbc.Alert("Error: Job Submission Failed!", color="danger", id=component_id(ALERT, spec["name"], "fail"), dismissable=True, is_open=False),
+            dbc.Alert("", color="danger", id=component_id(ALERT, spec["name"], "warning"), dismissable=True, is_open=False),
+            dbc.Alert("", color="info", id=component_id(ALERT, spec["name"], "status"), dismissable=True, is_open=False),
+            dcc.Store(id={"type": RULES, "app": spec["name"]}, data=spec.get("rules", [])),
+            dcc.Store(id={"type": SUBMISSION, "app": spec["name"]}),
+            dcc.Interval(id={"type": POLL, "app": spec["name"]}, interval=SUBMISSION_POLL_INTERVAL, disabled=True)
+        ],
+        style={"margin": "20px"}
+    )
+
+
+######################################################################################################
+####################### Defaults, validation and parameters ##########################################
+######################################################################################################
+
+def _static_defaults(spec, entity_data):
+    defaults = {field["key"]: field.get("default", "" if field.get("component", "input") == "input" else None) for field in spec_fields(spec)}
+    defaults["name"] = (entity_data or {}).get("name", "Unknown") + spec.get("name_suffix", "")
+    return defaults
+
+
+def _predicts(spec):
+    """Whether durations are predicted for a spec: it offers partitions and the run history has a model of its app."""
+
+    if not any(field["key"] == "partition" for field in spec_fields(spec)):
+        return False
+    try:
+        return bool(HISTORY.models(spec["sushi_class"]))
+    except Exception as e:
+        print("[SUSHI HISTORY]: no prediction:", str(e))
+        return False
+
+
+def default_features(spec, entity_data):
+    """
+    Return the job features (see sizing.job_features) of the entity with the spec's default values,
+    or None if nothing needs them: the spec has no sizing models and no run history to predict from.
+
+    Computing them walks the whole dataset, so a callback computes them once per app and passes
+    them to default_values() and predict_partitions().
+    """
+
+    if not spec.get("sizing") and not _predicts(spec):
+        return None
+
+    try:
+        response = get_full_api_response(entity_data)
+        if not response or not response.get("attribute"):
+            return None
+        return job_features(response, _static_defaults(spec, entity_data))
+    except Exception as e:
+        print("[SUSHI SIZING]: no job features:", str(e))
+        return None
+
+
+def default_values(spec, entity_data, features=None):
+    """
+    Return the default value of every field of a spec for the given entity.
+
+    Resource fields with a model in the spec's "sizing" section default to the value recommended
+    for the size of the dataset (see sushi_utils/sizing.py) instead of their static default.
+
+    Args:
+        spec (dict): The app spec
+        entity_data (dict): The entity data of the session
+        features (dict, optional): The default_features() of the entity, if the caller has them already
+
+    Returns:
+        dict: Mapping of field key to default value (the job name is derived from the entity name)
+    """
+
+    defaults = _static_defaults(spec, entity_data)
+    features = features or default_features(spec, entity_data)
+
+    if spec.get("sizing"):
+        try:
+            defaults.update(recommend_resources(spec, get_full_api_response(entity_data), defaults, features))
+        except Exception as e:
+            print("[SUSHI SIZING]: no recommendation:", str(e))
+
+    predictions = predict_partitions(spec, entity_data, defaults, features)
+    if predictions:
+        defaults["partition"] = min(predictions, key=lambda partition: predictions[partition]["seconds"])
+
+    return defaults
+
+
+def predict_partitions(spec, entity_data, values, features=None):
+    """
+    Predict the duration of a job on each partition the spec offers, from the run history (see sushi_utils/history.py).
+
+    The dataset is only looked at (unless features are passed) if the run history has a model of the app.
+
+    Returns:
+        dict: Partition -> {"seconds", "runs", "peak_ram_gb"}; empty without a partition field or history
+    """
+
+    field = next((field for field in spec_fields(spec) if field["key"] == "partition"), None)
+    if field is None or not _predicts(spec):
+        return {}
+
+    try:
+        features = features or job_features(get_full_api_response(entity_data), values)
+        predictions = HISTORY.predict(spec["sushi_class"], features["input_gb"])
+    except Exception as e:
+        print("[SUSHI HISTORY]: no prediction:", str(e))
+        return {}
+
+    offered = [str(option["value"]) for option in _options(field.get("options", []))]
+    return {partition: prediction for partition, prediction in predictions.items() if str(partition) in offered}
+
+
+def prediction_text(predictions):
+    """Describe the predicted durations, fastest partition first."""
+
+    if not predictions:
+        return "Predicted duration: no run history for this app yet"
+
+    ranked = sorted(predictions.items(), key=lambda item: item[1]["seconds"])
+    return "Predicted duration: " + ", ".join(
+        f'{partition} ~{format_duration(prediction["seconds"])} ({prediction["runs"]} runs)' for partition, prediction in ranked
+    ) + f"; fastest: {ranked[0][0]}"
+
+
+def _is_blank(value):
+    return value is None or value == ""
+
+
+def _same(first, second):
+    """Strict equality as in JavaScript (===): True is not 1, but 1 is 1.0."""
+
+    numbers = all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in (first, second))
+    return first == second and (numbers or type(first) is type(second))
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _violates(check, value, argument):
+    if check == "required":
+        return _is_blank(value)
+    if check == "minimum":
+        number = _number(value)
+        return number is not None and number < argument
+    if check == "pattern":
+        return not _is_blank(value) and not re.match(argument, str(value))
+    if check == "forbidden":
+        return _same(value, argument)
+    raise ValueError(f"Unknown check {check}")
+
+
+def check_rules(rules, values):
+    """
+    Evaluate the declarative validation rules of a spec.
+
+    Every rule has a "check" (required, minimum, pattern, forbidden or differs), the "fields" it applies to,
+    an optional "value" argument and a "message", in which {field} is replaced by the offending field.
+    check_rules.js implements the same semantics for the browser; keep both in sync. Rules are
+    enforced, not advisory: submit_sushi_job() and stage_job() refuse values that break one.
+
+    Args:
+        rules (list): Rules of the spec
+        values (dict): Current field values by key
+
+    Returns:
+        list: Warning messages of all violated rules
+    """
+
+    warnings = []
+
+    for rule in rules:
+        if rule["check"] == "differs":
+            first, second = (values.get(key) for key in rule["fields"])
+            if not _is_blank(first) and _same(first, second) and not any(_same(first, ignored) for ignored in rule.get("ignore", [])):
+                warnings.append(rule["message"].format(field=rule["fields"][0]))
+            continue
+
+        for key in rule["fields"]:
+            if _violates(rule["check"], values.get(key), rule.get("value")):
+                warnings.append(rule["message"].format(field=key))
+
+    return warnings
+
+
+def build_parameters(spec, values):
+    """
+    Build the content of parameters.tsv from the field values of an app.
+
+    Fields are written in spec order (except those marked "submit: false"), followed by the
+    spec's constants, unless the spec lists the order of the rows under "parameter_order"
+    (parameters it leaves out follow in spec order). Values keep their type; sushi_utils/parameters.py formats them canonically
+    (e.g. switches as lowercase true / false, as Sushi expects) when parameters.tsv is written.
+
+    Args:
+        spec (dict): The app spec
+        values (dict): Field values by key
+
+    Returns:
+        dict: Ordered mapping of parameter name to value
+    """
+
+    parameters = {}
+
+    for field in spec_fields(spec):
+        if not field.get("submit", True):
+            continue
+        value = values.get(field["key"])
+        parameters[field["key"]] = bool(value) if field.get("component") == "switch" else value
+
+    parameters.update(spec.get("constants", {}))
+    if "parameter_order" in spec:
+        parameters = {**{key: parameters[key] for key in spec["parameter_order"] if key in parameters}, **parameters}
+    return parameters
+
+
+def _write_json(content, path):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(content, handle, indent=2)
+
+
+def get_project_id_for_order(order_id, environment):
+    """
+    Retrieve the project ID associated with a given order ID in B-Fabric.
+
+    Args:
+        order_id (int): The ID of the order container.
+        environment (str): The B-Fabric environment (e.g., "TEST" or "PRODUCTION").
+
+    Returns:
+        int or None: The associated project ID, or None if not found.
+    """
+
+    # Served from the lookup cache (orders rarely change project); concurrent sessions share one read
+    orders = cached_read("container", {"id": order_id}, environment)
+    if not orders:
+        return None
+    project_id = orders[0].get("project", {}).get("id", None)
+    return project_id
+
+
+def resolve_project_id(spec, entity_data, token_data):
+    """
+    Return the project a job is run (and charged) under.
+
+    The project is that of the dataset's container (orders are resolved to their project), unless the
+    spec pins one ("project: <id>"); DEFAULT_PROJECT_ID is used when the container has no project.
+    """
+
+    project = spec.get("project", "container")
+    if project != "container":
+        return str(project)
+
+    container = get_full_api_response(entity_data).get("container", {})
+    container_id = container.get("id", None)
+
+    if not container_id:
+        return DEFAULT_PROJECT_ID
+    if container.get("classname", None) == "project":
+        return container_id
+
+    try:
+        project_id = get_project_id_for_order(container_id, token_data.get("environment", "TEST").upper())
+    except Exception as e:
+        print(f"[SUSHI PROJECT]: looking up the project of container {container_id} failed: {e}")
+        project_id = None
+
+    if project_id is None:
+        print(f"[SUSHI PROJECT]: container {container_id} has no project, using {DEFAULT_PROJECT_ID}")
+        return DEFAULT_PROJECT_ID
+    return project_id
+
+
+def _sample_mode(spec, parameters):
+    """Switch the process mode of a job to SAMPLE, if its spec offers that mode."""
+
+    for field in spec_fields(spec):
+        if field["key"] in PROCESS_MODE_PARAMETERS and "SAMPLE" in [option["value"] for option in _options(field.get("options", []))]:
+            return {**parameters, field["key"]: "SAMPLE"}
+    return parameters
+
+
+def stage_job(spec, values, token_data, entity_data, app_data, progress=None, commit=True, delta=False, samples=None, weights=None):
+    """
+    Write dataset.tsv and parameters.tsv of one job and build its sushi_fabric command.
+
+    The files go to a staging directory of their own (see sushi_utils/staging.py), so jobs
+    sharing a name do not overwrite each other.
+
+    In delta mode, only the samples that are new or changed since the last run of the dataset
+    with the same settings are staged (in SAMPLE process mode, where the app offers it), along
+    with a merge_manifest.json describing how to combine the outputs of both runs.
+
+    Args:
+        spec (dict): The app spec
+        values (dict): Field values by key
+        token_data (dict): Token metadata of the session
+        entity_data (dict): The entity data of the dataset to process
+        app_data (dict): Application metadata
+        progress (callable, optional): Called with a short description of every stage reached
+        commit (bool): Move the files into place right away; pass False to commit several
+            runs together with staging.commit_runs()
+        delta (bool): Only stage the samples added or changed since the last run
+        samples (set, optional): Only stage these samples (one shard of a sharded job, see submit_sharded)
+        weights (tuple, optional): The sample_weights() of the dataset, computed once by submit_sharded for all its shards
+
+    Returns:
+        tuple: The bash command running the job, the project it runs under and its StagedRun
+
+    Raises:
+        ValueError: If the values break a rule of the spec (see check_rules)
+    """
+
+    progress = progress or (lambda stage: None)
+
+    name = values["name"]
+
+    warnings = check_rules(spec.get("rules", []), values)
+    if warnings:
+        raise ValueError(f'{spec["name"]} not submitted: {"; ".join(warnings)}')
+
+    response = get_full_api_response(entity_data)
+    parameters = build_parameters(spec, values)
+    current_rows = dataset_row_hashes(response)
+    select = None
+
+    run = StagedRun(name)
+    try:
+        run.parameters = parameters
+        run.environment = token_data.get("environment", "TEST").upper()
+        if samples is not None:
+            # A shard covers part of the dataset only, so it is neither a delta base nor a delta run
+            index = sample_index(response)
+            select = lambda row: str(row[index]) in samples
+            delta = False
+        elif response.get("id") is not None:
+            run.snapshot = {
+                "parameters_key": parameters_key(spec["sushi_class"], parameters),
+                "dataset_id": response["id"],
+                "rows": snapshot_rows(current_rows, run.path, name)
+            }
+
+        try:
+            snapshot = None
+            if delta and run.snapshot:
+                # A delta is taken against the last run that completed, never against a failed or unfinished one
+                for pending in LEDGER.pending(parameters_key=run.snapshot["parameters_key"], dataset_id=response["id"]):
+                    if check_run_status(pending) == "available":
+                        break
+                snapshot = LEDGER.last_snapshot(run.snapshot["parameters_key"], response["id"])
+        except Exception as e:
+            print("[SUSHI LEDGER]: snapshot lookup failed:", str(e))
+            snapshot = None
+
+        if snapshot:
+            plan = plan_delta(current_rows, snapshot)
+            progress(f'Delta to the run {snapshot["name"]}: {len(plan["new"])} new, {len(plan["changed"])} changed, {len(plan["unchanged"])} unchanged samples')
+
+            # The output of a delta run gets a name of its own, so it can be told apart when merging
+            name = f"{name}_delta_{run.run_id}"
+            parameters = run.parameters = _sample_mode(spec, {**parameters, "name": name})
+            submitted = {current_rows[sample] for sample in plan["new"] + plan["changed"]}
+            select = lambda row: row_hash(row) in submitted
+
+            run.snapshot["rows"] = snapshot_rows(current_rows, run.path, name, snapshot, plan)
+            run.delta = {"base": snapshot, "plan": plan}
+
+            process_mode = next((parameters[key] for key in PROCESS_MODE_PARAMETERS if key in parameters), None)
+            manifest = merge_manifest(spec["sushi_class"], response["id"], name, process_mode, snapshot, plan, run.snapshot["rows"])
+            run.stage("merge_manifest.json", lambda path: _write_json(manifest, path))
+
+        selected = samples if samples is not None else set(run.delta["plan"]["new"] + run.delta["plan"]["changed"]) if run.delta else None
+        try:
+            run.features = job_features(response, parameters, selected, weights)
+        except Exception as e:
+            print("[SUSHI HISTORY]: no job features:", str(e))
+
+        progress("Writing dataset and parameters")
+        dataset_path = run.stage("dataset.tsv", lambda path: dataset_to_tsv(response, path, select=select))
+        param_path = run.stage("parameters.tsv", lambda path: write_parameters(parameters, path))
+
+        progress("Resolving the project")
+        project_id = resolve_project_id(spec, entity_data, token_data)
+
+        if commit:
+            run.commit()
+    except Exception:
+        run.abort()
+        raise
+
+    bash_command = spec.get("command", SUSHI_COMMAND).format(
+        sushi_class=spec["sushi_class"],
+        dataset_path=dataset_path,
+        param_path=param_path,
+        app_id=app_data.get("id", ""),
+        project_id=project_id,
+        dataset_name=entity_data.get("name", ""),
+        mango_run_name="None",
+        name=name
+    )
+    print("[SUSHI BASH COMMAND]:", bash_command)
+
+    return bash_command, project_id, run
+
+
+def run_sushi(bash_command, project_id, url, charge_run):
+    """Run a staged sushi_fabric command through run_main_job (creating the workunit and charging the project)."""
+
+    run_main_job(
+        files_as_byte_strings={},
+        bash_commands=[bash_command],
+        resource_paths={},
+        attachment_paths={},
+        token=url,
+        service_id=bfabric_web_apps.SERVICE_ID,
+        charge=[project_id] if charge_run and project_id else []
+    )
+
+
+def submit_staged(spec, values, bash_command, project_id, run, url, charge_run, reuse=False, progress=None, journal=None):
+    """
+    Submit a staged job, unless the ledger knows an identical earlier run that may be reused
+    (or, for a delta run, no sample was added or changed since its base run). The job is recorded
+    as pending and only reused by later jobs once B-Fabric shows its output available.
+
+    Args:
+        spec (dict): The app spec
+        values (dict): Field values by key
+        bash_command (str): The staged sushi_fabric command
+        project_id (str): The project the job runs under
+        run (StagedRun): The committed staging directory of the job
+        url (str): The URL search string holding the B-Fabric token
+        charge_run (bool): Whether the project should be charged
+        reuse (bool): Reuse an identical earlier run instead of submitting the job again
+        progress (callable, optional): Called with a short description of every stage reached
+        journal (callable, optional): Called with the state and details of every transition of the job (see sushi_utils/journal.py)
+
+    Returns:
+        dict or None: The ledger entry of the reused run, or None if the job was submitted
+    """
+
+    progress = progress or (lambda stage: None)
+    journal = journal or (lambda state, **fields: None)
+
+    if run.delta and not (run.delta["plan"]["new"] or run.delta["plan"]["changed"]):
+        run.abort()
+        progress(f'No new or changed samples since the run {run.delta["base"]["name"]}')
+        return run.delta["base"]
+
+    try:
+        key = job_key(spec["sushi_class"], run.parameters, os.path.join(run.path, "dataset.tsv"))
+        if reuse:
+            # Earlier runs only become reusable once B-Fabric shows their output available
+            for pending in LEDGER.pending(key):
+                if check_run_status(pending) == "available":
+                    break
+        prior = LEDGER.lookup(key, spec["sushi_class"])
+    except Exception as e:
+        print("[SUSHI LEDGER]: lookup failed:", str(e))
+        key, prior = None, None
+
+    if prior and reuse:
+        run.abort()
+        return prior
+    if prior:
+        progress(f'Identical to the earlier run {prior["name"]}, submitting again')
+
+    name = run.parameters.get("name", values["name"])  # Delta runs get a name of their own
+    journal("staged", job=name, run_path=run.path)
+
+    progress("Submitting to Sushi")
+    journal("dispatched", job=name, run_path=run.path)
+    try:
+        run_sushi(bash_command, project_id, url, charge_run)
+    except Exception as e:
+        journal("failed", job=name, run_path=run.path, error=str(e))
+        raise
+
+    try:
+        if key:
+            LEDGER.record(key, spec["sushi_class"], name, run.path, project_id, run.environment)
+        if run.snapshot:
+            LEDGER.record_snapshot(
+                key or "", spec["sushi_class"], run.snapshot["parameters_key"], run.snapshot["dataset_id"],
+                name, run.path, run.snapshot["rows"]
+            )
+    except Exception as e:
+        print("[SUSHI LEDGER]: recording failed:", str(e))
+
+    try:
+        HISTORY.record(name, spec["sushi_class"], run.path, run.parameters, run.features or {})
+    except Exception as e:
+        print("[SUSHI HISTORY]: recording failed:", str(e))
+
+    # Only after the ledger knows the run (as pending), so recovery reports it instead of submitting it again
+    journal("accepted", job=name, run_path=run.path)
+    return None
+
+
+def submit_job(spec, values, token_data, entity_data, app_data, url, charge_run, progress=None, reuse=False, delta=False, journal=None):
+    """
+    Write dataset.tsv and parameters.tsv for an app and submit the Sushi job.
+
+    This runs outside of the Dash request (see sushi_utils/submission.py), as the B-Fabric
+    and Sushi calls can take a while.
+
+    Args:
+        spec (dict): The app spec
+        values (dict): Field values by key
+        token_data (dict): Token metadata of the session
+        entity_data (dict): The (slim) entity data of the session
+        app_data (dict): Application metadata
+        url (str): The URL search string holding the B-Fabric token
+        charge_run (bool): Whether the project should be charged
+        progress (callable, optional): Called with a short description of every stage reached
+        reuse (bool): Reuse an identical earlier run (see sushi_utils/ledger.py) instead of submitting again
+        delta (bool): Only submit the samples added or changed since the last run (see stage_job)
+        journal (callable, optional): Called with every state transition of the job (see submit_staged)
+
+    Returns:
+        bool: True if the job was submitted (or an earlier run reused), False otherwise
+    """
+
+    progress = progress or (lambda stage: None)
+
+    try:
+        bash_command, project_id, run = stage_job(spec, values, token_data, entity_data, app_data, progress, delta=delta)
+
+        prior = submit_staged(spec, values, bash_command, project_id, run, url, charge_run, reuse, progress, journal)
+        if prior:
+            progress(f'Nothing to submit, reusing the earlier run {prior["name"]} ({prior["run_path"]})')
+        else:
+            progress("Submitted")
+        return True
+
+    except Exception as e:
+        print("[SUSHI ERROR]:", str(e))
+        progress(f"Failed: {e}")
+        return False
+
+
+######################################################################################################
+####################### Batch submission #############################################################
+######################################################################################################
+
+def parse_dataset_ids(text):
+    """Return the dataset IDs listed in a free-text field (separated by commas, spaces or newlines), without duplicates."""
+    return list(dict.fromkeys(re.findall(r"\d+", text or "")))
+
+
+def _batch_job_names(spec, responses):
+    """Name every job after its dataset; datasets sharing a name get their ID appended."""
+
+    names = {}
+    counts = {}
+    for response in responses.values():
+        if response:
+            counts[response.get("name", "")] = counts.get(response.get("name", ""), 0) + 1
+
+    for dataset_id, response in responses.items():
+        if response:
+            name = response.get("name", "") if counts[response.get("name", "")] == 1 else f'{response.get("name", "")}_{dataset_id}'
+            names[dataset_id] = name + spec.get("name_suffix", "")
+    return names
+
+
+def submit_batch(spec, values, dataset_ids, token_data, app_data, url, charge_run, progress=None, reuse=False, delta=False,
+                 fetch_concurrency=BATCH_FETCH_CONCURRENCY, submit_concurrency=BATCH_SUBMIT_CONCURRENCY, journal=None):
+    """
+    Submit the job of an app for each of several B-Fabric datasets.
+
+    The datasets are read (with the user's own credentials), converted and staged concurrently;
+    the sushi_fabric invocations are then fanned out with at most submit_concurrency running at once.
+    A failing dataset does not stop the others.
+
+    Args:
+        spec (dict): The app spec
+        values (dict): Field values by key (the job name is derived from every dataset)
+        dataset_ids (list): The IDs of the datasets to process
+        token_data (dict): Token metadata of the session
+        app_data (dict): Application metadata
+        url (str): The URL search string holding the B-Fabric token
+        charge_run (bool): Whether the projects should be charged
+        progress (callable, optional): Called with a short description of every stage reached
+        reuse (bool): Reuse identical earlier runs instead of submitting those jobs again
+        delta (bool): Only submit the samples of each dataset added or changed since its last run
+        fetch_concurrency (int): Maximum number of datasets read and staged at once
+        submit_concurrency (int): Maximum number of jobs submitted at once
+        journal (callable, optional): Called with every state transition of every job (see submit_staged)
+
+    Returns:
+        dict: The aggregated report {"summary": str, "submitted": int, "reused": int, "failed": int, "jobs": [...]},
+        with one {"dataset_id", "dataset_name", "name", "status", "error", "reused_run"} entry per
+        dataset, status being "submitted", "reused" or "failed"
+    """
+
+    progress = progress or (lambda stage: None)
+    jobs = {
+        dataset_id: {"dataset_id": dataset_id, "dataset_name": None, "name": None, "status": "failed", "error": None, "reused_run": None}
+        for dataset_id in dataset_ids
+    }
+
+    B = pooled_wrapper(bfabric_interface.token_response_to_bfabric(token_data))
+
+    def fetch(dataset_id):
+        try:
+            result = B.read("dataset", {"id": dataset_id})
+            if not len(result):
+                jobs[dataset_id]["error"] = "Dataset not found"
+                return None
+            return result[0]
+        except Exception as e:
+            jobs[dataset_id]["error"] = f"Reading the dataset failed: {e}"
+            return None
+
+    progress(f"Reading {len(dataset_ids)} datasets")
+    with ThreadPoolExecutor(max_workers=fetch_concurrency) as pool:
+        responses = dict(zip(dataset_ids, pool.map(fetch, dataset_ids)))
+
+    names = _batch_job_names(spec, responses)
+
+    def stage(dataset_id):
+        response = responses[dataset_id]
+        jobs[dataset_id].update(dataset_name=response.get("name"), name=names[dataset_id])
+        try:
+            entity_data = {"name": response.get("name", ""), "full_api_response": response}
+            return stage_job(spec, {**values, "name": names[dataset_id]}, token_data, entity_data, app_data, commit=False, delta=delta)
+        except Exception as e:
+            jobs[dataset_id]["error"] = f"Staging failed: {e}"
+            return None
+
+    fetched = [dataset_id for dataset_id in dataset_ids if responses[dataset_id]]
+    progress(f"Staging {len(fetched)} jobs")
+    with ThreadPoolExecutor(max_workers=fetch_concurrency) as pool:
+        staged = {dataset_id: job for dataset_id, job in zip(fetched, pool.map(stage, fetched)) if job}
+
+    # All files of the batch are flushed to disk in one go before any job is submitted
+    commit_runs([run for _, _, run in staged.values()])
+
+    def submit(dataset_id):
+        try:
+            prior = submit_staged(spec, {**values, "name": names[dataset_id]}, *staged[dataset_id], url, charge_run, reuse, journal=journal)
+            jobs[dataset_id]["status"] = "reused" if prior else "submitted"
+            jobs[dataset_id]["reused_run"] = prior["run_path"] if prior else None
+        except Exception as e:
+            jobs[dataset_id]["error"] = f"Submission failed: {e}"
+        progress(f'Submitted {sum(job["status"] != "failed" for job in jobs.values())} of {len(staged)} jobs')
+
+    progress(f"Submitting {len(staged)} jobs")
+    with ThreadPoolExecutor(max_workers=submit_concurrency) as pool:
+        list(pool.map(submit, staged))
+
+    report = {
+        "submitted": sum(job["status"] == "submitted" for job in jobs.values()),
+        "reused": sum(job["status"] == "reused" for job in jobs.values()),
+        "failed": sum(job["status"] == "failed" for job in jobs.values()),
+        "jobs": [jobs[dataset_id] for dataset_id in dataset_ids]
+    }
+
+    report["summary"] = f'Batch: {report["submitted"]} submitted, {report["reused"]} reused, {report["failed"]} failed'
+    progress(report["summary"])
+    print(f'[SUSHI BATCH]: {report["summary"]}')
+    for job in report["jobs"]:
+        if job["error"]:
+            print(f'[SUSHI BATCH]: dataset {job["dataset_id"]}: {job["error"]}')
+
+    return report
+
+
+######################################################################################################
+####################### Sharding #####################################################################
+######################################################################################################
+
+def submit_sharded(spec, values, shards, token_data, entity_data, app_data, url, charge_run, progress=None, reuse=False,
+                   submit_concurrency=BATCH_SUBMIT_CONCURRENCY, journal=None):
+    """
+    Split the dataset of a job into balanced shards and submit them as parallel jobs.
+
+    Only apps processing every sample on its own (shardable: true in their spec) can be split,
+    since the output of a shard must not depend on the samples of other shards.
+
+    Samples are weighted by read count or file size (see sushi_utils/sharding.py) and partitioned
+    so that the heaviest shard, which determines the wall-clock time, is as light as possible.
+    All shards are staged and committed together, then submitted concurrently. Every shard
+    produces an output of its own (in DATASET process mode, its own report); nothing merges them.
+    shard_manifest.json lists the run of every shard and its samples. The reported speedup is
+    estimated from the sample weights, not measured.
+
+    Args:
+        spec (dict): The app spec
+        values (dict): Field values by key
+        shards (int): The number of shards wanted
+        token_data (dict): Token metadata of the session
+        entity_data (dict): The (slim) entity data of the session
+        app_data (dict): Application metadata
+        url (str): The URL search string holding the B-Fabric token
+        charge_run (bool): Whether the project should be charged
+        progress (callable, optional): Called with a short description of every stage reached
+        reuse (bool): Reuse identical earlier runs of a shard instead of submitting it again
+        submit_concurrency (int): Maximum number of shards submitted at once
+        journal (callable, optional): Called with every state transition of every shard (see submit_staged)
+
+    Returns:
+        dict: The aggregated report {"summary", "submitted", "reused", "failed", "basis", "estimated_speedup", "jobs"},
+        with one {"name", "samples", "weight", "status", "error", "reused_run"} entry per shard
+    """
+
+    progress = progress or (lambda stage: None)
+
+    response = get_full_api_response(entity_data)
+    weights, basis = sample_weights(response)
+    parts = partition(weights, shards)
+    speedup = estimated_speedup(parts)
+    progress(f"Splitting {len(weights)} samples into {len(parts)} shards by {basis}")
+
+    jobs, staged = [], []
+    for i, part in enumerate(parts):
+        shard_values = {**values, "name": f'{values["name"]}_shard{i + 1}of{len(parts)}'}
+        job = {"name": shard_values["name"], "samples": part["samples"], "weight": part["weight"], "status": "failed", "error": None, "reused_run": None}
+        jobs.append(job)
+        try:
+            staged.append((job, shard_values, stage_job(
+                spec, shard_values, token_data, entity_data, app_data, commit=False, samples=set(part["samples"]), weights=(weights, basis)
+            )))
+        except Exception as e:
+            job["error"] = f"Staging failed: {e}"
+
+    commit_runs([run for _, _, (_, _, run) in staged])
+
+    def submit(item):
+        job, shard_values, (bash_command, project_id, run) = item
+        try:
+            prior = submit_staged(spec, shard_values, bash_command, project_id, run, url, charge_run, reuse, journal=journal)
+            job["status"] = "reused" if prior else "submitted"
+            job["reused_run"] = prior["run_path"] if prior else None
+            job["run"] = prior["run_path"] if prior else run.path
+        except Exception as e:
+            job["error"] = f"Submission failed: {e}"
+        progress(f'Submitted {sum(job["status"] != "failed" for job in jobs)} of {len(staged)} shards')
+
+    progress(f"Submitting {len(staged)} shards")
+    with ThreadPoolExecutor(max_workers=submit_concurrency) as pool:
+        list(pool.map(submit, staged))
+
+    report = {
+        "submitted": sum(job["status"] == "submitted" for job in jobs),
+        "reused": sum(job["status"] == "reused" for job in jobs),
+        "failed": sum(job["status"] == "failed" for job in jobs),
+        "basis": basis,
+        "estimated_speedup": speedup,
+        "jobs": jobs
+    }
+    report["summary"] = (
+        f'{len(parts)} shards (balanced by {basis}): {report["submitted"]} submitted, {report["reused"]} reused, '
+        f'{report["failed"]} failed; speedup over a single job estimated from the {basis}: {speedup:.1f}x'
+    )
+    process_mode = next((values[key] for key in PROCESS_MODE_PARAMETERS if key in values), None)
+    if str(process_mode).upper() == "DATASET":
+        report["summary"] += "; every shard has its own report, they are not merged"
+
+    # Record which shard run holds which samples
+    if not report["failed"]:
+        progress("Writing the shard manifest")
+        manifest = {
+            "sushi_class": spec["sushi_class"],
+            "dataset_id": response.get("id"),
+            "name": values["name"],
+            "basis": basis,
+            "estimated_speedup": speedup,
+            "shards": [{"run": job["run"], "name": job["name"], "samples": job["samples"]} for job in jobs]
+        }
+        manifest_run = StagedRun(values["name"])
+        manifest_run.stage("shard_manifest.json", lambda path: _write_json(manifest, path))
+        manifest_run.commit()
+        report["manifest"] = os.path.join(manifest_run.path, "shard_manifest.json")
+
+    progress(report["summary"])
+    print(f'[SUSHI SHARDS]: {report["summary"]}')
+    return report
+
+
+######################################################################################################
+####################### Option sources ###############################################################
+######################################################################################################
+
+def container_dataset_options(token_data, entity_data):
+    """Offer the other datasets of the entity's container (used by MergeRunDataApp)."""
+
+    def format_name(name):
+        if len(name) > 25:
+            return name[:5] + "..." + name[-5:]
+        return name
+
+    response = get_full_api_response(entity_data)
+    B = pooled_wrapper(bfabric_interface.get_wrapper())
+    res = B.read("dataset", {"containerid": response.get("container", {}).get("id", "")})
+
+    options = [
+        {"label": f"{format_name(elt['name'])} ({elt['id']})", "value": str(elt["id"])}
+        for elt in res
+        if str(elt["id"]) != str(response.get("id"))
+    ]
+
+    return options or [{"label": "No datasets available", "value": ""}]
+
+
+# Dropdown fields name one of these in "options_from"
+OPTION_SOURCES = {
+    "container_datasets": container_dataset_options
+}
+
+
+######################################################################################################
+####################### Callbacks (shared by all spec-built apps) ####################################
+######################################################################################################
+
+def _values_by_app(*components):
+    """Group the values of pattern-matched components as {app: {key: value}}."""
+
+    values = {}
+    for component_list in components:
+        for component in component_list:
+            values.setdefault(component["id"]["app"], {})[component["id"]["key"]] = component.get("value")
+    return values
+
+
+@app.callback(
+    Output({"type": PARAM, "app": ALL, "key": ALL}, "value"),
+    Output({"type": SWITCH, "app": ALL, "key": ALL}, "on"),
+    Output({"type": PREDICTION, "app": ALL}, "children"),
+    Input("entity", "data"),
+)
+def populate_default_values(entity_data):
+    """
+    Populate the sidebar of the displayed app with the defaults of its spec, and show the
+    duration predicted for each partition (the fastest one is preselected).
+
+    The job features of the dataset are computed once per app and shared by both.
+    """
+
+    params, switches, predictions = ctx.outputs_list
+    defaults, features = {}, {}
+
+    def values(app_name):
+        if app_name not in defaults:
+            features[app_name] = default_features(load_spec(app_name), entity_data)
+            defaults[app_name] = default_values(load_spec(app_name), entity_data, features[app_name])
+        return defaults[app_name]
+
+    def default(component):
+        return values(component["id"]["app"]).get(component["id"]["key"])
+
+    def prediction(component):
+        app_name = component["id"]["app"]
+        return prediction_text(predict_partitions(load_spec(app_name), entity_data, values(app_name), features[app_name]))
+
+    return (
+        [default(component) for component in params],
+        [bool(default(component)) for component in switches],
+        [prediction(component) for component in predictions]
+    )
+
+
+# Runs in the browser: typing in the sidebar causes no server requests
+app.clientside_callback(
+    CHECK_RULES_JS,
+    Output({"type": ALERT, "app": ALL, "key": "warning"}, "children"),
+    Output({"type": ALERT, "app": ALL, "key": "warning"}, "is_open"),
+    Input({"type": PARAM, "app": ALL, "key": ALL}, "value"),
+    State({"type": RULES, "app": ALL}, "data"),
+)
+
+
+@app.callback(
+    Output({"type": TABLE, "app": ALL}, "children"),
+    Input("entity", "data"),
+)
+def update_dataset(entity_data):
+    """
+    Show the dataset of the session in the displayed app.
+    """
+
+    if not ctx.outputs_list:
+        return []
+
+    table = dataset_table(dataset_summary(entity_data))
+    return [table for _ in ctx.outputs_list]
+
+
+@app.callback(
+    Output({"type": CHOICE, "app": ALL, "key": ALL}, "options"),
+    Input("token_data", "data"),
+    Input("entity", "data"),
+)
+def update_choice_options(token_data, entity_data):
+    """
+    Fill the dropdowns of the displayed app from their option sources.
+    """
+
+    options = []
+    for component in ctx.outputs_list:
+        field = next(field for field in spec_fields(load_spec(component["id"]["app"])) if field["key"] == component["id"]["key"])
+        options.append(OPTION_SOURCES[field["options_from"]](token_data, entity_data))
+    return options
+
+
+@app.callback(
+    Output({"type": PIPELINE_FORM, "app": ALL, "pipeline": ALL}, "style"),
+    Input({"type": PIPELINE, "app": ALL}, "value"),
+)
+def show_pipeline_form(pipeline_values):
+    """
+    Show the form of the selected pipeline only.
+    """
+
+    selected = {state["id"]["app"]: state.get("value") for state in ctx.inputs_list[0]}
+    return [{} if selected.get(form["id"]["app"]) == form["id"]["pipeline"] else {"display": "none"} for form in ctx.outputs_list]
+
+
+@app.server.route("/sushi/submissions/<submission_id>")
+def get_submission_status(submission_id):
+    """
+    Status endpoint of a submission, polled by the browser until the submission is finished or failed.
+    """
+
+    status = submission_status(submission_id)
+    if status is None:
+        return jsonify({"id": submission_id, "error": "Unknown submission"}), 404
+    return jsonify(status)
+
+
+@app.callback(
+    Output({"type": SUBMISSION, "app": ALL}, "data"),
+    Output({"type": POLL, "app": ALL}, "disabled"),
+    Output({"type": ALERT, "app": ALL, "key": "status"}, "children"),
+    Output({"type": ALERT, "app": ALL, "key": "status"}, "is_open"),
+    Input("Submit", "n_clicks"),
+    State({"type": PARAM, "app": ALL, "key": ALL}, "value"),
+    State({"type": CHOICE, "app": ALL, "key": ALL}, "value"),
+    State({"type": SWITCH, "app": ALL, "key": ALL}, "on"),
+    State({"type": BATCH, "app": ALL}, "value"),
+    State({"type": REUSE, "app": ALL}, "on"),
+    State({"type": DELTA, "app": ALL}, "on"),
+    State({"type": SHARDS, "app": ALL}, "value"),
+    State({"type": PIPELINE, "app": ALL}, "value"),
+    State({"type": STAGE_PARAM, "app": ALL, "key": ALL}, "value"),
+    State("token_data", "data"),
+    State("entity", "data"),
+    State("app_data", "data"),
+    State("url", "search"),
+    State("charge_run", "on"),
+    prevent_initial_call=True
+)
+def submit_sushi_job(n_clicks, param_values, choice_values, switch_values, batch_values, reuse_values, delta_values, shard_values, pipeline_values,
+                     stage_param_values, token_data, entity_data, app_data, url, charge_run):
+    """
+    Hand the job of the displayed app to the background executor and start polling its status.
+
+    The callback returns as soon as the submission is enqueued, so the web server is not
+    blocked while B-Fabric and Sushi process it. If dataset IDs are listed in the batch field,
+    the job is submitted for each of them instead of the current dataset; if a pipeline is
+    selected, it is started with this job (see sushi_utils/pipeline.py), unless a field its
+    stages ask for is blank or breaks a rule. Nothing is submitted while the values break a rule
+    of the app's spec; the warnings are shown in the status alert instead.
+
+    A repeated submission with the same settings from the same session within IDEMPOTENCY_WINDOW
+    (a double click, a retried request) is not enqueued again; the earlier submission is polled instead.
+    The claim on the settings is released if the submission cannot be enqueued or fails.
+    """
+
+    submissions = ctx.outputs_list[0]
+    if not submissions:
+        raise PreventUpdate
+
+    app_name = submissions[0]["id"]["app"]
+    values = _values_by_app(*ctx.states_list[:3]).get(app_name, {})
+    dataset_ids = parse_dataset_ids(next((state.get("value") for state in ctx.states_list[3] if state["id"]["app"] == app_name), ""))
+    reuse = next((state.get("value") for state in ctx.states_list[4] if state["id"]["app"] == app_name), False)
+    delta = next((state.get("value") for state in ctx.states_list[5] if state["id"]["app"] == app_name), False)
+    shards = next((state.get("value") for state in ctx.states_list[6] if state["id"]["app"] == app_name), 1)
+    pipeline = next((state.get("value") for state in ctx.states_list[7] if state["id"]["app"] == app_name), None)
+
+    stage_values = {}
+    for state in ctx.states_list[8]:
+        pipeline_name, stage, key = state["id"]["key"].rsplit(":", 2)
+        if state["id"]["app"] == app_name and pipeline_name == pipeline:
+            stage_values.setdefault(stage, {})[key] = state.get("value")
+
+    warnings = check_rules(load_spec(app_name).get("rules", []), values)
+    if warnings:
+        return [no_update], [True], [f'Not submitted: {"; ".join(warnings)}'], [True]
+
+    if pipeline:
+        problems = check_stage_values(load_pipeline(pipeline), stage_values)
+        if problems:
+            return [no_update], [True], [f'Pipeline not started: {"; ".join(problems)}'], [True]
+
+    options = {
+        "dataset_ids": dataset_ids, "reuse": reuse, "delta": delta, "shards": int(shards or 1), "pipeline": pipeline or None,
+        "stage_values": stage_values or None
+    }
+
+    submission_id = uuid.uuid4().hex
+    try:
+        earlier = LEDGER.claim(submission_key(token_data, app_name, entity_data, values, **options), app_name, submission_id, IDEMPOTENCY_WINDOW)
+    except Exception as e:
+        print("[SUSHI LEDGER]: idempotency claim failed:", str(e))
+        earlier = None
+
+    if earlier:
+        print(f"[SUSHI SUBMISSION]: duplicate of {earlier} ignored")
+        status = f"Submission {earlier[:8]}: already submitted with these settings, duplicate ignored"
+        submission_id = earlier
+    else:
+        try:
+            enqueue_submission(app_name, values, token_data, entity_data, app_data, url, charge_run, submission_id=submission_id, **options)
+        except Exception as e:
+            print("[SUSHI SUBMISSION]: enqueueing failed:", str(e))
+            release_claim(submission_id)
+            return [no_update], [True], [f"Submission failed: {e}"], [True]
+        status = f"Submission {submission_id[:8]}: Waiting for a worker"
+
+    submission = {
+        "id": submission_id,
+        "url": f"{app.config.requests_pathname_prefix}sushi/submissions/{submission_id}"
+    }
+
+    return [submission], [False], [status], [True]
+
+
+# Runs in the browser: fetches the status endpoint instead of a server callback per poll
+app.clientside_callback(
+    POLL_SUBMISSION_JS,
+    Output({"type": ALERT, "app": ALL, "key": "success"}, "is_open"),
+    Output({"type": ALERT, "app": ALL, "key": "fail"}, "is_open"),
+    Output({"type": ALERT, "app": ALL, "key": "status"}, "children", allow_duplicate=True),
+    Output({"type": ALERT, "app": ALL, "key": "status"}, "is_open", allow_duplicate=True),
+    Output({"type": POLL, "app": ALL}, "disabled", allow_duplicate=True),
+    Input({"type": POLL, "app": ALL}, "n_intervals"),
+    State({"type": SUBMISSION, "app": ALL}, "data"),
+    prevent_initial_call=True
+)
@@ -0,0 +1,99 @@
+import os
+import shutil
+import uuid
+from datetime import datetime
+from bfabric_web_apps import SCRATCH_PATH
+
+STAGING_FSYNC = True  # Flush staged files to disk before they are renamed into place (disable only for tests / benchmarks)
+
+
+class StagedRun:
+    """
+    Unique staging directory of one Sushi job: SCRATCH_PATH/<name>/<timestamp>_<run id>.
+
+    Concurrent submissions with the same job name therefore never share files. Every file is
+    written to a temporary name first and only renamed to its final name by commit_runs(),
+    after all files of the run (or of a whole batch of runs) were flushed to disk, so Sushi
+    never sees a half-written dataset.tsv or parameters.tsv, not even after a crash.
+    """
+
+    def __init__(self, name, root=None):
+        self.name = name
+        self.run_id = uuid.uuid4().hex[:8]
+        self.path = os.path.join(root or SCRATCH_PATH, name, f"{datetime.now():%Y%m%d-%H%M%S}_{self.run_id}")
+        self._pending = []  # (temporary path, final path)
+
+        # Set by spec_engine.stage_job() and recorded in the ledger once the run was submitted
+        self.parameters = None  # The content of parameters.tsv
+        self.snapshot = None    # The dataset rows the run covers (see SubmissionLedger.record_snapshot)
+        self.delta = None       # {"base": snapshot, "plan": plan_delta()} of a delta run
+        self.features = None    # Input size of the job, recorded in the run history (see sizing.job_features)
+        self.environment = None # B-Fabric environment the job runs in, where the ledger checks its output
+
+        os.makedirs(self.path)
+
+    def stage(self, file_name, write):
+        """
+        Write a file of the run under a temporary name.
+
+        Args:
+            file_name (str): The final name of the file within the run directory
+            write (callable): Called with the path to write the file content to
+
+        Returns:
+            str: The final path of the file (valid once the run is committed)
+        """
+
+        final_path = os.path.join(self.path, file_name)
+        tmp_path = f"{final_path}.{uuid.uuid4().hex}.tmp"
+
+        self._pending.append((tmp_path, final_path))
+        write(tmp_path)
+        return final_path
+
+    def commit(self):
+        """Flush and rename the staged files of this run (see commit_runs)."""
+        commit_runs([self])
+
+    def abort(self):
+        """Remove the run directory along with everything staged so far."""
+
+        self._pending = []
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def _fsync(path, flags=os.O_RDONLY):
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def commit_runs(runs):
+    """
+    Atomically move the staged files of several runs into place with one batch of fsyncs.
+
+    All temporary files are flushed first, then renamed, then every affected directory is flushed
+    once, instead of interleaving one flush per file with the renames.
+
+    Args:
+        runs (list): StagedRun objects whose files are complete
+    """
+
+    pending = [item for run in runs for item in run._pending]
+
+    if STAGING_FSYNC:
+        for tmp_path, _ in pending:
+            _fsync(tmp_path)
+
+    for tmp_path, final_path in pending:
+        os.replace(tmp_path, final_path)
+
+    if STAGING_FSYNC:
+        directories = {run.path for run in runs} | {os.path.dirname(run.path) for run in runs}
+        for directory in directories:
+            _fsync(directory)
+
+    for run in runs:
+        run._pending = []
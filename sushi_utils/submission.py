@@ -0,0 +1,607 @@
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from rq import get_current_job
+from rq.exceptions import NoSuchJobError
+from rq.job import Job
+from bfabric_web_apps import SCRATCH_PATH
+from sushi_utils.journal import JOURNAL, JOURNAL_RETENTION, job_states, writer_alive
+from sushi_utils.pipeline import (
+    PIPELINE_POLL_INTERVAL,
+    advance_pipeline,
+    load_pipeline,
+    load_pipeline_state,
+    overdue_pipelines,
+    pipeline_status,
+    renew_check,
+    start_pipeline
+)
+
+SUBMISSION_QUEUE = "light"            # rq queue served by scripts/worker.py (--queues light,heavy)
+PIPELINE_QUEUE = "heavy"              # rq queue of pipeline starts and of the delayed checks of their stages (scripts/worker.py runs the scheduler)
+SUBMISSION_RESULT_TTL = 24 * 3600     # Seconds the status of a finished / failed submission stays queryable
+LOCAL_WORKERS = 4                     # Threads submitting jobs when Redis is not reachable
+LOCAL_MAX_RECORDS = 1000              # Upper bound for the submission records kept by the local fallback
+IDEMPOTENCY_WINDOW = 120              # Seconds an identical submission of the same session is treated as a duplicate
+SESSION_DIR = os.path.join(SCRATCH_PATH, ".sushi_runner_cache", "sessions")  # Session URL of every submission in flight (readable by the server's user only)
+SESSION_FIELDS = ("environment", "user_data", "jobId", "entityClass_data", "entity_id_data")  # Token data journaled with a submission (no credentials)
+
+
+######################################################################################################
+####################### Backends #####################################################################
+######################################################################################################
+
+@functools.lru_cache(maxsize=None)
+def get_queue(name=SUBMISSION_QUEUE):
+    """
+    Return an rq queue submissions are enqueued on, or None if Redis is not reachable.
+
+    The check is done once per process; without Redis, submissions run on a local thread pool
+    of the web server instead (still without blocking the request that submitted them).
+    """
+
+    try:
+        from bfabric_web_apps.utils.redis_queue import q
+        queue = q(name)
+        queue.connection.ping()
+        print(f"[SUSHI SUBMISSION]: enqueueing on rq queue '{name}'")
+        return queue
+    except Exception as e:
+        print(f"[SUSHI SUBMISSION]: Redis not available ({e}), submitting on a local thread pool")
+        return None
+
+
+_local_executor = ThreadPoolExecutor(max_workers=LOCAL_WORKERS, thread_name_prefix="sushi-submission")
+_local_records = OrderedDict()  # submission id -> {"app", "status", "stage", "error", "report"}
+_local_lock = threading.Lock()
+
+
+def _local_update(submission_id, **fields):
+    with _local_lock:
+        if submission_id in _local_records:
+            _local_records[submission_id].update(fields)
+
+
+def _run_local(submission_id, kwargs):
+    _local_update(submission_id, status="started")
+    try:
+        result = run_submission(submission_id, **kwargs)
+        _local_update(submission_id, status="finished", report=result if isinstance(result, dict) else None)
+    except Exception as e:
+        _local_update(submission_id, status="failed", error=str(e))
+
+
+######################################################################################################
+####################### Sessions #####################################################################
+######################################################################################################
+
+def redact_token(url):
+    """Return the URL search string of a session with its B-Fabric token replaced, to be journaled or shown."""
+
+    return re.sub(r"(token=)[^&#]*", r"\1<redacted>", url or "")
+
+
+def _session_path(submission_id):
+    return os.path.join(SESSION_DIR, f"{submission_id}.url")
+
+
+def keep_session(submission_id, url):
+    """
+    Keep the session URL of a submission until it ends, so a worker (or a restart) can run it.
+
+    The URL carries the B-Fabric token, so it is neither journaled nor enqueued: it is kept in a
+    file only the server's user can read, and deleted when the submission ends (see drop_session).
+    """
+
+    os.makedirs(SESSION_DIR, exist_ok=True)
+    path = _session_path(submission_id)
+    temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+    descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+        handle.write(url or "")
+    os.replace(temporary, path)
+
+
+def drop_session(submission_id):
+    """Delete the session URL of a submission that ended."""
+
+    try:
+        os.remove(_session_path(submission_id))
+    except OSError:
+        pass
+
+
+def _prune_sessions():
+    if not os.path.isdir(SESSION_DIR):
+        return
+    for file_name in os.listdir(SESSION_DIR):
+        path = os.path.join(SESSION_DIR, file_name)
+        try:
+            if time.time() - os.path.getmtime(path) > JOURNAL_RETENTION:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def resume_session(submission_id):
+    """
+    Return the session URL of a submission and its token data, validating the token with B-Fabric again.
+
+    Returns:
+        tuple: (url, token_data), both None if the URL was not kept or the token is no longer valid
+    """
+
+    from bfabric_web_apps import bfabric_interface
+
+    try:
+        with open(_session_path(submission_id), encoding="utf-8") as handle:
+            url = handle.read()
+    except OSError:
+        return None, None
+
+    token = "".join(url.split("token=")[1:])
+    raw = bfabric_interface.token_to_data(token)
+    if not raw or raw == "EXPIRED":
+        return None, None
+
+    token_data = json.loads(raw)
+    token_data["environment"] = str(token_data.get("environment", "")).strip().lower()
+    return url, token_data
+
+
+######################################################################################################
+####################### Submissions ##################################################################
+######################################################################################################
+
+def report_stage(submission_id, stage):
+    """Record the stage a running submission has reached (shown to the user while polling)."""
+
+    print(f"[SUSHI SUBMISSION {submission_id}]: {stage}")
+
+    with _local_lock:
+        if submission_id in _local_records:
+            _local_records[submission_id]["stage"] = stage
+            return
+
+    job = get_current_job()
+    if job is not None and job.id == submission_id:
+        job.meta["stage"] = stage
+        job.save_meta()
+
+
+def run_submission(submission_id, app_name, values, session, entity_data, app_data, url, charge_run, dataset_ids=None, reuse=False, delta=False, shards=1,
+                   pipeline=None, stage_values=None):
+    """
+    Submit the Sushi job of a spec app (executed by the rq worker or the local thread pool).
+
+    The job is enqueued without credentials (session holds the SESSION_FIELDS of the token data and
+    url is redacted); the session URL kept for the submission is validated again here, so a token
+    that expired in the meantime fails the submission instead of reaching B-Fabric.
+    Every job's state transitions and the outcome of the submission are journaled (see sushi_utils/journal.py).
+    A pipeline is only started here: its first stage is submitted and the check of its output
+    scheduled (see check_pipeline); the submission ends with the last stage.
+
+    Returns:
+        True for a single job, the aggregated report of submit_batch() / submit_sharded() for a batch or
+        sharded job, and for a pipeline its report if it ended right away (None while its stages run).
+
+    Raises:
+        RuntimeError: If the job (or every job of a batch or sharded job, or the first stage of a pipeline)
+            could not be submitted, so the submission is marked as failed.
+    """
+
+    journal = functools.partial(JOURNAL.append, submission_id)
+    try:
+        url, token_data = resume_session(submission_id)
+        if token_data is None or token_data.get("jobId") != session.get("jobId"):
+            raise RuntimeError("The B-Fabric session of the submission expired, open the app from B-Fabric again to submit")
+        if pipeline:
+            state = start_pipeline(
+                submission_id, load_pipeline(pipeline), values, token_data, entity_data, app_data, url, charge_run,
+                stage_values=stage_values, reuse=reuse, journal=journal
+            )
+        else:
+            result = _submit(
+                submission_id, journal, app_name, values, token_data, entity_data, app_data, url, charge_run, dataset_ids, reuse, delta, shards
+            )
+    except Exception as e:
+        journal("failed", error=str(e))
+        release_claim(submission_id)
+        drop_session(submission_id)
+        raise
+
+    if pipeline:
+        # The pipeline's state keeps the session URL from here on
+        drop_session(submission_id)
+        report = _follow_pipeline(submission_id, state)
+        if report is not None and not report["done"]:
+            raise RuntimeError(report["summary"])
+        return report
+
+    journal("finished")
+    drop_session(submission_id)
+    return result
+
+
+def _submit(submission_id, journal, app_name, values, token_data, entity_data, app_data, url, charge_run, dataset_ids, reuse, delta, shards):
+    from sushi_utils.spec_engine import load_spec, submit_job, submit_batch, submit_sharded
+
+    progress = lambda stage: report_stage(submission_id, stage)
+
+    if dataset_ids:
+        report = submit_batch(
+            load_spec(app_name), values, dataset_ids, token_data, app_data, url, charge_run, progress=progress, reuse=reuse, delta=delta, journal=journal
+        )
+        if not report["submitted"] and not report["reused"]:
+            raise RuntimeError(f"None of the {len(dataset_ids)} {app_name} jobs could be submitted")
+        return report
+
+    if shards > 1 and load_spec(app_name).get("shardable"):
+        report = submit_sharded(
+            load_spec(app_name), values, shards, token_data, entity_data, app_data, url, charge_run, progress=progress, reuse=reuse, journal=journal
+        )
+        if not report["submitted"] and not report["reused"]:
+            raise RuntimeError(f"None of the {shards} {app_name} shards could be submitted")
+        return report
+
+    submitted = submit_job(
+        load_spec(app_name), values, token_data, entity_data, app_data, url, charge_run,
+        progress=progress, reuse=reuse, delta=delta, journal=journal
+    )
+
+    if not submitted:
+        raise RuntimeError(f"Submission of the {app_name} job failed")
+    return True
+
+
+######################################################################################################
+####################### Pipelines ####################################################################
+######################################################################################################
+
+def schedule_pipeline_check(submission_id, check, delay=PIPELINE_POLL_INTERVAL):
+    """
+    Schedule the next check of a pipeline's stages (see check_pipeline) in delay seconds.
+
+    With Redis, the check is a delayed job on PIPELINE_QUEUE, so no worker is occupied while the
+    stages run; otherwise a timer of the web server runs it.
+    """
+
+    queue = get_queue(PIPELINE_QUEUE)
+    if queue is not None:
+        try:
+            queue.enqueue_in(
+                timedelta(seconds=delay),
+                check_pipeline,
+                kwargs={"submission_id": submission_id, "check": check},
+                description=f"Sushi pipeline {submission_id[:8]} check",
+                result_ttl=SUBMISSION_RESULT_TTL,
+                failure_ttl=SUBMISSION_RESULT_TTL
+            )
+            return
+        except Exception as e:
+            print(f"[SUSHI SUBMISSION]: scheduling the pipeline check failed ({e}), checking locally")
+
+    timer = threading.Timer(delay, check_pipeline, kwargs={"submission_id": submission_id, "check": check})
+    timer.daemon = True
+    timer.start()
+
+
+def _follow_pipeline(submission_id, state):
+    """Schedule the next check of a pipeline, or journal its end; return its report (None while it runs or if the check was stale)."""
+
+    if state is None:
+        return None
+    if state["report"] is None:
+        schedule_pipeline_check(submission_id, state["check"])
+        return None
+
+    report = state["report"]
+    if report["done"]:
+        JOURNAL.append(submission_id, "finished")
+    else:
+        JOURNAL.append(submission_id, "failed", error=report["summary"])
+        release_claim(submission_id)
+    return report
+
+
+def check_pipeline(submission_id, check):
+    """
+    Check the running stages of a pipeline once, submit the stages that became ready and schedule
+    the next check (executed by the rq worker or a timer of the web server).
+
+    A check that fails (B-Fabric or the state unreachable) is retried after PIPELINE_POLL_INTERVAL
+    with the same token; stages still count as failed after their timeout.
+    """
+
+    try:
+        state = advance_pipeline(submission_id, check, journal=functools.partial(JOURNAL.append, submission_id))
+    except Exception as e:
+        print(f"[SUSHI SUBMISSION]: checking pipeline {submission_id} failed: {e}")
+        schedule_pipeline_check(submission_id, check)
+        return None
+
+    return _follow_pipeline(submission_id, state)
+
+
+def release_claim(submission_id):
+    """Release the idempotency claim of a failed submission (see ledger.claim), so that its settings can be submitted again at once."""
+
+    from sushi_utils.ledger import LEDGER
+
+    try:
+        LEDGER.release(submission_id)
+    except Exception as e:
+        print(f"[SUSHI LEDGER]: releasing the claim of {submission_id} failed:", str(e))
+
+
+def submission_key(token_data, app_name, entity_data, values, **options):
+    """
+    Return the idempotency key of a submission: the session, the app, the entity and the canonical
+    parameters, along with the submission options (batch, reuse, delta, shards, pipeline).
+
+    Two clicks on Submit, or a retried request, with the same settings in the same session share
+    the key; changing any parameter or option gives a new one.
+    """
+
+    from sushi_utils.parameters import parameters_digest
+
+    token_data = token_data or {}
+    content = json.dumps(
+        {
+            "session": [token_data.get("environment"), token_data.get("user_data"), token_data.get("jobId")],
+            "app": app_name,
+            "entity": [(entity_data or {}).get("entity_class"), (entity_data or {}).get("entity_id")],
+            "parameters": parameters_digest(values),
+            "options": options
+        },
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def enqueue_submission(app_name, values, token_data, entity_data, app_data, url, charge_run, dataset_ids=None, reuse=False, delta=False, shards=1,
+                       pipeline=None, stage_values=None, submission_id=None):
+    """
+    Hand the submission of a Sushi job (or of a batch of jobs, or a pipeline) to the background executor and return at once.
+
+    Pipelines go to PIPELINE_QUEUE, where their start and the delayed checks of their stages run
+    (see check_pipeline). The submission is journaled before it is enqueued, so that it can be
+    resumed after a crash (see recover_submissions). Neither the journal nor the rq job hold the
+    token: only the SESSION_FIELDS of the token data and the redacted URL, while the URL itself is
+    kept apart until the submission ends (see keep_session).
+
+    Args:
+        app_name (str): The spec name of the app
+        values (dict): Field values by key
+        token_data (dict): Token metadata of the session
+        entity_data (dict): The (slim) entity data of the session
+        app_data (dict): Application metadata
+        url (str): The URL search string holding the B-Fabric token
+        charge_run (bool): Whether the project should be charged
+        dataset_ids (list, optional): Submit the job for each of these datasets instead of the entity's
+        reuse (bool): Reuse identical earlier runs (see sushi_utils/ledger.py) instead of submitting again
+        delta (bool): Only submit the samples added or changed since the last run of the same settings
+        shards (int): Split the job into this many parallel jobs (ignored for batches, takes precedence over delta)
+        pipeline (str, optional): Run this pipeline (see sushi_utils/pipeline.py) starting with this job (takes precedence over the rest)
+        stage_values (dict, optional): Field values of the pipeline's stages by stage name (see "ask" in the pipeline YAML)
+        submission_id (str, optional): The ID to use (one is generated if missing)
+
+    Returns:
+        str: The submission ID, to be passed to submission_status()
+    """
+
+    submission_id = submission_id or uuid.uuid4().hex
+    kwargs = {
+        "app_name": app_name,
+        "values": values,
+        "session": {field: (token_data or {}).get(field) for field in SESSION_FIELDS},
+        "entity_data": entity_data,
+        "app_data": app_data,
+        "url": redact_token(url),
+        "charge_run": charge_run,
+        "dataset_ids": dataset_ids,
+        "reuse": reuse,
+        "delta": delta,
+        "shards": shards,
+        "pipeline": pipeline,
+        "stage_values": stage_values
+    }
+    keep_session(submission_id, url)
+    JOURNAL.append(submission_id, "queued", app=app_name, kwargs=kwargs)
+    _dispatch(submission_id, kwargs)
+    return submission_id
+
+
+def _dispatch(submission_id, kwargs):
+    app_name, pipeline = kwargs["app_name"], kwargs["pipeline"]
+    queue = get_queue(PIPELINE_QUEUE if pipeline else SUBMISSION_QUEUE)
+    if queue is not None:
+        try:
+            queue.enqueue(
+                run_submission,
+                kwargs={"submission_id": submission_id, **kwargs},
+                job_id=submission_id,
+                meta={"app": app_name, "stage": "Waiting for a worker"},
+                description=f"Sushi {pipeline or app_name} submission",
+                result_ttl=SUBMISSION_RESULT_TTL,
+                failure_ttl=SUBMISSION_RESULT_TTL
+            )
+            return
+        except Exception as e:
+            print(f"[SUSHI SUBMISSION]: enqueueing failed ({e}), submitting locally")
+
+    with _local_lock:
+        _local_records[submission_id] = {"app": app_name, "status": "queued", "stage": "Waiting for a worker", "error": None, "report": None}
+        while len(_local_records) > LOCAL_MAX_RECORDS:
+            _local_records.popitem(last=False)
+
+    _local_executor.submit(_run_local, submission_id, kwargs)
+
+
+def submission_status(submission_id):
+    """
+    Return the status of a submission.
+
+    Args:
+        submission_id (str): The ID returned by enqueue_submission()
+
+    Returns:
+        dict or None: {"id", "app", "status", "stage", "error", "report"}, where status is one of
+        "queued", "started", "finished" or "failed" and report is the aggregated report of a
+        finished batch, sharded job or pipeline; None if the submission is unknown (or expired).
+    """
+
+    # A started pipeline outlives the job that started it
+    status = pipeline_status(submission_id)
+    if status is not None:
+        return status
+
+    with _local_lock:
+        record = _local_records.get(submission_id)
+        if record is not None:
+            return {"id": submission_id, **record}
+
+    queue = get_queue()
+    if queue is None:
+        return None
+
+    try:
+        job = Job.fetch(submission_id, connection=queue.connection)
+    except NoSuchJobError:
+        return None
+
+    status = job.get_status()
+    status = status.value if hasattr(status, "value") else str(status)
+    if status not in ("queued", "started", "finished", "failed"):
+        status = "failed" if status in ("stopped", "canceled") else "queued"
+
+    error = None
+    if status == "failed" and job.exc_info:
+        error = job.exc_info.strip().splitlines()[-1]
+
+    return {
+        "id": submission_id,
+        "app": job.meta.get("app"),
+        "status": status,
+        "stage": job.meta.get("stage"),
+        "error": error,
+        "report": job.result if status == "finished" and isinstance(job.result, dict) else None
+    }
+
+
+######################################################################################################
+####################### Recovery #####################################################################
+######################################################################################################
+
+def _known_to_rq(submission_id):
+    queue = get_queue()
+    if queue is None:
+        return False
+    try:
+        Job.fetch(submission_id, connection=queue.connection)
+        return True
+    except NoSuchJobError:
+        return False
+
+
+def recover_submissions():
+    """
+    Replay the journal after a restart and resume or report the submissions a crash interrupted.
+
+    A submission none of whose jobs was dispatched is enqueued again under its ID, after the runs
+    it staged (never seen by Sushi) are removed. One with accepted jobs is reported as interrupted,
+    as the ledger only reuses runs B-Fabric shows available, and resuming would submit those jobs
+    again; so is one with a job dispatched without an outcome, which may or may not have reached
+    Sushi, rather than risking a duplicate job. Submissions rq still knows (which reports them itself),
+    or whose last writer still runs, are left alone; the others are claimed in the ledger first,
+    so that of several server processes starting together only one acts on each. A submission is
+    only resumed while the B-Fabric token of its session is still valid.
+
+    Started pipelines are followed by their own checks instead; those whose next check is overdue
+    (a timer lost with the restart, or no rq scheduler running) get a new one.
+
+    Returns:
+        dict: {"resumed": [submission IDs], "interrupted": {submission ID: reason}}
+    """
+
+    from sushi_utils.ledger import LEDGER
+
+    report = {"resumed": [], "interrupted": {}}
+    _prune_sessions()
+    try:
+        in_flight = JOURNAL.in_flight()
+    except Exception as e:
+        print("[SUSHI JOURNAL]: replay failed:", str(e))
+        return report
+
+    for submission_id, records in in_flight.items():
+        if writer_alive(records[-1]) or _known_to_rq(submission_id) or load_pipeline_state(submission_id) is not None:
+            continue
+
+        queued = next((record for record in reversed(records) if record["state"] == "queued"), None)
+        app_name = queued["app"] if queued else None
+        try:
+            if LEDGER.claim(f'recover:{submission_id}:{records[-1]["time"]}', app_name or "", submission_id, JOURNAL_RETENTION, count=False):
+                continue
+        except Exception as e:
+            print(f"[SUSHI JOURNAL]: claiming {submission_id} failed:", str(e))
+            continue
+
+        jobs = job_states(records).values()
+        in_doubt = [job["job"] for job in jobs if job["state"] == "dispatched"]
+        accepted = [job["job"] for job in jobs if job["state"] == "accepted"]
+
+        if queued is None or "session" not in queued.get("kwargs", {}):
+            reason = "its settings were not journaled"
+        elif in_doubt:
+            reason = f'{", ".join(in_doubt)} may or may not have reached Sushi, check the workunits before submitting again'
+        elif accepted:
+            reason = f'{", ".join(accepted)} had already been submitted'
+        elif resume_session(submission_id)[1] is None:
+            reason = "its B-Fabric session expired, open the app from B-Fabric again to submit"
+        else:
+            reason = None
+
+        if reason:
+            reason = f"Interrupted by a restart: {reason}"
+            JOURNAL.append(submission_id, "interrupted", error=reason)
+            release_claim(submission_id)
+            drop_session(submission_id)
+            with _local_lock:
+                _local_records[submission_id] = {"app": app_name, "status": "failed", "stage": None, "error": reason, "report": None}
+            print(f"[SUSHI JOURNAL]: {app_name} submission {submission_id}: {reason}")
+            report["interrupted"][submission_id] = reason
+            continue
+
+        for job in jobs:
+            if job["state"] == "staged":
+                shutil.rmtree(job["run_path"], ignore_errors=True)
+
+        JOURNAL.append(submission_id, "resumed")
+        _dispatch(submission_id, queued["kwargs"])
+        print(f"[SUSHI JOURNAL]: resumed {app_name} submission {submission_id} ({len(accepted)} jobs already accepted)")
+        report["resumed"].append(submission_id)
+
+    for submission_id in overdue_pipelines():
+        try:
+            # A new token retires the overdue check, should it still run
+            check = renew_check(submission_id)
+        except Exception as e:
+            print(f"[SUSHI JOURNAL]: resuming pipeline {submission_id} failed:", str(e))
+            continue
+        if check:
+            JOURNAL.append(submission_id, "resumed")
+            schedule_pipeline_check(submission_id, check, delay=0)
+            print(f"[SUSHI JOURNAL]: resumed the checks of pipeline {submission_id}")
+            report["resumed"].append(submission_id)
+
+    return report
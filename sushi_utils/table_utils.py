@@ -0,0 +1,229 @@
+import math
+import polars as pl
+from dash import ctx, html, no_update
+from dash.dash_table import DataTable
+from dash.dependencies import Input, Output, State
+from generic.callbacks import app
+from sushi_utils.dataset_cache import get_dataset_frame
+
+PAGE_SIZE = 15
+
+# Operators of the DataTable filter syntax, longest first so that ">=" is not read as ">"
+FILTER_OPERATORS = [
+    ["ge ", ">="],
+    ["le ", "<="],
+    ["lt ", "<"],
+    ["gt ", ">"],
+    ["ne ", "!="],
+    ["eq ", "="],
+    ["contains "],
+    ["datestartswith "]
+]
+
+
+def dataset_summary(entity_data):
+    """
+    Summarise the cached dataset of a session for the browser (column names and row count only).
+
+    Args:
+        entity_data (dict): The (slim) entity data from the 'entity' store
+
+    Returns:
+        dict: {"columns": list of column names, "rows": number of rows}, or {} if there is no dataset
+    """
+
+    frame = get_dataset_frame(entity_data)
+
+    if not frame.width:
+        return {}
+
+    return {"columns": frame.columns, "rows": frame.height}
+
+
+def dataset_table(summary):
+    """
+    Build the dataset DataTable. Rows are not embedded; the visible page is served by page_dataset_table.
+
+    Args:
+        summary (dict): Dataset summary as returned by dataset_summary
+
+    Returns:
+        html.Div: The table with its heading, or a placeholder if no dataset is loaded
+    """
+
+    if not summary or not summary.get("columns"):
+        return html.Div("No dataset loaded")
+
+    table = DataTable(
+        id='datatable',
+        data=[],
+        columns=[{"name": i, "id": i} for i in summary["columns"]],
+        page_action="custom",
+        sort_action="custom",
+        sort_mode="multi",
+        filter_action="custom",
+        filter_query="",
+        sort_by=[],
+        page_current=0,
+        page_size=PAGE_SIZE,
+        page_count=max(1, math.ceil(summary.get("rows", 0) / PAGE_SIZE)),
+        style_data={
+            'whiteSpace': 'normal',
+            'height': 'auto'
+        },
+        style_table={
+            'overflowX': 'auto',
+            'maxWidth': '90%'
+        },
+        style_cell={
+            'textAlign': 'left',
+            'padding': '5px',
+            'whiteSpace': 'normal',
+            'height': 'auto',
+            'fontSize': '0.85rem',
+            'font-family': 'Arial',
+            'border': '1px solid lightgrey'
+        },
+        style_header={
+            'backgroundColor': 'rgb(230, 230, 230)',
+            'fontWeight': 'bold'
+        }
+    )
+
+    return html.Div([
+        html.H4("Dataset"),
+        table
+    ])
+
+
+def split_filter_part(filter_part):
+    """
+    Split one clause of a DataTable filter query into (column, operator, value).
+
+    Args:
+        filter_part (str): A single clause, e.g. "{Read Count} ge 1000"
+
+    Returns:
+        tuple: (column name, operator, value), or (None, None, None) if the clause is not understood
+    """
+
+    for operator_type in FILTER_OPERATORS:
+        for operator in operator_type:
+            if operator in filter_part:
+                name_part, value_part = filter_part.split(operator, 1)
+                name = name_part[name_part.find('{') + 1: name_part.rfind('}')]
+
+                value_part = value_part.strip()
+                v0 = value_part[0] if value_part else ""
+                if v0 and v0 == value_part[-1] and v0 in ("'", '"', '`'):
+                    value = value_part[1: -1].replace('\\' + v0, v0)
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+
+                # word operators need spaces after them in the filter string,
+                # but we don't want these later
+                return name, operator_type[0].strip(), value
+
+    return None, None, None
+
+
+def _filter_expression(column, operator, value):
+    """Translate one filter clause into a polars expression on a string column."""
+
+    col = pl.col(column)
+
+    if operator == "contains":
+        return col.str.contains(str(value), literal=True)
+    if operator == "datestartswith":
+        return col.str.starts_with(str(value))
+
+    # Numeric comparisons compare numerically, everything else compares as text
+    if isinstance(value, float):
+        col = col.cast(pl.Float64, strict=False)
+    else:
+        value = str(value)
+
+    return {
+        "eq": col == value,
+        "ne": col != value,
+        "lt": col < value,
+        "le": col <= value,
+        "gt": col > value,
+        "ge": col >= value
+    }[operator]
+
+
+def _sort_expression(frame, column):
+    """Sort numerically if every value of the (string) column is a number, otherwise as text."""
+
+    numeric = frame[column].cast(pl.Float64, strict=False)
+    if numeric.null_count() == frame[column].null_count():
+        return pl.col(column).cast(pl.Float64, strict=False)
+    return pl.col(column)
+
+
+def query_dataset(frame, page_current, page_size, sort_by, filter_query):
+    """
+    Filter, sort and page a dataset frame.
+
+    Args:
+        frame (pl.DataFrame): The full dataset
+        page_current (int): Zero-based index of the requested page
+        page_size (int): Rows per page
+        sort_by (list): DataTable sort_by ([{"column_id": ..., "direction": "asc" | "desc"}])
+        filter_query (str): DataTable filter query
+
+    Returns:
+        tuple: (list of row dicts of the requested page, number of pages)
+    """
+
+    for filter_part in (filter_query or "").split(" && "):
+        column, operator, value = split_filter_part(filter_part)
+        if column in frame.columns:
+            frame = frame.filter(_filter_expression(column, operator, value))
+
+    sort_by = [elt for elt in (sort_by or []) if elt.get("column_id") in frame.columns]
+    if sort_by:
+        frame = frame.sort(
+            [_sort_expression(frame, elt["column_id"]) for elt in sort_by],
+            descending=[elt["direction"] == "desc" for elt in sort_by],
+            nulls_last=True
+        )
+
+    page_size = page_size or PAGE_SIZE
+    page_count = max(1, math.ceil(frame.height / page_size))
+    page = frame.slice((page_current or 0) * page_size, page_size)
+
+    return page.to_dicts(), page_count
+
+
+@app.callback(
+    [
+        Output("datatable", "data"),
+        Output("datatable", "page_count"),
+        Output("datatable", "page_current"),
+    ],
+    [
+        Input("datatable", "page_current"),
+        Input("datatable", "page_size"),
+        Input("datatable", "sort_by"),
+        Input("datatable", "filter_query"),
+    ],
+    [
+        State("entity", "data")
+    ]
+)
+def page_dataset_table(page_current, page_size, sort_by, filter_query, entity_data):
+    """
+    Serve only the visible page of the dataset table from the server-side dataset cache.
+
+    A new filter or sort order starts again from the first page, which the table is moved to.
+    """
+
+    if {"datatable.sort_by", "datatable.filter_query"} & set(ctx.triggered_prop_ids):
+        return (*query_dataset(get_dataset_frame(entity_data), 0, page_size, sort_by, filter_query), 0)
+
+    return (*query_dataset(get_dataset_frame(entity_data), page_current, page_size, sort_by, filter_query), no_update)
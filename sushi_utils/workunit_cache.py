@@ -0,0 +1,242 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+import dash_bootstrap_components as dbc
+from dash import dcc, html
+from bfabric_web_apps import bfabric_interface
+
+WORKUNIT_PAGE_SIZE = 24            # Workunit cards per page of the workunits tab
+WORKUNIT_LATENCY_BUDGET = 1.0      # Seconds the tab waits for a sync before it renders what is cached so far
+WORKUNIT_SYNC_INTERVAL = 30        # Seconds a synced workunit list is served as is (the refresh button syncs at once)
+WORKUNIT_READ_CHUNK = 100          # Workunit IDs per B-Fabric read (one page of results)
+WORKUNIT_CLOCK_SKEW = 300          # Seconds subtracted from the sync time for modifiedafter (the B-Fabric clock differs from ours)
+WORKUNIT_CACHE_MAX_USERS = 256     # Workunit lists kept per server process (least recently used evicted first)
+WORKUNIT_POLL_MS = 1000            # Milliseconds between two redraws of the tab while a sync is running
+WORKUNIT_FINAL_STATUSES = ("available", "failed", "deleted")  # Workunits in these states are not re-read
+
+# The workunit pages of each B-Fabric instance (as in bfabric_web_apps.populate_workunit_details)
+WORKUNIT_URLS = {
+    "test": "https://fgcz-bfabric-test.uzh.ch/bfabric/workunit/show.html?id=",
+    "production": "https://fgcz-bfabric.uzh.ch/bfabric/workunit/show.html?id="
+}
+
+
+def workunit_key(token_data):
+    """Return the cache key of a user's workunit list: (environment, user, jobId)."""
+
+    return (str(token_data.get("environment", "test")).lower(), token_data.get("user_data"), token_data.get("jobId"))
+
+
+def summarize_workunit(workunit):
+    """Reduce a workunit API response to the fields shown on its card (resource lists can be long)."""
+
+    return {
+        "id": int(workunit["id"]),
+        "name": workunit.get("name", "n/a"),
+        "description": workunit.get("description", "n/a"),
+        "resources": len(workunit.get("resource", [])),
+        "created": workunit.get("created", "n/a"),
+        "status": workunit.get("status", "n/a")
+    }
+
+
+class WorkunitCache:
+    """
+    Thread-safe, per-user cache of the workunits listed on the workunits tab.
+
+    A sync reads the job's workunit IDs, fetches only the workunits not cached yet (newest first, so
+    the first page is complete after the first read) and re-reads the cached workunits that are not in
+    a final state with modifiedafter set to the previous sync. Syncs run in a background thread, one at
+    a time per user; callbacks wait for a sync at most WORKUNIT_LATENCY_BUDGET seconds and otherwise
+    render the cached pages while the sync goes on.
+    """
+
+    def __init__(self, read_wrapper=None, max_users=WORKUNIT_CACHE_MAX_USERS, sync_interval=WORKUNIT_SYNC_INTERVAL):
+        self._read_wrapper = read_wrapper or bfabric_interface.get_wrapper
+        self.max_users = max_users
+        self.sync_interval = sync_interval
+        self._users = OrderedDict()  # key -> {"ids", "workunits", "since", "synced", "syncing", "error"}
+        self._lock = threading.Lock()
+        self.reads = 0
+
+    def _entry(self, key):
+        entry = self._users.get(key)
+        if entry is None:
+            entry = {"ids": None, "workunits": {}, "since": None, "synced": 0.0, "syncing": None, "error": None}
+            self._users[key] = entry
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        self._users.move_to_end(key)
+        return entry
+
+    def sync(self, token_data, force=False):
+        """
+        Start a sync of the user's workunits unless one runs already or the list is fresh.
+
+        Returns:
+            threading.Event: Set once the sync (or the one already running) finished
+        """
+
+        key = workunit_key(token_data)
+        with self._lock:
+            entry = self._entry(key)
+            if entry["syncing"] is not None:
+                return entry["syncing"]
+
+            done = threading.Event()
+            if not force and entry["ids"] is not None and time.time() - entry["synced"] < self.sync_interval:
+                done.set()
+                return done
+
+            entry["syncing"] = done
+
+        threading.Thread(target=self._sync, args=(key, entry, token_data.get("jobId"), done), name="sushi-workunits", daemon=True).start()
+        return done
+
+    def _read(self, B, endpoint, obj):
+        self.reads += 1
+        return B.read(endpoint, obj, max_results=None)
+
+    def _sync(self, key, entry, job_id, done):
+        started = time.time()
+        try:
+            B = self._read_wrapper()
+            job = self._read(B, "job", {"id": job_id})
+            ids = sorted({int(workunit["id"]) for workunit in (job[0].get("workunit", []) if job else [])}, reverse=True)
+
+            with self._lock:
+                cached = entry["workunits"]
+                for workunit_id in set(cached) - set(ids):
+                    del cached[workunit_id]
+                missing = [workunit_id for workunit_id in ids if workunit_id not in cached]
+                active = [
+                    workunit_id for workunit_id, workunit in cached.items()
+                    if str(workunit["status"]).lower() not in WORKUNIT_FINAL_STATUSES
+                ]
+                since = entry["since"]
+                entry["ids"] = ids
+
+            for start in range(0, len(missing), WORKUNIT_READ_CHUNK):
+                self._store(entry, self._read(B, "workunit", {"id": missing[start:start + WORKUNIT_READ_CHUNK]}))
+
+            if since is not None:
+                for start in range(0, len(active), WORKUNIT_READ_CHUNK):
+                    chunk = active[start:start + WORKUNIT_READ_CHUNK]
+                    self._store(entry, self._read(B, "workunit", {"id": chunk, "modifiedafter": since}))
+
+            with self._lock:
+                entry["since"] = datetime.fromtimestamp(started - WORKUNIT_CLOCK_SKEW).strftime("%Y-%m-%dT%H:%M:%S")
+                entry["synced"] = time.time()
+                entry["error"] = None
+            print(f"[SUSHI WORKUNITS]: synced {len(ids)} workunits of job {job_id} ({len(missing)} new, {len(active)} active) in {time.time() - started:.2f}s")
+        except Exception as e:
+            with self._lock:
+                entry["error"] = str(e)
+            print(f"[SUSHI WORKUNITS]: sync of job {job_id} failed: {e}")
+        finally:
+            with self._lock:
+                entry["syncing"] = None
+            done.set()
+
+    def _store(self, entry, workunits):
+        with self._lock:
+            for workunit in workunits:
+                entry["workunits"][int(workunit["id"])] = summarize_workunit(workunit)
+
+    def page(self, token_data, page=1, page_size=WORKUNIT_PAGE_SIZE):
+        """
+        Return one page of the user's cached workunits, newest first.
+
+        Returns:
+            dict: {"workunits" (summaries of the page, None for IDs not fetched yet), "pages", "total",
+            "loaded", "syncing", "error"}; total is None before the first sync read the job
+        """
+
+        with self._lock:
+            entry = self._entry(workunit_key(token_data))
+            ids = entry["ids"] or []
+            pages = max(1, math.ceil(len(ids) / page_size))
+            page = min(max(1, page or 1), pages)
+            return {
+                "workunits": [entry["workunits"].get(workunit_id) for workunit_id in ids[(page - 1) * page_size:page * page_size]],
+                "page": page,
+                "pages": pages,
+                "total": None if entry["ids"] is None else len(ids),
+                "loaded": sum(workunit_id in entry["workunits"] for workunit_id in ids),
+                "syncing": entry["syncing"] is not None,
+                "error": entry["error"]
+            }
+
+
+def workunit_card(workunit, environment):
+    """Render a workunit summary as the card bfabric_web_apps shows, linked to its B-Fabric page."""
+
+    return html.A(
+        dbc.Card([
+            dbc.CardHeader(html.B(f"Workunit {workunit['id']}")),
+            dbc.CardBody([
+                html.P(f"Name: {workunit['name']}"),
+                html.P(f"Description: {workunit['description']}"),
+                html.P(f"Num Resources: {workunit['resources']}"),
+                html.P(f"Created: {workunit['created']}"),
+                html.P(f"Status: {workunit['status']}")
+            ])
+        ], style={"width": "400px", "margin": "10px"}),
+        href=WORKUNIT_URLS.get(str(environment).lower(), WORKUNIT_URLS["test"]) + str(workunit["id"]),
+        target="_blank",
+        style={"text-decoration": "none"}
+    )
+
+
+def workunit_page(token_data, page=1, cache=None):
+    """
+    Render one page of the workunits tab from the cache.
+
+    Returns:
+        tuple: (cards, number of pages, status line, whether the redraw interval can be disabled)
+    """
+
+    state = (cache or WORKUNITS).page(token_data, page)
+    environment = token_data.get("environment", "test")
+    cards = [workunit_card(workunit, environment) for workunit in state["workunits"] if workunit is not None]
+
+    if state["error"] and not cards:
+        status = f"Workunits unavailable: {state['error']}"
+    elif state["total"] is None:
+        status = "Loading workunits..."
+    elif state["total"] == 0:
+        status = "No workunits found for the current job."
+    elif state["loaded"] < state["total"]:
+        status = f"Loading workunits: {state['loaded']} of {state['total']}"
+    else:
+        status = f"{state['total']} workunits"
+
+    return dbc.Container(cards, style={"display": "flex", "flex-wrap": "wrap"}), state["pages"], status, not state["syncing"]
+
+
+def workunit_layout(token_data, force=False, cache=None, budget=WORKUNIT_LATENCY_BUDGET):
+    """
+    Render the workunits tab: pagination, the first page and a redraw interval that runs while the sync does.
+
+    Starts a sync of the user's workunits and waits for it at most budget seconds, so the first page is
+    returned in bounded time whatever the size of the user's workunit history.
+    """
+
+    if not token_data:
+        return html.Div()
+
+    cache = cache or WORKUNITS
+    cache.sync(token_data, force=force).wait(budget)
+    cards, pages, status, idle = workunit_page(token_data, 1, cache)
+
+    return html.Div([
+        html.P(status, id="workunits-sync-status", className="text-muted"),
+        dbc.Pagination(id="workunits-page", max_value=pages, active_page=1, fully_expanded=False, first_last=True, previous_next=True),
+        html.Div(cards, id="workunits-page-content"),
+        dcc.Interval(id="workunits-sync", interval=WORKUNIT_POLL_MS, disabled=idle)
+    ])
+
+
+WORKUNITS = WorkunitCache()
@@ -0,0 +1,18 @@
+import os
+import sys
+
+# The modules are imported from the repository root (as index.py and scripts/ do)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_dataset(rows, columns=("Name", "Read Count")):
+    """A B-Fabric API Dataset Response with one item per row (a list of values in column order)."""
+
+    return {
+        "id": 1,
+        "attribute": [{"name": name, "position": position} for position, name in enumerate(columns, start=1)],
+        "item": [
+            {"field": [{"attributeposition": str(position), "value": value} for position, value in enumerate(row, start=1)]}
+            for row in rows
+        ]
+    }
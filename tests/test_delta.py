@@ -0,0 +1,37 @@
+from conftest import make_dataset
+from sushi_utils.delta import dataset_row_hashes, merge_manifest, plan_delta, snapshot_rows
+
+
+def test_plan_delta_sorts_samples_by_change():
+    before = dataset_row_hashes(make_dataset([["a", "10"], ["b", "20"], ["c", "30"]]))
+    snapshot = {"name": "run1", "run_path": "/runs/1", "rows": snapshot_rows(before, "/runs/1", "run1")}
+    current = dataset_row_hashes(make_dataset([["a", "10"], ["b", "21"], ["d", "40"]]))
+
+    assert plan_delta(current, snapshot) == {"new": ["d"], "changed": ["b"], "unchanged": ["a"], "removed": ["c"]}
+
+
+def test_unchanged_dataset_has_nothing_to_submit():
+    rows = dataset_row_hashes(make_dataset([["a", "10"], ["b", "20"]]))
+    snapshot = {"rows": snapshot_rows(rows, "/runs/1", "run1")}
+
+    plan = plan_delta(rows, snapshot)
+    assert plan["new"] == plan["changed"] == plan["removed"] == []
+    assert plan["unchanged"] == ["a", "b"]
+
+
+def test_samples_are_identified_by_the_name_column():
+    rows = dataset_row_hashes(make_dataset([["10", "a"], ["20", "b"]], columns=("Read Count", "Name")))
+    assert sorted(rows) == ["a", "b"]
+
+
+def test_unchanged_samples_stay_with_the_run_holding_them():
+    before = dataset_row_hashes(make_dataset([["a", "10"], ["b", "20"]]))
+    snapshot = {"name": "run1", "run_path": "/runs/1", "rows": snapshot_rows(before, "/runs/1", "run1")}
+    current = dataset_row_hashes(make_dataset([["a", "10"], ["b", "21"], ["c", "30"]]))
+    plan = plan_delta(current, snapshot)
+
+    rows = snapshot_rows(current, "/runs/2", "run2", snapshot, plan)
+    assert {sample: row["run"] for sample, row in rows.items()} == {"a": "/runs/1", "b": "/runs/2", "c": "/runs/2"}
+
+    manifest = merge_manifest("STAR", 1, "run2", "SAMPLE", snapshot, plan, rows)
+    assert sorted(sample for entry in manifest["merge"] for sample in entry["samples"]) == ["a", "b", "c"]
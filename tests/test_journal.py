@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+import fakeredis
+import pytest
+from rq import Queue
+import bfabric_web_apps
+import sushi_utils.journal as journal_module
+import sushi_utils.ledger as ledger_module
+import sushi_utils.submission as submission
+from sushi_utils.journal import SubmissionJournal, job_states
+from sushi_utils.ledger import SubmissionLedger
+
+SESSION = {"environment": "test", "user_data": "user", "jobId": 7, "entityClass_data": "Dataset", "entity_id_data": 1}
+
+
+def test_group_commit_makes_every_record_durable_with_fewer_fsyncs(tmp_path, monkeypatch):
+    fsyncs = []
+    fsync = os.fsync
+
+    def slow_fsync(fd):
+        fsyncs.append(fd)
+        time.sleep(0.01)
+        fsync(fd)
+
+    monkeypatch.setattr(journal_module.os, "fsync", slow_fsync)
+    journal = SubmissionJournal(str(tmp_path))
+    threads = [threading.Thread(target=journal.append, args=(f"s{i}", "queued")) for i in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(journal.replay()) == sorted(f"s{i}" for i in range(40))
+    assert 0 < len(fsyncs) < 40
+
+
+def test_replay_skips_torn_records_and_in_flight_excludes_finished(tmp_path):
+    journal = SubmissionJournal(str(tmp_path))
+    journal.append("done", "queued")
+    journal.append("done", "staged", job="a", run_path="/runs/a")
+    journal.append("done", "failed", job="a", run_path="/runs/a")
+    journal.append("done", "finished")
+    journal.append("open", "queued")
+    journal.append("open", "staged", job="b", run_path="/runs/b")
+    journal.append("open", "dispatched", job="b", run_path="/runs/b")
+    with open(os.path.join(str(tmp_path), journal._file_name), "a", encoding="utf-8") as handle:
+        handle.write('{"id": "open", "state": "acc')
+
+    in_flight = journal.in_flight()
+    assert list(in_flight) == ["open"]
+    assert job_states(in_flight["open"])["/runs/b"]["state"] == "dispatched"
+
+
+def test_files_older_than_the_retention_are_deleted(tmp_path):
+    old = tmp_path / "journal-20000101.jsonl"
+    old.write_text(json.dumps({"id": "old", "state": "queued"}) + "\n")
+    os.utime(old, (0, 0))
+    assert SubmissionJournal(str(tmp_path)).replay() == {}
+    assert not old.exists()
+
+
+@pytest.fixture
+def recovery(tmp_path, monkeypatch):
+    """submission.py wired to a journal, ledger and session files in tmp_path and to a fakeredis queue."""
+
+    queue = Queue("light", connection=fakeredis.FakeRedis())
+    monkeypatch.setattr(submission, "JOURNAL", SubmissionJournal(str(tmp_path / "journal")))
+    monkeypatch.setattr(submission, "SESSION_DIR", str(tmp_path / "sessions"))
+    monkeypatch.setattr(submission, "get_queue", lambda name=None: queue)
+    monkeypatch.setattr(submission, "load_pipeline_state", lambda submission_id: None)
+    monkeypatch.setattr(submission, "overdue_pipelines", lambda: [])
+    monkeypatch.setattr(ledger_module, "LEDGER", SubmissionLedger(str(tmp_path / "ledger.sqlite")))
+    valid = {"valid-token"}
+    monkeypatch.setattr(
+        bfabric_web_apps.bfabric_interface, "token_to_data",
+        lambda token: json.dumps({**SESSION, "userWsPassword": "secret"}) if token in valid else "EXPIRED"
+    )
+    return queue
+
+
+def _crashed(submission_id, url, *records):
+    """Journal a submission as the web server did before it crashed (nothing reached rq)."""
+
+    submission.keep_session(submission_id, url)
+    kwargs = {"app_name": "STAR", "values": {"name": submission_id}, "session": SESSION, "entity_data": {}, "app_data": {},
+              "url": submission.redact_token(url), "charge_run": False, "dataset_ids": None, "reuse": False, "delta": False,
+              "shards": 1, "pipeline": None, "stage_values": None}
+    submission.JOURNAL.append(submission_id, "queued", app="STAR", kwargs=kwargs)
+    for state, job in records:
+        submission.JOURNAL.append(submission_id, state, job=job, run_path=f"/runs/{job}")
+
+
+def test_recovery_resumes_undispatched_submissions_and_reports_the_others(recovery, monkeypatch):
+    monkeypatch.setattr(submission, "writer_alive", lambda record: False)
+    _crashed("resume", "?token=valid-token", ("staged", "a"))
+    _crashed("doubt", "?token=valid-token", ("staged", "b"), ("dispatched", "b"))
+    _crashed("expired", "?token=old-token")
+
+    report = submission.recover_submissions()
+
+    assert report["resumed"] == ["resume"]
+    assert set(report["interrupted"]) == {"doubt", "expired"}
+    assert "expired" in report["interrupted"]["expired"]
+    assert recovery.job_ids == ["resume"]
+    enqueued = json.dumps(recovery.fetch_job("resume").kwargs)
+    assert "valid-token" not in enqueued and "secret" not in enqueued
+    assert not os.path.exists(submission._session_path("expired"))
+
+    # Another server process starting together acts on none of them again
+    assert submission.recover_submissions() == {"resumed": [], "interrupted": {}}
+
+
+def test_recovery_leaves_submissions_of_live_writers_alone(recovery):
+    _crashed("running", "?token=valid-token")
+    assert submission.recover_submissions() == {"resumed": [], "interrupted": {}}
+    assert recovery.job_ids == []
@@ -0,0 +1,87 @@
+import sqlite3
+import time
+import pytest
+from sushi_utils.ledger import SubmissionLedger, job_key, parameters_key
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return SubmissionLedger(str(tmp_path / "ledger.sqlite"))
+
+
+def test_claim_refuses_duplicates_within_the_window(ledger):
+    assert ledger.claim("key", "STAR", "first", window=60) is None
+    assert ledger.claim("key", "STAR", "second", window=60) == "first"
+    assert ledger.claim("other", "STAR", "third", window=60) is None
+    assert ledger.duplicates() == {"STAR": 1, "all": 1}
+
+
+def test_claim_expires_after_the_window(ledger):
+    assert ledger.claim("key", "STAR", "first", window=60) is None
+    with sqlite3.connect(ledger.path) as connection:
+        connection.execute("UPDATE claims SET created = ?", (time.time() - 120,))
+    assert ledger.claim("key", "STAR", "second", window=60) is None
+
+
+def test_uncounted_claims_are_no_duplicates(ledger):
+    ledger.claim("key", "STAR", "first", window=60)
+    assert ledger.claim("key", "STAR", "second", window=60, count=False) == "first"
+    assert ledger.duplicates() == {"all": 0}
+
+
+def test_release_drops_the_claims_of_a_submission(ledger):
+    ledger.claim("key", "STAR", "failed", window=60)
+    assert ledger.release("failed") == 1
+    assert ledger.release("failed") == 0
+    assert ledger.claim("key", "STAR", "retry", window=60) is None
+
+
+def test_runs_are_only_reused_once_available(ledger):
+    ledger.record("key", "STAR", "run", "/runs/1")
+    assert ledger.lookup("key", "STAR") is None
+    assert [run["run_path"] for run in ledger.pending(key="key")] == ["/runs/1"]
+
+    ledger.set_status("/runs/1", "available")
+    assert ledger.lookup("key", "STAR")["run_path"] == "/runs/1"
+    assert ledger.pending(key="key") == []
+    assert ledger.hit_rates()["STAR"] == {"lookups": 2, "hits": 1, "hit_rate": 0.5}
+
+
+def test_failed_runs_are_never_reused(ledger):
+    ledger.record("key", "STAR", "run", "/runs/1")
+    ledger.set_status("/runs/1", "failed")
+    assert ledger.lookup("key", "STAR") is None
+    assert ledger.pending(key="key") == []
+
+
+def test_unknown_status_is_rejected(ledger):
+    with pytest.raises(ValueError):
+        ledger.set_status("/runs/1", "done")
+
+
+def test_snapshots_follow_the_status_of_their_run(ledger):
+    rows = {"a": {"hash": "1", "run": "/runs/1", "name": "run"}}
+    ledger.record("key", "STAR", "run", "/runs/1")
+    ledger.record_snapshot("key", "STAR", "params", 7, "run", "/runs/1", rows)
+    assert ledger.last_snapshot("params", 7) is None
+    assert [run["run_path"] for run in ledger.pending(parameters_key="params", dataset_id=7)] == ["/runs/1"]
+
+    ledger.set_status("/runs/1", "available")
+    assert ledger.last_snapshot("params", 7)["rows"] == rows
+
+
+def test_invalidated_runs_are_not_reused(ledger):
+    ledger.record("key", "STAR", "run", "/runs/1")
+    ledger.set_status("/runs/1", "available")
+    assert ledger.invalidate(sushi_class="STAR") == 1
+    assert ledger.lookup("key", "STAR") is None
+
+
+def test_keys_ignore_resources_and_formatting(tmp_path):
+    dataset = tmp_path / "dataset.tsv"
+    dataset.write_text("Name\ta\n")
+    first = {"name": "one", "cores": 4, "paired": True, "refBuild": "GRCh38"}
+    second = {"name": "two", "cores": 8, "paired": "true", "refBuild": "GRCh38"}
+    assert parameters_key("STAR", first) == parameters_key("STAR", second)
+    assert job_key("STAR", first, str(dataset)) == job_key("STAR", second, str(dataset))
+    assert parameters_key("STAR", first) != parameters_key("STAR", {**first, "refBuild": "GRCm39"})
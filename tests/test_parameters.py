@@ -0,0 +1,30 @@
+import pytest
+from sushi_utils.parameters import format_value, parameters_digest, serialize_parameters
+
+
+@pytest.mark.parametrize("value, text", [
+    (None, ""),
+    (True, "true"),
+    (False, "false"),
+    ("True", "true"),
+    ("FALSE", "false"),
+    (32, "32"),
+    (32.0, "32"),
+    (0.1, "0.1"),
+    (1e-05, "1e-05"),
+    (float("nan"), ""),
+    ("  GRCh38  ", "GRCh38"),
+    ("", ""),
+])
+def test_format_value(value, text):
+    assert format_value(value) == text
+
+
+def test_digest_ignores_order_and_formatting():
+    assert parameters_digest({"cores": 32.0, "paired": "TRUE"}) == parameters_digest({"paired": True, "cores": 32})
+    assert parameters_digest({"cores": 32}) != parameters_digest({"cores": 16})
+    assert parameters_digest({"name": "a", "cores": 8}, ignored=("name",)) == parameters_digest({"name": "b", "cores": 8}, ignored=("name",))
+
+
+def test_serialized_parameters_keep_their_order():
+    assert serialize_parameters({"name": "run", "paired": True, "ram": 32.0}) == "name\trun\npaired\ttrue\nram\t32\n"
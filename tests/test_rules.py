@@ -0,0 +1,72 @@
+import json
+import os
+import shutil
+import subprocess
+import pytest
+from sushi_utils.spec_engine import build_parameters, check_rules, load_spec, spec_fields
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sushi_utils", "check_rules.js")
+
+RULES = [
+    {"check": "required", "fields": ["refBuild"], "message": "{field} is required"},
+    {"check": "minimum", "fields": ["cores", "ram"], "value": 1, "message": "{field} must be at least 1"},
+    {"check": "pattern", "fields": ["grouping2"], "value": r".+\s*\[(Factor|Numeric)\]$", "message": "{field} needs a type"},
+    {"check": "forbidden", "fields": ["refGroup"], "value": "None", "message": "{field} must be chosen"},
+    {"check": "differs", "fields": ["sampleGroup", "refGroup"], "ignore": ["all"], "message": "{field} equals the reference"},
+]
+
+# JSON-representable values, as the browser holds them
+CASES = [
+    {"refBuild": "GRCh38", "cores": 4, "ram": "32", "grouping2": "", "sampleGroup": "a", "refGroup": "b"},
+    {"refBuild": "", "cores": 0, "ram": "abc", "grouping2": "Batch", "sampleGroup": "a", "refGroup": "a"},
+    {"refBuild": None, "cores": "0.5", "ram": None, "grouping2": "Batch [Factor]", "sampleGroup": "all", "refGroup": "all"},
+    {"cores": True, "ram": False, "grouping2": "x [Numeric] y", "sampleGroup": 1, "refGroup": 1.0},
+    {"refBuild": "GRCh38", "cores": 8, "grouping2": " [Factor]", "sampleGroup": True, "refGroup": 1},
+    {"refBuild": "GRCh38", "refGroup": "None", "sampleGroup": "None"},
+    {},
+]
+
+
+def test_check_rules_reports_every_violation():
+    assert check_rules(RULES, CASES[0]) == []
+    assert check_rules(RULES, CASES[1]) == [
+        "refBuild is required", "cores must be at least 1", "grouping2 needs a type", "sampleGroup equals the reference"
+    ]
+
+
+def _browser_warnings(rules, values):
+    """Run check_rules.js as the clientside callback of one app and return its warnings."""
+
+    program = f"""
+        const values = {json.dumps(values)};
+        global.window = {{dash_clientside: {{callback_context: {{
+            inputs_list: [Object.keys(values).map(key => ({{id: {{app: "app", key: key}}, value: values[key]}}))],
+            states_list: [[{{id: {{app: "app"}}, value: {json.dumps(rules)}}}]],
+            outputs_list: [[{{id: {{app: "app"}}}}]]
+        }}}}}};
+        const check = eval("(" + require("fs").readFileSync({json.dumps(SCRIPT)}, "utf8") + ")");
+        const [children] = check();
+        console.log(JSON.stringify(children[0] ? children[0].map(div => div.props.children) : []));
+    """
+    result = subprocess.run(["node", "-e", program], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize("values", CASES)
+def test_browser_and_server_rules_agree(values):
+    assert _browser_warnings(RULES, values) == check_rules(RULES, values)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize("app_name", ["DESeq2", "EdgeR", "STAR"])
+def test_browser_and_server_rules_agree_on_the_spec_defaults(app_name):
+    spec = load_spec(app_name)
+    values = {field["key"]: field.get("default") for field in spec_fields(spec)}
+    assert _browser_warnings(spec.get("rules", []), values) == check_rules(spec.get("rules", []), values)
+
+
+def test_parameter_order_of_a_spec_is_kept():
+    spec = load_spec("MergeRunDataApp")
+    parameters = build_parameters(spec, {field["key"]: None for field in spec_fields(spec)})
+    assert list(parameters) == spec["parameter_order"]
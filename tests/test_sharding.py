@@ -0,0 +1,36 @@
+import pytest
+from conftest import make_dataset
+from sushi_utils.sharding import MAX_SHARDS, partition, sample_weights
+
+
+def test_partition_covers_every_sample_once():
+    weights = {f"s{i}": float(i + 1) for i in range(25)}
+    shards = partition(weights, 4)
+
+    assert len(shards) == 4
+    assert sorted(sample for shard in shards for sample in shard["samples"]) == sorted(weights)
+    assert sum(shard["weight"] for shard in shards) == pytest.approx(sum(weights.values()))
+
+
+def test_partition_balances_within_four_thirds_of_the_optimum():
+    weights = {f"s{i}": weight for i, weight in enumerate([7, 7, 6, 6, 5, 5, 4, 4, 4])}
+    shards = partition(weights, 4)
+
+    optimum = max(sum(weights.values()) / 4, max(weights.values()))
+    assert max(shard["weight"] for shard in shards) <= optimum * 4 / 3
+
+
+def test_partition_returns_no_more_shards_than_samples_or_the_maximum():
+    assert len(partition({"a": 1.0, "b": 1.0}, 8)) == 2
+    assert len(partition({f"s{i}": 1.0 for i in range(100)}, 1000)) == MAX_SHARDS
+    assert partition({"a": 1.0}, 0) == [{"samples": ["a"], "weight": 1.0}]
+
+
+def test_samples_are_weighted_by_their_read_count():
+    weights, basis = sample_weights(make_dataset([["a", "100"], ["b", "300"]]))
+    assert (weights, basis) == ({"a": 100.0, "b": 300.0}, "read count")
+
+
+def test_samples_are_weighted_equally_without_a_usable_column():
+    weights, basis = sample_weights(make_dataset([["a", "n/a"], ["b", "300"]]))
+    assert (weights, basis) == ({"a": 1.0, "b": 1.0}, "samples")